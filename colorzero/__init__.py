@@ -21,10 +21,70 @@ on this class and are:
 * :class:`Luma`
 """
 
-from .color import Color, Default
-from .style import Style, BaseStyles, StripStyles, HTMLStyles, TermStyles
-from .easings import linear, ease_in, ease_out, ease_in_out
-from .deltae import euclid, cie1976, cie1994g, cie1994t, ciede2000
-from .attr import Red, Green, Blue, Hue, Lightness, Saturation, Luma
-from .types import RGB, HLS, HSV, CMY, CMYK, YUV, YIQ, XYZ, Luv, Lab
-from .tables import NAMED_COLORS
+import sys
+
+# Submodules are only imported when one of their names is first accessed, so
+# that "import colorzero" is cheap for short-lived scripts. This maps each
+# public name to the submodule defining it
+_exports = {
+    'Color': 'color', 'Default': 'color',
+    'Style': 'style', 'BaseStyles': 'style', 'StripStyles': 'style',
+    'HTMLStyles': 'style', 'TermStyles': 'style', 'auto_styles': 'style',
+    'linear': 'easings', 'ease_in': 'easings', 'ease_out': 'easings',
+    'ease_in_out': 'easings',
+    'euclid': 'deltae', 'cie1976': 'deltae', 'cie1994g': 'deltae',
+    'cie1994t': 'deltae', 'ciede2000': 'deltae', 'oklab': 'deltae',
+    'Red': 'attr', 'Green': 'attr', 'Blue': 'attr', 'Hue': 'attr',
+    'Lightness': 'attr', 'Saturation': 'attr', 'Luma': 'attr',
+    'RGB': 'types', 'HLS': 'types', 'HSV': 'types', 'CMY': 'types',
+    'CMYK': 'types', 'YUV': 'types', 'YIQ': 'types', 'XYZ': 'types',
+    'Luv': 'types', 'Lab': 'types', 'LCh': 'types', 'OkLab': 'types',
+    'OkLCh': 'types',
+    'NAMED_COLORS': 'tables',
+    'Transform': 'transform',
+}
+
+_submodules = {
+    'arrays', 'attr', 'cache', 'color', 'conversions', 'deltae', 'easings',
+    'frames', 'matrix', 'palette', 'parallel', 'search', 'spaces', 'style',
+    'tables', 'term', 'transform', 'types',
+}
+
+# Before submodules were loaded lazily, those imported by the package itself
+# were exported by "from colorzero import *"; they remain so for compatibility
+__all__ = list(_exports) + [
+    'attr', 'color', 'conversions', 'deltae', 'easings', 'style', 'tables',
+    'types',
+]
+
+
+def _load(name):
+    # NOTE: __import__ is used rather than importlib.import_module as the
+    # latter is not reported by "python -X importtime"
+    if name in _submodules:
+        module = name
+    else:
+        try:
+            module = _exports[name]
+        except KeyError:
+            raise AttributeError(
+                'module {!r} has no attribute {!r}'.format(__name__, name)
+            ) from None
+    module = __name__ + '.' + module
+    __import__(module)
+    value = sys.modules[module]
+    if name not in _submodules:
+        value = globals()[name] = getattr(value, name)
+    return value
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        return _load(name)
+
+    def __dir__():
+        return sorted(set(globals()) | set(_exports))
+else:  # pragma: no cover
+    # Module __getattr__ (PEP 562) is unavailable; import everything eagerly
+    for _name in __all__:
+        _load(_name)
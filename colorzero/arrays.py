@@ -0,0 +1,1154 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines array counterparts of the tuples in :mod:`colorzero.types`, and the
+conversion routines which operate upon them.
+
+Each array stores its components in "struct of arrays" form: one contiguous
+column of floats per component (e.g. an :class:`HLSArray` has a column of
+hues, one of lightnesses, and one of saturations). The conversion routines
+mirror those in :mod:`colorzero.conversions` but operate a column at a time,
+so no tuple is constructed per color.
+"""
+
+from array import array
+from itertools import chain
+from math import copysign, hypot, atan2, degrees, radians, sin, cos
+
+from . import conversions as cv, types, attr, matrix
+from .color import Color
+
+# Lots of the conversion functions use single character parameter names and
+# variables internally; this is is normal and in keeping with
+# colorzero.conversions
+# pylint: disable=invalid-name
+
+
+def _column(values):
+    # Return *values* as a 1-dimensional memoryview of doubles; buffers which
+    # already are such are used without copying
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return memoryview(array('d', values))
+    if view.ndim != 1:
+        raise ValueError('columns must be 1-dimensional')
+    if view.format == 'd':
+        return view
+    return memoryview(array('d', view.tolist()))
+
+
+def _field(index, doc):
+    return property(lambda self: self._columns[index], doc=doc)
+
+
+class _Array:
+    """
+    Base class of the struct-of-arrays types. The *columns* are sequences of
+    floats (one per field of the class), or buffers of doubles (e.g. an
+    :class:`~array.array` with typecode "d") which are used without copying.
+    """
+    __slots__ = ('_columns',)
+    _fields = ()
+    _scalar = None
+
+    def __init__(self, *columns):
+        if len(columns) != len(self._fields):
+            raise ValueError('{cls} requires {n} columns'.format(
+                cls=self.__class__.__name__, n=len(self._fields)))
+        self._columns = tuple(_column(col) for col in columns)
+        if len({len(col) for col in self._columns}) > 1:
+            raise ValueError('all columns must be the same length')
+
+    @classmethod
+    def _from_columns(cls, columns):
+        # Construct an instance from a tuple of memoryviews without
+        # validation
+        result = object.__new__(cls)
+        result._columns = columns
+        return result
+
+    @classmethod
+    def _from_lists(cls, *lists):
+        return cls._from_columns(
+            tuple(memoryview(array('d', l)) for l in lists))
+
+    @property
+    def columns(self):
+        """
+        A tuple of the columns of the array; each is a :class:`memoryview`
+        of doubles.
+        """
+        return self._columns
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Slicing a memoryview does not copy the underlying data
+            return self._from_columns(
+                tuple(col[index] for col in self._columns))
+        return self._scalar(*(col[index] for col in self._columns))
+
+    def __iter__(self):
+        return map(self._scalar, *self._columns)
+
+    def __repr__(self):
+        return '<{self.__class__.__name__} len={len}>'.format(
+            self=self, len=len(self))
+
+
+class RGBArray(_Array):
+    "Array of red, green, and blue columns (see :class:`~colorzero.RGB`)."
+    __slots__ = ()
+    _fields = ('r', 'g', 'b')
+    _scalar = types.RGB
+    r = red = _field(0, 'The column of red values')
+    g = green = _field(1, 'The column of green values')
+    b = blue = _field(2, 'The column of blue values')
+
+
+class HLSArray(_Array):
+    """
+    Array of hue, lightness, and saturation columns (see
+    :class:`~colorzero.HLS`).
+    """
+    __slots__ = ()
+    _fields = ('h', 'l', 's')
+    _scalar = types.HLS
+    h = hue = _field(0, 'The column of hue values')
+    l = lightness = _field(1, 'The column of lightness values')
+    s = saturation = _field(2, 'The column of saturation values')
+
+
+class HSVArray(_Array):
+    """
+    Array of hue, saturation, and value columns (see
+    :class:`~colorzero.HSV`).
+    """
+    __slots__ = ()
+    _fields = ('h', 's', 'v')
+    _scalar = types.HSV
+    h = hue = _field(0, 'The column of hue values')
+    s = saturation = _field(1, 'The column of saturation values')
+    v = value = _field(2, 'The column of brightness values')
+
+
+class YUVArray(_Array):
+    "Array of luma and chroma columns (see :class:`~colorzero.YUV`)."
+    __slots__ = ()
+    _fields = ('y', 'u', 'v')
+    _scalar = types.YUV
+    y = luma = _field(0, 'The column of luma values')
+    u = _field(1, 'The column of the first chroma offsets')
+    v = _field(2, 'The column of the second chroma offsets')
+
+
+class YIQArray(_Array):
+    "Array of luma and chroma columns (see :class:`~colorzero.YIQ`)."
+    __slots__ = ()
+    _fields = ('y', 'i', 'q')
+    _scalar = types.YIQ
+    y = _field(0, 'The column of luma values')
+    i = _field(1, 'The column of in-phase values')
+    q = _field(2, 'The column of quadrature values')
+
+
+class CMYArray(_Array):
+    """
+    Array of cyan, magenta, and yellow columns (see :class:`~colorzero.CMY`).
+    """
+    __slots__ = ()
+    _fields = ('c', 'm', 'y')
+    _scalar = types.CMY
+    c = cyan = _field(0, 'The column of cyan values')
+    m = magenta = _field(1, 'The column of magenta values')
+    y = yellow = _field(2, 'The column of yellow values')
+
+
+class CMYKArray(_Array):
+    """
+    Array of cyan, magenta, yellow, and black columns (see
+    :class:`~colorzero.CMYK`).
+    """
+    __slots__ = ()
+    _fields = ('c', 'm', 'y', 'k')
+    _scalar = types.CMYK
+    c = cyan = _field(0, 'The column of cyan values')
+    m = magenta = _field(1, 'The column of magenta values')
+    y = yellow = _field(2, 'The column of yellow values')
+    k = black = _field(3, 'The column of black values')
+
+
+class XYZArray(_Array):
+    "Array of CIE X, Y, and Z columns (see :class:`~colorzero.XYZ`)."
+    __slots__ = ()
+    _fields = ('x', 'y', 'z')
+    _scalar = types.XYZ
+    x = _field(0, 'The column of X values')
+    y = _field(1, 'The column of Y values')
+    z = _field(2, 'The column of Z values')
+
+
+class LabArray(_Array):
+    "Array of CIE L*, a*, and b* columns (see :class:`~colorzero.Lab`)."
+    __slots__ = ()
+    _fields = ('l', 'a', 'b')
+    _scalar = types.Lab
+    l = _field(0, 'The column of L* values')
+    a = _field(1, 'The column of a* values')
+    b = _field(2, 'The column of b* values')
+
+
+class LChArray(_Array):
+    "Array of CIE L*, C*, and h columns (see :class:`~colorzero.LCh`)."
+    __slots__ = ()
+    _fields = ('l', 'c', 'h')
+    _scalar = types.LCh
+    l = _field(0, 'The column of L* values')
+    c = _field(1, 'The column of C* (chroma) values')
+    h = _field(2, 'The column of hues (in degrees)')
+
+
+class LuvArray(_Array):
+    "Array of CIE L*, u*, and v* columns (see :class:`~colorzero.Luv`)."
+    __slots__ = ()
+    _fields = ('l', 'u', 'v')
+    _scalar = types.Luv
+    l = _field(0, 'The column of L* values')
+    u = _field(1, 'The column of u* values')
+    v = _field(2, 'The column of v* values')
+
+
+class OkLabArray(_Array):
+    "Array of OKLab L, a, and b columns (see :class:`~colorzero.OkLab`)."
+    __slots__ = ()
+    _fields = ('l', 'a', 'b')
+    _scalar = types.OkLab
+    l = _field(0, 'The column of L values')
+    a = _field(1, 'The column of a values')
+    b = _field(2, 'The column of b values')
+
+
+class OkLChArray(_Array):
+    "Array of OKLCh L, C, and h columns (see :class:`~colorzero.OkLCh`)."
+    __slots__ = ()
+    _fields = ('l', 'c', 'h')
+    _scalar = types.OkLCh
+    l = _field(0, 'The column of L values')
+    c = _field(1, 'The column of chroma values')
+    h = _field(2, 'The column of hues (in degrees)')
+
+
+class ColorArray(RGBArray):
+    """
+    The array counterpart of :class:`~colorzero.Color`: columns of linear
+    red, green, and blue values between 0.0 and 1.0, with properties and
+    class methods mirroring those of :class:`~colorzero.Color` which convert
+    all the colors at once.
+
+    The array may be constructed from three *columns* of red, green, and blue
+    values (which are used as is, without copying if they are buffers of
+    doubles), from any other array in this module (which is converted), or
+    from a sequence of :class:`~colorzero.Color` instances (or 3-tuples of
+    linear RGB floats). For example::
+
+        >>> from colorzero import Color
+        >>> from colorzero.arrays import ColorArray
+        >>> colors = ColorArray([Color('red'), Color('#0080ff')])
+        >>> colors.hls
+        <HLSArray len=2>
+        >>> list(colors.hls)
+        [HLS(h=0, l=0.5, s=1), HLS(h=0.583007, l=0.5, s=1)]
+        >>> colors[1]
+        <Color html='#0080ff' rgb=(0, 0.501961, 1)>
+
+    Indexing an array returns a :class:`~colorzero.Color`, while slicing
+    returns a :class:`ColorArray` sharing the columns of the original.
+
+    The same arithmetic as :class:`~colorzero.Color` supports is available,
+    applying to every color in the array. For example, to rotate the hue of
+    every color by 30 degrees::
+
+        >>> from colorzero import Hue
+        >>> list(colors + Hue(deg=30))
+        [<Color html='#ff8000' rgb=(1, 0.5, 0)>, <Color html='#0000ff' rgb=(0, 0.00196078, 1)>]
+
+    See :func:`transform` to apply several adjustments at once.
+
+    .. versionadded:: 2.1
+    """
+    __slots__ = ()
+    _scalar = Color.from_rgb
+
+    def __init__(self, *columns):
+        if len(columns) == 1:
+            source, = columns
+            try:
+                convert = ColorArray._from_array[type(source)]
+            except KeyError:
+                source = ColorArray.from_colors(source)
+            else:
+                source = getattr(ColorArray, convert)(*source.columns)
+            columns = source.columns
+        super().__init__(*columns)
+
+    @classmethod
+    def from_colors(cls, colors):
+        """
+        Construct a :class:`ColorArray` from a sequence of
+        :class:`~colorzero.Color` instances (or any 3-tuples of linear RGB
+        floats).
+        """
+        flat = array('d', chain.from_iterable(colors))
+        if len(flat) % 3:
+            raise ValueError('all colors must have 3 components')
+        return cls._from_columns(
+            tuple(memoryview(flat[i::3]) for i in range(3)))
+
+    @classmethod
+    def from_rgb(cls, r, g, b):
+        """
+        Construct a :class:`ColorArray` from columns of linear RGB values,
+        which are clamped between 0.0 and 1.0.
+        """
+        return cls._from_lists(_clamp(r), _clamp(g), _clamp(b))
+
+    @classmethod
+    def from_rgb_bytes(cls, data):
+        """
+        Construct a :class:`ColorArray` from a :class:`bytes`-like object
+        containing packed RGB888 triples (as read from an image, for
+        example).
+        """
+        return cls._from_columns(rgb_bytes_to_rgb(data).columns)
+
+    @classmethod
+    def from_yuv(cls, y, u, v, standard='bt601', gamut='clip'):
+        """
+        Construct a :class:`ColorArray` from columns of Y'UV values, using the
+        coefficients of *standard*, and mapping colors outside the sRGB gamut
+        into it with the *gamut* method (see :meth:`Color.from_yuv`).
+        """
+        return cls._from_columns(yuv_to_rgb(
+            y, u, v, cv.yuv_standard(standard), gamut).columns)
+
+    @classmethod
+    def from_yiq(cls, y, i, q):
+        "Construct a :class:`ColorArray` from columns of Y'IQ values."
+        return cls.from_rgb(*yiq_to_rgb(y, i, q).columns)
+
+    @classmethod
+    def from_hls(cls, h, l, s):
+        "Construct a :class:`ColorArray` from columns of HLS values."
+        return cls.from_rgb(*hls_to_rgb(h, l, s).columns)
+
+    @classmethod
+    def from_hsv(cls, h, s, v):
+        "Construct a :class:`ColorArray` from columns of HSV values."
+        return cls.from_rgb(*hsv_to_rgb(h, s, v).columns)
+
+    @classmethod
+    def from_cmy(cls, c, m, y):
+        "Construct a :class:`ColorArray` from columns of CMY values."
+        return cls.from_rgb(*cmy_to_rgb(c, m, y).columns)
+
+    @classmethod
+    def from_cmyk(cls, c, m, y, k):
+        "Construct a :class:`ColorArray` from columns of CMYK values."
+        return cls.from_cmy(*cmyk_to_cmy(c, m, y, k).columns)
+
+    @classmethod
+    def from_xyz(cls, x, y, z, white='d65', gamut='clip'):
+        """
+        Construct a :class:`ColorArray` from columns of CIE XYZ values,
+        relative to the reference *white*, mapping colors outside the sRGB
+        gamut into it with the *gamut* method (see :meth:`Color.from_xyz`).
+        """
+        white = cv.white_point(white)
+        return cls._from_columns(gamut_map(
+            *xyz_to_rgb(x, y, z, white).columns, method=gamut).columns)
+
+    @classmethod
+    def from_lab(cls, l, a, b, white='d65', gamut='clip'):
+        """
+        Construct a :class:`ColorArray` from columns of CIE Lab values,
+        relative to the reference *white*, mapping colors outside the sRGB
+        gamut into it with the *gamut* method (see :meth:`Color.from_xyz`).
+        """
+        white = cv.white_point(white)
+        return cls._from_columns(gamut_map(*xyz_to_rgb(
+            *lab_to_xyz(l, a, b, white).columns, white=white).columns,
+            method=gamut).columns)
+
+    @classmethod
+    def from_lch(cls, l, c, h, white='d65', gamut='clip'):
+        """
+        Construct a :class:`ColorArray` from columns of CIE LCh values,
+        relative to the reference *white*, mapping colors outside the sRGB
+        gamut into it with the *gamut* method (see :meth:`Color.from_xyz`).
+        """
+        return cls.from_lab(
+            *lch_to_lab(l, c, h).columns, white=white, gamut=gamut)
+
+    @classmethod
+    def from_luv(cls, l, u, v, white='d65', gamut='clip'):
+        """
+        Construct a :class:`ColorArray` from columns of CIE Luv values,
+        relative to the reference *white*, mapping colors outside the sRGB
+        gamut into it with the *gamut* method (see :meth:`Color.from_xyz`).
+        """
+        white = cv.white_point(white)
+        return cls._from_columns(gamut_map(*xyz_to_rgb(
+            *luv_to_xyz(l, u, v, white).columns, white=white).columns,
+            method=gamut).columns)
+
+    @classmethod
+    def from_oklab(cls, l, a, b, gamut='clip'):
+        """
+        Construct a :class:`ColorArray` from columns of OKLab values, mapping
+        colors outside the sRGB gamut into it with the *gamut* method (see
+        :meth:`Color.from_xyz`).
+        """
+        return cls._from_columns(gamut_map(
+            *oklab_to_rgb(l, a, b).columns, method=gamut).columns)
+
+    @classmethod
+    def from_oklch(cls, l, c, h, gamut='clip'):
+        """
+        Construct a :class:`ColorArray` from columns of OKLCh values, mapping
+        colors outside the sRGB gamut into it with the *gamut* method (see
+        :meth:`Color.from_xyz`).
+        """
+        return cls.from_oklab(*oklch_to_oklab(l, c, h).columns, gamut=gamut)
+
+    @property
+    def rgb(self):
+        "Returns the colors as an :class:`RGBArray` sharing the same columns."
+        return RGBArray._from_columns(self._columns)
+
+    @property
+    def rgb_bytes(self):
+        "Returns the colors as :class:`bytes` of packed RGB888 triples."
+        return rgb_to_rgb_bytes(*self._columns)
+
+    @property
+    def yuv(self):
+        "Returns the colors as a :class:`YUVArray` (see :attr:`Color.yuv`)."
+        return rgb_to_yuv(*self._columns)
+
+    def to_yuv(self, standard='bt601'):
+        """
+        Returns the colors as a :class:`YUVArray` using the coefficients of
+        *standard* (see :meth:`Color.to_yuv`).
+        """
+        return rgb_to_yuv(*self._columns, std=cv.yuv_standard(standard))
+
+    @property
+    def yiq(self):
+        "Returns the colors as a :class:`YIQArray` (see :attr:`Color.yiq`)."
+        return rgb_to_yiq(*self._columns)
+
+    @property
+    def hls(self):
+        "Returns the colors as an :class:`HLSArray` (see :attr:`Color.hls`)."
+        return rgb_to_hls(*self._columns)
+
+    @property
+    def hsv(self):
+        "Returns the colors as an :class:`HSVArray` (see :attr:`Color.hsv`)."
+        return rgb_to_hsv(*self._columns)
+
+    @property
+    def cmy(self):
+        "Returns the colors as a :class:`CMYArray` (see :attr:`Color.cmy`)."
+        return rgb_to_cmy(*self._columns)
+
+    @property
+    def cmyk(self):
+        "Returns the colors as a :class:`CMYKArray` (see :attr:`Color.cmyk`)."
+        return cmy_to_cmyk(*self.cmy.columns)
+
+    @property
+    def xyz(self):
+        "Returns the colors as an :class:`XYZArray` (see :attr:`Color.xyz`)."
+        return rgb_to_xyz(*self._columns)
+
+    @property
+    def lab(self):
+        "Returns the colors as a :class:`LabArray` (see :attr:`Color.lab`)."
+        return xyz_to_lab(*self.xyz.columns)
+
+    @property
+    def lch(self):
+        "Returns the colors as an :class:`LChArray` (see :attr:`Color.lch`)."
+        return lab_to_lch(*self.lab.columns)
+
+    @property
+    def luv(self):
+        "Returns the colors as a :class:`LuvArray` (see :attr:`Color.luv`)."
+        return xyz_to_luv(*self.xyz.columns)
+
+    @property
+    def oklab(self):
+        """
+        Returns the colors as an :class:`OkLabArray` (see
+        :attr:`Color.oklab`).
+        """
+        return rgb_to_oklab(*self._columns)
+
+    @property
+    def oklch(self):
+        """
+        Returns the colors as an :class:`OkLChArray` (see
+        :attr:`Color.oklch`).
+        """
+        return oklab_to_oklch(*self.oklab.columns)
+
+    def to_xyz(self, white='d65'):
+        """
+        Returns the colors as an :class:`XYZArray` relative to the reference
+        *white* (see :meth:`Color.to_xyz`).
+        """
+        return rgb_to_xyz(*self._columns, white=cv.white_point(white))
+
+    def to_lab(self, white='d65'):
+        """
+        Returns the colors as a :class:`LabArray` relative to the reference
+        *white* (see :meth:`Color.to_lab`).
+        """
+        white = cv.white_point(white)
+        return xyz_to_lab(*self.to_xyz(white).columns, white=white)
+
+    def to_luv(self, white='d65'):
+        """
+        Returns the colors as a :class:`LuvArray` relative to the reference
+        *white* (see :meth:`Color.to_luv`).
+        """
+        white = cv.white_point(white)
+        return xyz_to_luv(*self.to_xyz(white).columns, white=white)
+
+    def _operate(self, op, other):
+        try:
+            return transform(self, (op, other))
+        except ValueError:
+            return NotImplemented
+
+    def __add__(self, other):
+        return self._operate('+', other)
+
+    def __sub__(self, other):
+        return self._operate('-', other)
+
+    def __rsub__(self, other):
+        # Subtracting colors from a single channel yields just that channel,
+        # as with Color
+        for index, cls in enumerate((attr.Red, attr.Green, attr.Blue)):
+            if isinstance(other, cls):
+                break
+        else:
+            return NotImplemented
+        zeros = [0.0] * len(self)
+        columns = [zeros, zeros, zeros]
+        columns[index] = [other - v for v in self._columns[index]]
+        return self.from_rgb(*columns)
+
+    def __mul__(self, other):
+        return self._operate('*', other)
+
+    # Addition and multiplication are commutative
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+
+# Maps array types to the ColorArray method which converts their columns;
+# analogous to Color._from_tuple
+ColorArray._from_array = {
+    RGBArray:   'from_rgb',
+    ColorArray: 'from_rgb',
+    YUVArray:   'from_yuv',
+    YIQArray:   'from_yiq',
+    HLSArray:   'from_hls',
+    HSVArray:   'from_hsv',
+    CMYArray:   'from_cmy',
+    CMYKArray:  'from_cmyk',
+    XYZArray:   'from_xyz',
+    LabArray:   'from_lab',
+    LChArray:   'from_lch',
+    LuvArray:   'from_luv',
+    OkLabArray: 'from_oklab',
+    OkLChArray: 'from_oklch',
+}
+
+
+# Conversion functions #######################################################
+#
+# Each of these mirrors the function of the same name in colorzero.conversions
+# (including the order of operations, so results are identical), but accepts
+# columns of values and returns an array of the corresponding type
+
+def _clamp(col):
+    "Clamp every value in *col* to the range 0.0 to 1.0 inclusive"
+    return [0.0 if v < 0.0 else 1.0 if v > 1.0 else v for v in col]
+
+
+def rgb_bytes_to_rgb(data):
+    "Convert packed RGB888 triples to an :class:`RGBArray` of linear RGB"
+    data = bytes(data)
+    if len(data) % 3:
+        raise ValueError('length of data must be a multiple of 3')
+    return RGBArray._from_lists(*(
+        [v / 255 for v in data[i::3]] for i in range(3)))
+
+
+def rgb_to_rgb_bytes(r, g, b):
+    "Convert columns of linear RGB to packed RGB888 triples"
+    result = bytearray(len(r) * 3)
+    for i, col in enumerate((r, g, b)):
+        result[i::3] = bytes([int(round(v * 255)) for v in col])
+    return bytes(result)
+
+
+def rgb_to_yiq(r, g, b):
+    "Convert columns of linear RGB to a :class:`YIQArray`"
+    y = [0.30 * r_ + 0.59 * g_ + 0.11 * b_ for r_, g_, b_ in zip(r, g, b)]
+    return YIQArray._from_lists(
+        y,
+        [0.74 * (r_ - y_) - 0.27 * (b_ - y_) for r_, b_, y_ in zip(r, b, y)],
+        [0.48 * (r_ - y_) + 0.41 * (b_ - y_) for r_, b_, y_ in zip(r, b, y)])
+
+
+def yiq_to_rgb(y, i, q):
+    "Convert columns of YIQ to an :class:`RGBArray` of linear RGB"
+    return RGBArray._from_lists(*(
+        _clamp(col)
+        for col in matrix.mult_columns(cv._YIQ_TO_RGB, y, i, q)))
+
+
+# The HLS and HSV conversions below follow the implementations in colorsys
+# (so results are bit-for-bit identical), but run a single loop over the
+# columns with max, min, and the helper of hls_to_rgb inlined, rather than
+# calling colorsys (and constructing a tuple) for every color. Without numpy
+# there are no masked vector operations; branching per element within one
+# loop is the cheapest equivalent in CPython
+
+_ONE_THIRD = 1.0 / 3.0
+_ONE_SIXTH = 1.0 / 6.0
+_TWO_THIRD = 2.0 / 3.0
+
+
+def rgb_to_hls(r, g, b):
+    "Convert columns of linear RGB to an :class:`HLSArray`"
+    hs, ls, ss = [], [], []
+    h_append, l_append, s_append = hs.append, ls.append, ss.append
+    for r_, g_, b_ in zip(r, g, b):
+        if r_ >= g_:
+            maxc, minc = (r_, g_ if g_ < b_ else b_) if r_ >= b_ else (b_, g_)
+        else:
+            maxc, minc = (g_, r_ if r_ < b_ else b_) if g_ >= b_ else (b_, r_)
+        sumc = maxc + minc
+        l = sumc / 2.0
+        l_append(l)
+        if minc == maxc:
+            h_append(0.0)
+            s_append(0.0)
+            continue
+        rangec = maxc - minc
+        s_append(
+            rangec / sumc if l <= 0.5 else rangec / (2.0 - maxc - minc))
+        if r_ == maxc:
+            h = (maxc - b_) / rangec - (maxc - g_) / rangec
+        elif g_ == maxc:
+            h = 2.0 + (maxc - r_) / rangec - (maxc - b_) / rangec
+        else:
+            h = 4.0 + (maxc - g_) / rangec - (maxc - r_) / rangec
+        h_append((h / 6.0) % 1.0)
+    return HLSArray._from_lists(hs, ls, ss)
+
+
+def hls_to_rgb(h, l, s):
+    "Convert columns of HLS to an :class:`RGBArray` of linear RGB"
+    rs, gs, bs = [], [], []
+    r_append, g_append, b_append = rs.append, gs.append, bs.append
+    for h_, l_, s_ in zip(h, l, s):
+        if s_ == 0.0:
+            r_append(l_)
+            g_append(l_)
+            b_append(l_)
+            continue
+        m2 = l_ * (1.0 + s_) if l_ <= 0.5 else l_ + s_ - (l_ * s_)
+        m1 = 2.0 * l_ - m2
+        d = m2 - m1
+        hue = (h_ + _ONE_THIRD) % 1.0
+        r_append(
+            m1 + d * hue * 6.0 if hue < _ONE_SIXTH else
+            m2 if hue < 0.5 else
+            m1 + d * (_TWO_THIRD - hue) * 6.0 if hue < _TWO_THIRD else
+            m1)
+        hue = h_ % 1.0
+        g_append(
+            m1 + d * hue * 6.0 if hue < _ONE_SIXTH else
+            m2 if hue < 0.5 else
+            m1 + d * (_TWO_THIRD - hue) * 6.0 if hue < _TWO_THIRD else
+            m1)
+        hue = (h_ - _ONE_THIRD) % 1.0
+        b_append(
+            m1 + d * hue * 6.0 if hue < _ONE_SIXTH else
+            m2 if hue < 0.5 else
+            m1 + d * (_TWO_THIRD - hue) * 6.0 if hue < _TWO_THIRD else
+            m1)
+    return RGBArray._from_lists(rs, gs, bs)
+
+
+def rgb_to_hsv(r, g, b):
+    "Convert columns of linear RGB to an :class:`HSVArray`"
+    hs, ss, vs = [], [], []
+    h_append, s_append, v_append = hs.append, ss.append, vs.append
+    for r_, g_, b_ in zip(r, g, b):
+        if r_ >= g_:
+            maxc, minc = (r_, g_ if g_ < b_ else b_) if r_ >= b_ else (b_, g_)
+        else:
+            maxc, minc = (g_, r_ if r_ < b_ else b_) if g_ >= b_ else (b_, r_)
+        v_append(maxc)
+        if minc == maxc:
+            h_append(0.0)
+            s_append(0.0)
+            continue
+        rangec = maxc - minc
+        s_append(rangec / maxc)
+        if r_ == maxc:
+            h = (maxc - b_) / rangec - (maxc - g_) / rangec
+        elif g_ == maxc:
+            h = 2.0 + (maxc - r_) / rangec - (maxc - b_) / rangec
+        else:
+            h = 4.0 + (maxc - g_) / rangec - (maxc - r_) / rangec
+        h_append((h / 6.0) % 1.0)
+    return HSVArray._from_lists(hs, ss, vs)
+
+
+def hsv_to_rgb(h, s, v):
+    "Convert columns of HSV to an :class:`RGBArray` of linear RGB"
+    rs, gs, bs = [], [], []
+    r_append, g_append, b_append = rs.append, gs.append, bs.append
+    for h_, s_, v_ in zip(h, s, v):
+        if s_ == 0.0:
+            r_, g_, b_ = v_, v_, v_
+        else:
+            i = int(h_ * 6.0)
+            f = (h_ * 6.0) - i
+            p = v_ * (1.0 - s_)
+            q = v_ * (1.0 - s_ * f)
+            t = v_ * (1.0 - s_ * (1.0 - f))
+            i %= 6
+            if i == 0:
+                r_, g_, b_ = v_, t, p
+            elif i == 1:
+                r_, g_, b_ = q, v_, p
+            elif i == 2:
+                r_, g_, b_ = p, v_, t
+            elif i == 3:
+                r_, g_, b_ = p, q, v_
+            elif i == 4:
+                r_, g_, b_ = t, p, v_
+            else:
+                r_, g_, b_ = v_, p, q
+        r_append(r_)
+        g_append(g_)
+        b_append(b_)
+    return RGBArray._from_lists(rs, gs, bs)
+
+
+def rgb_to_yuv(r, g, b, std=cv.BT601):
+    """
+    Convert columns of linear RGB to a :class:`YUVArray` using the specified
+    coefficients (the default coefficients are from BT.601)
+    """
+    Wr, Wg, Wb, U, V = std.Wr, std.Wg, std.Wb, std.U, std.V
+    y = [Wr * r_ + Wg * g_ + Wb * b_ for r_, g_, b_ in zip(r, g, b)]
+    return YUVArray._from_lists(
+        y,
+        [U * (b_ - y_) for b_, y_ in zip(b, y)],
+        [V * (r_ - y_) for r_, y_ in zip(r, y)])
+
+
+def yuv_to_rgb(y, u, v, std=cv.BT601, gamut='clip'):
+    """
+    Convert columns of Y'UV to an :class:`RGBArray` of linear RGB using the
+    specified coefficients (the default coefficients are from BT.601), mapping
+    colors outside the sRGB gamut into it with the *gamut* method (see
+    :func:`gamut_map`)
+    """
+    Rv, Gu, Gv, Bu = std.Rv, std.Gu, std.Gv, std.Bu
+    return gamut_map(
+        [y_ + Rv * v_ for y_, v_ in zip(y, v)],
+        [y_ - Gu * u_ - Gv * v_ for y_, u_, v_ in zip(y, u, v)],
+        [y_ + Bu * u_ for y_, u_ in zip(y, u)],
+        gamut)
+
+
+def rgb_to_cmy(r, g, b):
+    "Convert columns of linear RGB to a :class:`CMYArray`"
+    return CMYArray._from_lists(*([1 - v for v in col] for col in (r, g, b)))
+
+
+def cmy_to_rgb(c, m, y):
+    "Convert columns of CMY to an :class:`RGBArray` of linear RGB"
+    return RGBArray._from_lists(*([1 - v for v in col] for col in (c, m, y)))
+
+
+def cmy_to_cmyk(c, m, y):
+    "Convert columns of CMY to a :class:`CMYKArray`"
+    k = [min(c_, m_, y_) for c_, m_, y_ in zip(c, m, y)]
+    return CMYKArray._from_lists(*[
+        [0.0 if k_ == 1.0 else (v - k_) / (1.0 - k_) for v, k_ in zip(col, k)]
+        for col in (c, m, y)
+    ] + [k])
+
+
+def cmyk_to_cmy(c, m, y, k):
+    "Convert columns of CMYK to a :class:`CMYArray`"
+    return CMYArray._from_lists(*(
+        [v * (1 - k_) + k_ for v, k_ in zip(col, k)]
+        for col in (c, m, y)))
+
+
+def _from_srgb(col):
+    return [
+        c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+        for c in col
+    ]
+
+
+def _to_srgb(col):
+    return [
+        12.92 * c if c <= 0.0031308 else (1.055 * c ** (1 / 2.4) - 0.055)
+        for c in col
+    ]
+
+
+def rgb_to_xyz(r, g, b, white=cv.D65):
+    """
+    Convert columns of linear RGB to an :class:`XYZArray`. RGB is assumed to
+    be sRGB and conversion uses D65 as reference white, unless another
+    reference *white* is given (see :func:`colorzero.conversions.rgb_to_xyz`).
+    """
+    return XYZArray._from_lists(*matrix.mult_columns(
+        cv.rgb_xyz_matrix(white), _from_srgb(r), _from_srgb(g), _from_srgb(b)))
+
+
+def xyz_to_rgb(x, y, z, white=cv.D65):
+    """
+    Convert columns of CIE XYZ to an :class:`RGBArray` of linear RGB. sRGB is
+    used as the output color space, and D65 as reference white, unless
+    another reference *white* is given for the input.
+    """
+    return RGBArray._from_lists(*(
+        _to_srgb(col)
+        for col in matrix.mult_columns(cv.xyz_rgb_matrix(white), x, y, z)))
+
+
+# Float equivalents of the Fraction constants used by colorzero.conversions
+_THETA = 6 / 29                 # theta
+_THETA3 = 216 / 24389           # theta ** 3
+_THETA2_3 = 108 / 841           # 3 * theta ** 2
+_OFFSET = 4 / 29
+_KAPPA = 24389 / 27             # (29 / 3) ** 3
+_KAPPA_INV = 27 / 24389         # (3 / 29) ** 3
+
+
+def lab_to_xyz(l, a, b, white=cv.D65):
+    "Convert columns of CIE L*a*b* to an :class:`XYZArray`"
+    fy = [(l_ + 16) / 116 for l_ in l]
+    fx = [fy_ + a_ / 500 for fy_, a_ in zip(fy, a)]
+    fz = [fy_ - b_ / 200 for fy_, b_ in zip(fy, b)]
+    return XYZArray._from_lists(*(
+        [
+            (n ** 3 if n > _THETA else _THETA2_3 * (n - _OFFSET)) * w
+            for n in col
+        ]
+        for col, w in zip((fx, fy, fz), white)))
+
+
+def xyz_to_lab(x, y, z, white=cv.D65):
+    "Convert columns of CIE XYZ to a :class:`LabArray`"
+    fx, fy, fz = (
+        [
+            t ** (1 / 3) if t > _THETA3 else t / _THETA2_3 + _OFFSET
+            for t in (n / w for n in col)
+        ]
+        for col, w in zip((x, y, z), white))
+    return LabArray._from_lists(
+        [116 * fy_ - 16 for fy_ in fy],
+        [500 * (fx_ - fy_) for fx_, fy_ in zip(fx, fy)],
+        [200 * (fy_ - fz_) for fy_, fz_ in zip(fy, fz)])
+
+
+def _to_polar(a, b):
+    # Return the columns of chroma and hue (in degrees) of the Cartesian
+    # columns *a* and *b*
+    return (
+        [hypot(a_, b_) for a_, b_ in zip(a, b)],
+        [degrees(atan2(b_, a_)) % 360 for a_, b_ in zip(a, b)])
+
+
+def _from_polar(c, h):
+    # The reverse of _to_polar
+    h = [radians(h_) for h_ in h]
+    return (
+        [c_ * cos(h_) for c_, h_ in zip(c, h)],
+        [c_ * sin(h_) for c_, h_ in zip(c, h)])
+
+
+def lab_to_lch(l, a, b):
+    "Convert columns of CIE L*a*b* to an :class:`LChArray`"
+    return LChArray._from_lists(l, *_to_polar(a, b))
+
+
+def lch_to_lab(l, c, h):
+    "Convert columns of CIE L*C*h to a :class:`LabArray`"
+    return LabArray._from_lists(l, *_from_polar(c, h))
+
+
+def luv_to_xyz(l, u, v, white=cv.D65):
+    "Convert columns of CIE L*u*v* to an :class:`XYZArray`"
+    uw, vw = cv.xyz_to_uv(*white)
+    wy = white.y
+    xs, ys, zs = [], [], []
+    for l_, u_, v_ in zip(l, u, v):
+        if l_ == 0:
+            xs.append(0)
+            ys.append(0)
+            zs.append(0)
+        else:
+            u_prime = u_ / (13 * l_) + uw
+            v_prime = v_ / (13 * l_) + vw
+            y = wy * (
+                l_ * _KAPPA_INV if l_ <= 8 else
+                ((l_ + 16) / 116) ** 3
+            )
+            xs.append(y * (9 * u_prime) / (4 * v_prime))
+            ys.append(y)
+            zs.append(y * (12 - 3 * u_prime - 20 * v_prime) / (4 * v_prime))
+    return XYZArray._from_lists(xs, ys, zs)
+
+
+def xyz_to_luv(x, y, z, white=cv.D65):
+    "Convert columns of CIE XYZ to a :class:`LuvArray`"
+    uw, vw = cv.xyz_to_uv(*white)
+    wy = white.y
+    ls, us, vs = [], [], []
+    for x_, y_, z_ in zip(x, y, z):
+        d = x_ + 15 * y_ + 3 * z_
+        u, v = (0, 0) if d == 0 else (4 * x_ / d, 9 * y_ / d)
+        y_prime = y_ / wy
+        L = (
+            116 * y_prime ** (1 / 3) - 16 if y_prime > _THETA3 else
+            _KAPPA * y_prime)
+        ls.append(L)
+        us.append(13 * L * (u - uw))
+        vs.append(13 * L * (v - vw))
+    return LuvArray._from_lists(ls, us, vs)
+
+
+def rgb_to_oklab(r, g, b):
+    "Convert columns of linear RGB to an :class:`OkLabArray`"
+    lms = matrix.mult_columns(
+        cv._SRGB_TO_LMS, _from_srgb(r), _from_srgb(g), _from_srgb(b))
+    return OkLabArray._from_lists(*matrix.mult_columns(cv._LMS_TO_OKLAB, *(
+        [copysign(abs(v) ** (1 / 3), v) for v in col] for col in lms)))
+
+
+def oklab_to_rgb(l, a, b):
+    "Convert columns of OKLab to an :class:`RGBArray` of linear RGB"
+    lms = matrix.mult_columns(cv._OKLAB_TO_LMS, l, a, b)
+    return RGBArray._from_lists(*(
+        _to_srgb(col)
+        for col in matrix.mult_columns(
+            cv._LMS_TO_SRGB, *([v ** 3 for v in col] for col in lms))))
+
+
+def oklab_to_oklch(l, a, b):
+    "Convert columns of OKLab to an :class:`OkLChArray`"
+    return OkLChArray._from_lists(l, *_to_polar(a, b))
+
+
+def oklch_to_oklab(l, c, h):
+    "Convert columns of OKLCh to an :class:`OkLabArray`"
+    return OkLabArray._from_lists(l, *_from_polar(c, h))
+
+
+def _rgb_to_lab(r, g, b):
+    return xyz_to_lab(*rgb_to_xyz(r, g, b).columns)
+
+
+def _lab_to_rgb(l, a, b):
+    return xyz_to_rgb(*lab_to_xyz(l, a, b).columns)
+
+
+_GAMUT_SPACES = {
+    'lch':   (_rgb_to_lab, _lab_to_rgb, 100.0),
+    'oklch': (rgb_to_oklab, oklab_to_rgb, 1.0),
+}
+
+
+def gamut_map(r, g, b, method='clip'):
+    """
+    Map columns of linear RGB, whose values may lie outside the range 0.0 to
+    1.0, into the sRGB gamut with *method* (see
+    :func:`colorzero.conversions.gamut_map`), returning an :class:`RGBArray`.
+    The colors outside the gamut are bisected together, so each step of the
+    bisection is a single conversion of columns.
+    """
+    if method == 'clip':
+        return RGBArray._from_lists(_clamp(r), _clamp(g), _clamp(b))
+    try:
+        to_lab, from_lab, white = _GAMUT_SPACES[method]
+    except (KeyError, TypeError):
+        raise ValueError(
+            'invalid gamut method: {!r}'.format(method)) from None
+    r, g, b = list(r), list(g), list(b)
+    outside = [
+        i for i, (r_, g_, b_) in enumerate(zip(r, g, b))
+        if not cv._in_gamut(r_, g_, b_)]
+    if outside:
+        lab_l, lab_a, lab_b = to_lab(
+            [r[i] for i in outside],
+            [g[i] for i in outside],
+            [b[i] for i in outside]).columns
+        lab_l = [max(0.0, min(white, l_)) for l_ in lab_l]
+        lo = [0.0] * len(outside)
+        hi = [1.0] * len(outside)
+        for _ in range(cv._GAMUT_STEPS):
+            mid = [(lo_ + hi_) / 2 for lo_, hi_ in zip(lo, hi)]
+            inside = [
+                cv._in_gamut(r_, g_, b_)
+                for r_, g_, b_ in zip(*from_lab(
+                    lab_l,
+                    [a_ * m for a_, m in zip(lab_a, mid)],
+                    [b_ * m for b_, m in zip(lab_b, mid)]).columns)]
+            lo = [m if ok else lo_ for lo_, m, ok in zip(lo, mid, inside)]
+            hi = [hi_ if ok else m for hi_, m, ok in zip(hi, mid, inside)]
+        mapped = from_lab(
+            lab_l,
+            [a_ * m for a_, m in zip(lab_a, lo)],
+            [b_ * m for b_, m in zip(lab_b, lo)]).columns
+        for i, r_, g_, b_ in zip(outside, *mapped):
+            r[i], g[i], b[i] = r_, g_, b_
+    return RGBArray._from_lists(_clamp(r), _clamp(g), _clamp(b))
+
+
+# Transformations ############################################################
+
+def _system(value):
+    # Return the name of the color system in which the operand *value* is
+    # applied
+    if isinstance(value, (types.RGB, attr.Red, attr.Green, attr.Blue)):
+        return 'rgb'
+    elif isinstance(value, (attr.Hue, attr.Lightness, attr.Saturation)):
+        return 'hls'
+    elif isinstance(value, attr.Luma):
+        return 'yuv'
+    raise ValueError('invalid operand: {!r}'.format(value))
+
+
+_OPERATORS = {
+    '+': lambda col, value: [c + value for c in col],
+    '-': lambda col, value: [c - value for c in col],
+    '*': lambda col, value: [c * value for c in col],
+}
+
+
+def _plan(operations):
+    # Group consecutive *operations* which apply in the same color system
+    # into runs of (system, [(op, value), ...])
+    runs = []
+    for op, value in operations:
+        if op not in _OPERATORS:
+            raise ValueError('invalid operator: {!r}'.format(op))
+        system = _system(value)
+        if runs and runs[-1][0] == system:
+            runs[-1][1].append((op, value))
+        else:
+            runs.append((system, [(op, value)]))
+    return runs
+
+
+def transform(colors, *operations):
+    """
+    Apply a sequence of *operations* to *colors*, a :class:`ColorArray` (or
+    anything that :class:`ColorArray` accepts), returning a new
+    :class:`ColorArray`. Each operation is a 2-tuple of an operator ("+",
+    "-", or "*") and an operand, which may be any of the values
+    :class:`~colorzero.Color` accepts in the equivalent arithmetic: an
+    instance of :class:`~colorzero.Red`, :class:`~colorzero.Green`,
+    :class:`~colorzero.Blue`, :class:`~colorzero.Hue`,
+    :class:`~colorzero.Lightness`, :class:`~colorzero.Saturation`, or
+    :class:`~colorzero.Luma`, or a :class:`~colorzero.Color` (or any
+    :class:`~colorzero.RGB` tuple). For example, the following are
+    equivalent::
+
+        >>> from colorzero import *
+        >>> from colorzero.arrays import ColorArray, transform
+        >>> colors = ColorArray([Color('wheat'), Color('teal')])
+        >>> a = transform(colors, ('+', Hue(deg=30)), ('*', Saturation(0.5)))
+        >>> b = [(c + Hue(deg=30)) * Saturation(0.5) for c in colors]
+
+    Consecutive operations in the same color system are fused, so the
+    example above converts each color to HLS and back just once, rather than
+    once per operation. Note that fused operations are not clamped to the
+    RGB gamut between steps, so where an intermediate color falls outside it
+    (for example, adding lightness beyond 1.0 then reducing it again) the
+    result can differ from chained :class:`~colorzero.Color` arithmetic,
+    which clamps after every step. Hues are normalized between steps, as
+    they would be by chained arithmetic.
+
+    .. versionadded:: 2.1
+    """
+    return _transform(colors, _plan(operations))
+
+
+def _transform(colors, runs):
+    # Apply the *runs* planned by _plan to *colors*
+    if not isinstance(colors, ColorArray):
+        colors = ColorArray(colors)
+    r, g, b = colors.columns
+    for system, ops in runs:
+        if system == 'rgb':
+            # RGB operations are clamped after every step, exactly as chained
+            # arithmetic on Color would
+            for op, value in ops:
+                op = _OPERATORS[op]
+                if isinstance(value, types.RGB):
+                    r = _clamp(op(r, value[0]))
+                    g = _clamp(op(g, value[1]))
+                    b = _clamp(op(b, value[2]))
+                elif isinstance(value, attr.Red):
+                    r = _clamp(op(r, value))
+                elif isinstance(value, attr.Green):
+                    g = _clamp(op(g, value))
+                else:
+                    b = _clamp(op(b, value))
+        elif system == 'hls':
+            h, l, s = rgb_to_hls(r, g, b).columns
+            for op, value in ops:
+                op = _OPERATORS[op]
+                if isinstance(value, attr.Hue):
+                    h = op([h_ % 1.0 for h_ in h], value)
+                elif isinstance(value, attr.Lightness):
+                    l = op(l, value)
+                else:
+                    s = op(s, value)
+            r, g, b = (_clamp(col) for col in hls_to_rgb(h, l, s).columns)
+        else:
+            y, u, v = rgb_to_yuv(r, g, b).columns
+            for op, value in ops:
+                y = _OPERATORS[op](y, value)
+            r, g, b = yuv_to_rgb(y, u, v).columns
+    return ColorArray._from_lists(r, g, b)
@@ -0,0 +1,169 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines an on-disk cache for tables which are expensive to calculate, but
+cheap to memory-map once calculated.
+"""
+
+import os
+import io
+import sys
+import mmap
+import struct
+import hashlib
+import tempfile
+
+
+# Header: magic, format version, table version, payload size, SHA1 digest of
+# the payload
+_header = struct.Struct('=4sHHQ20s4x')
+_magic = b'CZTB' if sys.byteorder == 'little' else b'BTZC'
+_version = 1
+_suffix = '.table'
+
+
+def cache_dir():
+    """
+    Returns the path of the directory in which cached tables are stored. This
+    is the value of the ``COLORZERO_CACHE`` environment variable if set, or
+    the "colorzero" directory under the `XDG cache directory`_ (typically
+    :file:`~/.cache/colorzero`) otherwise.
+
+    .. _XDG cache directory: https://specifications.freedesktop.org/basedir-spec/latest/
+
+    .. versionadded:: 2.1
+    """
+    path = os.environ.get('COLORZERO_CACHE')
+    if path:
+        return path
+    path = os.environ.get('XDG_CACHE_HOME')
+    if not path or not os.path.isabs(path):
+        path = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(path, 'colorzero')
+
+
+def table(name, version, build, *, verify=False):
+    """
+    Returns the table *name* from the cache as a read-only
+    :class:`memoryview` of bytes.
+
+    If the cache does not contain the table, or the cached copy is of a
+    different *version*, or is corrupt, the *build* function is called (with
+    no arguments) to calculate the table, which must return a
+    :class:`bytes`-like object. The result is written to the cache, so that
+    subsequent calls (in this, or any other process) can memory-map the table
+    read-only instead; the operating system shares the pages of the mapped
+    table between all processes using it.
+
+    The checksum of a table is verified when it is written to the cache. When
+    a cached table is loaded, only its header and size are checked by default,
+    so that loading does not read (and page in) the whole table; if *verify*
+    is :data:`True`, the checksum of the loaded table is verified too.
+
+    If the cache directory cannot be written (a read-only home directory, for
+    example), the freshly calculated table is returned instead. The *name*
+    must be valid as a filename, and *version* must be an integer between 0
+    and 65535 that should be incremented whenever the content of the table
+    changes.
+
+    .. versionadded:: 2.1
+    """
+    if not 0 <= version <= 0xFFFF:
+        raise ValueError('version must be between 0 and 65535')
+    path = os.path.join(cache_dir(), name + _suffix)
+    result = _load(path, version, verify)
+    if result is None:
+        data = memoryview(build()).cast('B')
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, (
+                _header.pack(
+                    _magic, _version, version, len(data),
+                    hashlib.sha1(data).digest()),
+                data))
+        except OSError:
+            return memoryview(bytes(data))
+        # Prefer the mapped copy which is shared with other processes (and
+        # lets the calculated copy be freed), provided it was written intact
+        result = _load(path, version, True)
+        if result is None:  # pragma: no cover
+            return memoryview(bytes(data))
+    return result
+
+
+def _load(path, version, verify):
+    # Return the table at *path* as a read-only memoryview, or None if the
+    # file is missing or invalid. The checksum of the table is only checked
+    # if *verify* is true
+    try:
+        with io.open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Missing, unreadable, or empty file
+        return None
+    buf = memoryview(mapping)
+    try:
+        if len(buf) < _header.size:
+            return None
+        magic, fmt, table_version, size, digest = _header.unpack_from(buf)
+        if (
+                magic != _magic or fmt != _version or
+                table_version != version or
+                size != len(buf) - _header.size):
+            return None
+        result = buf[_header.size:]
+        if verify and hashlib.sha1(result).digest() != digest:
+            result.release()
+            return None
+        return result
+    finally:
+        buf.release()
+
+
+def clear():
+    """
+    Remove all tables from the cache. Processes which have already mapped a
+    table are unaffected; the next call to :func:`table` for each will
+    recalculate it.
+
+    .. versionadded:: 2.1
+    """
+    path = cache_dir()
+    try:
+        names = os.listdir(path)
+    except FileNotFoundError:
+        return
+    for name in names:
+        if name.endswith(_suffix):
+            try:
+                os.unlink(os.path.join(path, name))
+            except FileNotFoundError:  # pragma: no cover
+                pass
+
+
+def write_atomic(path, chunks):
+    """
+    Write the :class:`bytes`-like *chunks* to the file at *path* atomically;
+    the chunks are written to a temporary file alongside *path* which is then
+    renamed over it, so processes concurrently reading *path* never observe a
+    partial file.
+
+    .. versionadded:: 2.1
+    """
+    path = os.fspath(path)
+    fd, temp = tempfile.mkstemp(
+        dir=os.path.dirname(path) or '.', prefix='.colorzero-')
+    try:
+        with io.open(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp, path)
+    except:
+        os.unlink(temp)
+        raise
@@ -8,10 +8,10 @@
 
 "Defines the main :class:`Color` class of the package."
 
-import re
+import operator
 import warnings
 
-from . import conversions as cv, types, attr, deltae, tables, easings
+from . import conversions as cv, types, attr, deltae, tables, easings, term
 
 # Lots of the methods below use single character parameter names (r for red, y
 # for luma, etc.); this is is normal and in keeping with most of the referenced
@@ -214,6 +214,9 @@ class Color(types.RGB):
         * 'term256' - Similar to 'term16m', but uses the closest color that
           can be found in the standard 256-color xterm palette. Note that the
           terminal must support `8-bit color ANSI codes`_ for this to work.
+        * 'term' - Selects 'term16m', 'term256', or 'default' according to the
+          capabilities of the terminal attached to :data:`sys.stdout` (see
+          :func:`~colorzero.term.term_colors`).
         * 'html' - Outputs a valid :class:`Color` constructor using the HTML
           style, e.g. ``Color('#ff99bb')``
         * 'rgb' - Outputs a valid :class:`Color` constructor using the floating
@@ -226,23 +229,8 @@ class Color(types.RGB):
     repr_style = 'default'
 
     def __new__(cls, *args, **kwargs):
-        def from_rgb(r, g, b):
-            "Determine whether bytes or floats are being passed for RGB"
-            if 0.0 <= r <= 1.0 and 0.0 <= g <= 1.0 and 0.0 <= b <= 1.0:
-                return cls.from_rgb(r, g, b)
-            else:
-                return cls.from_rgb_bytes(r, g, b)
-
-        def from_yuv(y, u, v):
-            "Determine whether bytes or floats are being passed for YUV"
-            if (
-                    0.0 <= y <= 1.0 and
-                    abs(u) <= cv.BT601.Umax and
-                    abs(v) <= cv.BT601.Vmax):
-                return cls.from_yuv(y, u, v)
-            else:
-                return cls.from_yuv_bytes(y, u, v)
-
+        from_rgb = cls._from_rgb_guess
+        from_yuv = cls._from_yuv_guess
         if kwargs:
             try:
                 # Yes, lambdas are fine here
@@ -285,6 +273,14 @@ class Color(types.RGB):
                 if isinstance(spec, str):
                     return cls.from_string(spec)
                 elif isinstance(spec, tuple):
+                    try:
+                        # Fast path for the tuples of colorzero.types, which
+                        # avoids constructing a dict of the fields
+                        convert = Color._from_tuple[type(spec)]
+                    except KeyError:
+                        pass
+                    else:
+                        return getattr(cls, convert)(*spec)
                     try:
                         return cls(**spec._asdict())
                     except AttributeError:
@@ -297,6 +293,44 @@ class Color(types.RGB):
                 return from_rgb(r, g, b)
         raise ValueError('Unable to construct Color from provided arguments')
 
+    @classmethod
+    def _from_rgb_guess(cls, r, g, b):
+        "Determine whether bytes or floats are being passed for RGB"
+        if 0.0 <= r <= 1.0 and 0.0 <= g <= 1.0 and 0.0 <= b <= 1.0:
+            return cls.from_rgb(r, g, b)
+        else:
+            return cls.from_rgb_bytes(r, g, b)
+
+    @classmethod
+    def _from_yuv_guess(cls, y, u, v):
+        "Determine whether bytes or floats are being passed for YUV"
+        if (
+                0.0 <= y <= 1.0 and
+                abs(u) <= cv.BT601.Umax and
+                abs(v) <= cv.BT601.Vmax):
+            return cls.from_yuv(y, u, v)
+        else:
+            return cls.from_yuv_bytes(y, u, v)
+
+    # Maps the tuple types of colorzero.types to the name of the method which
+    # constructs a Color from their fields (in order). Color itself is added
+    # below the class definition
+    _from_tuple = {
+        types.RGB:  '_from_rgb_guess',
+        types.YUV:  '_from_yuv_guess',
+        types.YIQ:  'from_yiq',
+        types.HLS:  'from_hls',
+        types.HSV:  'from_hsv',
+        types.XYZ:  'from_xyz',
+        types.Lab:  'from_lab',
+        types.LCh:  'from_lch',
+        types.Luv:  'from_luv',
+        types.OkLab: 'from_oklab',
+        types.OkLCh: 'from_oklch',
+        types.CMY:  'from_cmy',
+        types.CMYK: 'from_cmyk',
+    }
+
     @classmethod
     def from_string(cls, s):
         """
@@ -349,27 +383,41 @@ class Color(types.RGB):
         return cls.from_rgb(*cv.rgb_bytes_to_rgb(r, g, b))
 
     @classmethod
-    def from_yuv(cls, y, u, v):
+    def from_yuv(cls, y, u, v, standard='bt601', gamut='clip'):
         """
         Construct a :class:`Color` from three `Y'UV`_ float values. The Y value
         may be between 0.0 and 1.0. U may be between -0.436 and 0.436, while
         V may be between -0.615 and 0.615.
 
+        The optional *standard* selects the coefficients of the conversion,
+        and may be "bt601" (the default, used by standard definition video),
+        "bt709" (used by high definition video), or "smpte240m". The *gamut*
+        method, applied to values outside the RGB gamut, is as in
+        :meth:`from_xyz`.
+
         .. _Y'UV: https://en.wikipedia.org/wiki/YUV
+
+        .. versionchanged:: 2.1
+            Added the *standard* and *gamut* parameters.
         """
-        return cls.from_rgb(*cv.yuv_to_rgb(y, u, v))
+        return cls.from_rgb(
+            *cv.yuv_to_rgb(y, u, v, cv.yuv_standard(standard), gamut))
 
     @classmethod
-    def from_yuv_bytes(cls, y, u, v):
+    def from_yuv_bytes(cls, y, u, v, standard='bt601'):
         """
         Construct a :class:`Color` from three `Y'UV`_ byte values between 0 and
         255. The U and V values are biased by 128 to prevent negative values as
         is typical in video applications. The Y value is biased by 16 for the
-        same purpose.
+        same purpose. The optional *standard* is as for :meth:`from_yuv`.
 
         .. _Y'UV: https://en.wikipedia.org/wiki/YUV
+
+        .. versionchanged:: 2.1
+            Added the *standard* parameter.
         """
-        return cls.from_rgb_bytes(*cv.yuv_bytes_to_rgb_bytes(y, u, v))
+        return cls.from_rgb_bytes(
+            *cv.yuv_bytes_to_rgb_bytes(y, u, v, cv.yuv_standard(standard)))
 
     @classmethod
     def from_yiq(cls, y, i, q):
@@ -436,146 +484,208 @@ class Color(types.RGB):
         return cls.from_cmy(*cv.cmyk_to_cmy(c, m, y, k))
 
     @classmethod
-    def from_xyz(cls, x, y, z):
+    def from_xyz(cls, x, y, z, white='d65', gamut='clip'):
         """
         Construct a :class:`Color` from (X, Y, Z) float values representing
         a color in the `CIE 1931 color space`_. The conversion assumes the
         sRGB working space with reference white D65.
 
+        If another reference *white* is given, either as the name of a
+        standard illuminant ("a", "b", "c", "d50", "d55", "d65", "d75", "e",
+        "f2", "f7", or "f11") or as an (X, Y, Z) tuple, the values are
+        assumed to be relative to that white, and are adapted to D65 with the
+        Bradford transform.
+
+        Colors outside the sRGB gamut are mapped into it according to
+        *gamut*. The default, "clip", clamps each of the red, green, and blue
+        components, which can noticeably shift the hue of the color. With
+        "lch" or "oklch", the lightness and hue of the color are preserved,
+        and its chroma (in CIE LCh or OKLCh respectively) is reduced to the
+        greatest the gamut permits. For example::
+
+            >>> Color.from_lch(60, 120, 140)
+            <Color html='#00b000' rgb=(0, 0.688672, 0)>
+            >>> Color.from_lch(60, 120, 140).lch
+            LCh(l=62.42007521737111, c=90.54666390923545, h=136.01595303206315)
+            >>> Color.from_lch(60, 120, 140, gamut='lch')
+            <Color html='#00a82b' rgb=(0, 0.658265, 0.167656)>
+            >>> Color.from_lch(60, 120, 140, gamut='lch').lch
+            LCh(l=60.000016102173305, c=79.62333156344062, h=139.9999199524706)
+
         .. _CIE 1931 color space: https://en.wikipedia.org/wiki/CIE_1931_color_space
+
+        .. versionchanged:: 2.1
+            Added the *white* and *gamut* parameters.
         """
-        return cls.from_rgb(*cv.xyz_to_rgb(x, y, z))
+        return cls.from_rgb(*cv.gamut_map(
+            *cv.xyz_to_rgb(x, y, z, cv.white_point(white)), method=gamut))
 
     @classmethod
-    def from_lab(cls, l, a, b):
+    def from_lab(cls, l, a, b, white='d65', gamut='clip'):
         """
         Construct a :class:`Color` from (L*, a*, b*) float values representing
         a color in the `CIE Lab color space`_. The conversion assumes the
-        sRGB working space with reference white D65.
+        sRGB working space with reference white D65, or another reference
+        *white*, and maps colors outside the sRGB gamut into it according to
+        *gamut*, as in :meth:`from_xyz`.
 
         .. _CIE Lab color space: https://en.wikipedia.org/wiki/Lab_color_space
+
+        .. versionchanged:: 2.1
+            Added the *white* and *gamut* parameters.
+        """
+        return cls.from_rgb(*cv.gamut_map(
+            *cv.lab_to_rgb(l, a, b, cv.white_point(white)), method=gamut))
+
+    @classmethod
+    def from_lch(cls, l, c, h, white='d65', gamut='clip'):
+        """
+        Construct a :class:`Color` from (L*, C*, h) float values representing
+        a color in the cylindrical form of the `CIE Lab color space`_; the
+        lightness, chroma, and hue in degrees. The reference *white* and
+        *gamut* are as in :meth:`from_lab`.
+
+        .. _CIE Lab color space: https://en.wikipedia.org/wiki/Lab_color_space
+
+        .. versionadded:: 2.1
         """
-        return cls.from_xyz(*cv.lab_to_xyz(l, a, b))
+        return cls.from_lab(
+            *cv.lch_to_lab(l, c, h), white=white, gamut=gamut)
 
     @classmethod
-    def from_luv(cls, l, u, v):
+    def from_luv(cls, l, u, v, white='d65', gamut='clip'):
         """
         Construct a :class:`Color` from (L*, u*, v*) float values representing
         a color in the `CIE Luv color space`_. The conversion assumes the sRGB
-        working space with reference white D65.
+        working space with reference white D65, or another reference *white*,
+        and maps colors outside the sRGB gamut into it according to *gamut*,
+        as in :meth:`from_xyz`.
 
         .. _CIE Luv color space: https://en.wikipedia.org/wiki/CIELUV
+
+        .. versionchanged:: 2.1
+            Added the *white* and *gamut* parameters.
+        """
+        return cls.from_rgb(*cv.gamut_map(
+            *cv.luv_to_rgb(l, u, v, cv.white_point(white)), method=gamut))
+
+    @classmethod
+    def from_oklab(cls, l, a, b, gamut='clip'):
+        """
+        Construct a :class:`Color` from (L, a, b) float values representing a
+        color in the `OKLab color space`_. L is between 0.0 (black) and 1.0
+        (white), while a and b are typically between -0.4 and 0.4. Colors
+        outside the sRGB gamut are mapped into it according to *gamut*, as in
+        :meth:`from_xyz`.
+
+        .. _OKLab color space: https://bottosson.github.io/posts/oklab/
+
+        .. versionadded:: 2.1
         """
-        return cls.from_xyz(*cv.luv_to_xyz(l, u, v))
+        return cls.from_rgb(
+            *cv.gamut_map(*cv.oklab_to_rgb(l, a, b), method=gamut))
+
+    @classmethod
+    def from_oklch(cls, l, c, h, gamut='clip'):
+        """
+        Construct a :class:`Color` from (L, C, h) float values representing a
+        color in the cylindrical form of the `OKLab color space`_; L is the
+        lightness as in :meth:`from_oklab`, C the chroma, and h the hue in
+        degrees. The *gamut* is as in :meth:`from_oklab`.
+
+        .. _OKLab color space: https://bottosson.github.io/posts/oklab/
+
+        .. versionadded:: 2.1
+        """
+        return cls.from_oklab(*cv.oklch_to_oklab(l, c, h), gamut=gamut)
+
+    # The arithmetic operators look up the function implementing each
+    # operation in a table keyed by the type of the other operand (see
+    # _operation below). The tables are populated after the class definition
+
+    _add_ops = {}
+    _sub_ops = {}
+    _rsub_ops = {}
+    _mul_ops = {}
+
+    @staticmethod
+    def _operation(table, other):
+        # Return the function implementing the operation in *table* for
+        # *other*, or None if unsupported. Subclasses of the supported types
+        # are found by their MRO and cached for next time
+        cls = type(other)
+        try:
+            return table[cls]
+        except KeyError:
+            for base in cls.__mro__[1:]:
+                try:
+                    op = table[base]
+                except KeyError:
+                    continue
+                table[cls] = op
+                return op
+            return None
 
     def __add__(self, other):
-        if isinstance(other, types.RGB):
-            return Color.from_rgb(self.r + other.r,
-                                  self.g + other.g,
-                                  self.b + other.b)
-        elif isinstance(other, (attr.Red, attr.Green, attr.Blue)):
-            r, g, b = self
-            return Color.from_rgb(
-                r + other if isinstance(other, attr.Red) else r,
-                g + other if isinstance(other, attr.Green) else g,
-                b + other if isinstance(other, attr.Blue) else b,
-            )
-        elif isinstance(other, (attr.Hue, attr.Lightness, attr.Saturation)):
-            h, l, s = self.hls
-            return Color.from_hls(
-                h + other if isinstance(other, attr.Hue) else h,
-                l + other if isinstance(other, attr.Lightness) else l,
-                s + other if isinstance(other, attr.Saturation) else s,
-            )
-        elif isinstance(other, attr.Luma):
-            y, u, v = self.yuv
-            return Color.from_yuv(y + other, u, v)
-        return NotImplemented
-
-    def __radd__(self, other):
-        # Addition is commutative
-        if isinstance(other, (types.RGB,
-                              attr.Red, attr.Green, attr.Blue,
-                              attr.Hue, attr.Lightness, attr.Saturation,
-                              attr.Luma)):
-            return self.__add__(other)
-        return NotImplemented
+        try:
+            op = Color._add_ops[type(other)]
+        except KeyError:
+            op = Color._operation(Color._add_ops, other)
+            if op is None:
+                return NotImplemented
+        return op(self, other)
+
+    # Addition is commutative
+    __radd__ = __add__
 
     def __sub__(self, other):
-        if isinstance(other, types.RGB):
-            return Color.from_rgb(self.r - other.r,
-                                  self.g - other.g,
-                                  self.b - other.b)
-        elif isinstance(other, (attr.Red, attr.Green, attr.Blue)):
-            r, g, b = self.rgb
-            return Color.from_rgb(
-                r - other if isinstance(other, attr.Red) else r,
-                g - other if isinstance(other, attr.Green) else g,
-                b - other if isinstance(other, attr.Blue) else b,
-            )
-        elif isinstance(other, (attr.Hue, attr.Lightness, attr.Saturation)):
-            h, l, s = self.hls
-            return Color.from_hls(
-                h - other if isinstance(other, attr.Hue) else h,
-                l - other if isinstance(other, attr.Lightness) else l,
-                s - other if isinstance(other, attr.Saturation) else s,
-            )
-        elif isinstance(other, attr.Luma):
-            y, u, v = self.yuv
-            return Color.from_yuv(y - other, u, v)
-        return NotImplemented
+        try:
+            op = Color._sub_ops[type(other)]
+        except KeyError:
+            op = Color._operation(Color._sub_ops, other)
+            if op is None:
+                return NotImplemented
+        return op(self, other)
 
     def __rsub__(self, other):
-        if isinstance(other, (attr.Red, attr.Green, attr.Blue)):
-            r, g, b = self.rgb
-            return Color.from_rgb(
-                other - r if isinstance(other, attr.Red) else 0.0,
-                other - g if isinstance(other, attr.Green) else 0.0,
-                other - b if isinstance(other, attr.Blue) else 0.0,
-            )
-        return NotImplemented
+        try:
+            op = Color._rsub_ops[type(other)]
+        except KeyError:
+            op = Color._operation(Color._rsub_ops, other)
+            if op is None:
+                return NotImplemented
+        return op(self, other)
 
     def __mul__(self, other):
-        if isinstance(other, types.RGB):
-            return Color.from_rgb(self.r * other.r,
-                                  self.g * other.g,
-                                  self.b * other.b)
-        elif isinstance(other, (attr.Red, attr.Green, attr.Blue)):
-            r, g, b = self
-            return Color.from_rgb(
-                r * other if isinstance(other, attr.Red) else r,
-                g * other if isinstance(other, attr.Green) else g,
-                b * other if isinstance(other, attr.Blue) else b,
-            )
-        elif isinstance(other, (attr.Hue, attr.Lightness, attr.Saturation)):
-            h, l, s = self.hls
-            return Color.from_hls(
-                h * other if isinstance(other, attr.Hue) else h,
-                l * other if isinstance(other, attr.Lightness) else l,
-                s * other if isinstance(other, attr.Saturation) else s,
-            )
-        elif isinstance(other, attr.Luma):
-            y, u, v = self.yuv
-            return Color.from_yuv(y * other, u, v)
-        return NotImplemented
-
-    def __rmul__(self, other):
-        # Multiplication is commutative
-        if isinstance(other, (types.RGB,
-                              attr.Red, attr.Green, attr.Blue,
-                              attr.Hue, attr.Lightness, attr.Saturation,
-                              attr.Luma)):
-            return self.__mul__(other)
-        return NotImplemented
-
-    _format_re = re.compile(
-        r'^('
-        r'(?P<html>html)|'
-        r'(?P<css>css(?P<cssfmt>rgb|hsl)?)|'
-        r'(?P<back>[fb])?(?P<term>0|8|256|16m)?'
-        r')$')
+        try:
+            op = Color._mul_ops[type(other)]
+        except KeyError:
+            op = Color._operation(Color._mul_ops, other)
+            if op is None:
+                return NotImplemented
+        return op(self, other)
+
+    # Multiplication is commutative
+    __rmul__ = __mul__
+
+    _format_re = None
+
+    @staticmethod
+    def _format_match(format_spec):
+        # The regex (and the re module) are only loaded on first use as many
+        # scripts never format a color
+        if Color._format_re is None:
+            import re  # pylint: disable=import-outside-toplevel
+            Color._format_re = re.compile(
+                r'^('
+                r'(?P<html>html)|'
+                r'(?P<css>css(?P<cssfmt>rgb|hsl)?)|'
+                r'(?P<back>[fb])?(?P<term>0|8|256|16m)?'
+                r')$')
+        return Color._format_re.match(format_spec)
+
     def __format__(self, format_spec):
-        m = Color._format_re.match(format_spec.lower())
+        m = Color._format_match(format_spec.lower())
         if not m:
             raise ValueError(
                 'Invalid format {!r} for Color'.format(format_spec))
@@ -598,6 +708,10 @@ class Color(types.RGB):
         }[cssfmt](self)
 
     def _format_term(self, back, term):
+        # The palette module is only needed when searching for the nearest
+        # palette entry; deferring it avoids importing multiprocessing with
+        # colorzero
+        from . import palette  # pylint: disable=import-outside-toplevel
         if term == '0':
             warnings.warn(
                 DeprecationWarning(
@@ -612,16 +726,15 @@ class Color(types.RGB):
             if back == 'b':
                 code = 40
                 table = tables.DOS_BACK_COLORS
+                colors = palette.standard('dos-back')
             else:
                 code = 30
                 table = tables.DOS_FORE_COLORS
+                colors = palette.standard('dos-fore')
             try:
                 bold, index = table[self.rgb_bytes]
             except KeyError:
-                bold, index = sorted(
-                    (self.difference(Color.from_rgb_bytes(*color)), bold, index)
-                    for color, (bold, index) in table.items()
-                )[0][1:]
+                bold, index = divmod(colors.nearest(self), 8)
             args = () if back == 'b' else (1,) if bold else (22,)
             args += (code + index,)
         elif term == '256':
@@ -629,10 +742,7 @@ class Color(types.RGB):
             try:
                 index = tables.XTERM_COLORS[self.rgb_bytes]
             except KeyError:
-                index = sorted(
-                    (self.difference(Color.from_rgb_bytes(*color)), index)
-                    for color, index in tables.XTERM_COLORS.items()
-                )[0][1]
+                index = palette.standard('xterm').nearest(self)
             args = (48 if back == 'b' else 38, 5, index)
         elif term.lower() == '16m':
             args = (48 if back == 'b' else 38, 2) + self.rgb_bytes
@@ -644,6 +754,12 @@ class Color(types.RGB):
         return self.html
 
     def __repr__(self):
+        style = Color.repr_style.lower()
+        if style == 'term':
+            style = {
+                '16m': 'term16m',
+                '256': 'term256',
+            }.get(term.term_colors(), 'default')
         try:
             return {
                 'default': '<Color html={self.html!r} '
@@ -654,7 +770,7 @@ class Color(types.RGB):
                            'rgb=({self.r:g}, {self.g:g}, {self.b:g})>',
                 'html':    'Color({self.html!r})',
                 'rgb':     'Color({self.r:g}, {self.g:g}, {self.b:g})',
-            }[Color.repr_style.lower()].format(self=self, Default=Default)
+            }[style].format(self=self, Default=Default)
         except KeyError:
             raise ValueError(
                 'invalid repr_style value: {}'.format(Color.repr_style)
@@ -714,6 +830,30 @@ class Color(types.RGB):
         """
         return cv.rgb_bytes_to_yuv_bytes(*self.rgb_bytes)
 
+    def to_yuv(self, standard='bt601'):
+        """
+        Returns a 3-tuple of (y, u, v) float values as :attr:`yuv`, using the
+        coefficients of *standard*, which may be "bt601" (the default, and the
+        coefficients used by :attr:`yuv`), "bt709", or "smpte240m". For
+        example, when preparing colors for high definition video::
+
+            >>> Color('red').to_yuv('bt709')
+            YUV(y=0.2126, u=-0.0999069, v=0.615)
+
+        .. versionadded:: 2.1
+        """
+        return cv.rgb_to_yuv(*self, std=cv.yuv_standard(standard))
+
+    def to_yuv_bytes(self, standard='bt601'):
+        """
+        Returns a 3-tuple of (y, u, v) byte values as :attr:`yuv_bytes`, using
+        the coefficients of *standard* (see :meth:`to_yuv`).
+
+        .. versionadded:: 2.1
+        """
+        return cv.rgb_bytes_to_yuv_bytes(
+            *self.rgb_bytes, std=cv.yuv_standard(standard))
+
     @property
     def yiq(self):
         """
@@ -742,7 +882,29 @@ class Color(types.RGB):
         .. _CIE Lab color space: https://en.wikipedia.org/wiki/Lab_color_space
         .. _D65 standard illuminant: https://en.wikipedia.org/wiki/Illuminant_D65
         """
-        return cv.xyz_to_lab(*self.xyz)
+        return cv.rgb_to_lab(*self)
+
+    @property
+    def lch(self):
+        """
+        Returns a 3-tuple of (L*, C*, h) float values representing the color
+        in the cylindrical form of the `CIE Lab color space`_ (see
+        :attr:`lab`): the lightness, the chroma, and the hue in degrees. For
+        example::
+
+            >>> Color('red').lch
+            LCh(l=53.24079414130722, c=104.55176567686985, h=39.99901061253294)
+
+        The :func:`cie1994g`, :func:`cie1994t`, and :func:`ciede2000` functions
+        accept these values in place of CIE Lab, which avoids calculating the
+        chroma (and, for CIE 1994, the hue) of a color for every comparison it
+        is involved in.
+
+        .. _CIE Lab color space: https://en.wikipedia.org/wiki/Lab_color_space
+
+        .. versionadded:: 2.1
+        """
+        return cv.lab_to_lch(*self.lab)
 
     @property
     def luv(self):
@@ -752,7 +914,70 @@ class Color(types.RGB):
 
         .. _CIE Luv color space: https://en.wikipedia.org/wiki/CIELUV
         """
-        return cv.xyz_to_luv(*self.xyz)
+        return cv.rgb_to_luv(*self)
+
+    @property
+    def oklab(self):
+        """
+        Returns a 3-tuple of (L, a, b) float values representing the color in
+        the `OKLab color space`_. Like CIE Lab, this is intended to be
+        perceptually uniform, but the conversion is considerably cheaper. For
+        example::
+
+            >>> Color('red').oklab
+            OkLab(l=0.6279553606145516, a=0.22486306106597398, b=0.1258462985307351)
+
+        .. _OKLab color space: https://bottosson.github.io/posts/oklab/
+
+        .. versionadded:: 2.1
+        """
+        return cv.rgb_to_oklab(*self)
+
+    @property
+    def oklch(self):
+        """
+        Returns a 3-tuple of (L, C, h) float values representing the color in
+        the cylindrical form of the `OKLab color space`_: the lightness, the
+        chroma, and the hue in degrees (see :attr:`oklab`).
+
+        .. _OKLab color space: https://bottosson.github.io/posts/oklab/
+
+        .. versionadded:: 2.1
+        """
+        return cv.oklab_to_oklch(*cv.rgb_to_oklab(*self))
+
+    def to_xyz(self, white='d65'):
+        """
+        Returns a 3-tuple of (X, Y, Z) float values as :attr:`xyz`, but
+        relative to the reference *white*, which may be the name of a standard
+        illuminant, or an (X, Y, Z) tuple (see :meth:`from_xyz`). The color is
+        adapted from D65 with the Bradford transform. For example, to obtain
+        the values used by ICC profiles, which are relative to D50::
+
+            >>> Color('red').to_xyz('d50')
+            XYZ(x=0.4371139896374961, y=0.22289937039485316, z=0.013920664550147418)
+
+        .. versionadded:: 2.1
+        """
+        return cv.rgb_to_xyz(*self, white=cv.white_point(white))
+
+    def to_lab(self, white='d65'):
+        """
+        Returns a 3-tuple of (L*, a*, b*) float values as :attr:`lab`, but
+        relative to the reference *white* (see :meth:`to_xyz`).
+
+        .. versionadded:: 2.1
+        """
+        return cv.rgb_to_lab(*self, white=cv.white_point(white))
+
+    def to_luv(self, white='d65'):
+        """
+        Returns a 3-tuple of (L*, u*, v*) float values as :attr:`luv`, but
+        relative to the reference *white* (see :meth:`to_xyz`).
+
+        .. versionadded:: 2.1
+        """
+        return cv.rgb_to_luv(*self, white=cv.white_point(white))
 
     @property
     def hls(self):
@@ -858,6 +1083,9 @@ class Color(types.RGB):
               bias for calculating the difference.
             * 'ciede2000' - Use the `CIEDE 2000`_ formula for calculating the
               difference.
+            * 'oklab' - Calculate the Euclidean distance between the two colors
+              in the `OKLab`_ color space. This is nearly as quick as 'euclid'
+              but is considerably closer to human perception.
 
         :returns:
             A :class:`float` indicating how different the two colors are. Note
@@ -897,6 +1125,10 @@ class Color(types.RGB):
         .. _CIE 1976: https://en.wikipedia.org/wiki/Color_difference#CIE76
         .. _CIE 1994: https://en.wikipedia.org/wiki/Color_difference#CIE94
         .. _CIEDE 2000: https://en.wikipedia.org/wiki/Color_difference#CIEDE2000
+        .. _OKLab: https://bottosson.github.io/posts/oklab/
+
+        .. versionchanged:: 2.1
+            Added the 'oklab' method.
         """
         if isinstance(method, bytes):
             method = method.decode('ascii')
@@ -906,10 +1138,47 @@ class Color(types.RGB):
             raise ValueError('invalid method: {}'.format(method)) from None
         else:
             if method.startswith('cie'):
-                return fn(self.lab, other.lab)
+                return fn(cv.rgb_to_lab(*self), cv.rgb_to_lab(*other))
+            elif method == 'oklab':
+                return fn(self.oklab, other.oklab)
             else:
                 return fn(self, other)
 
+    def comparator(self, method='ciede2000'):
+        """
+        Returns a function which accepts a single :class:`Color` (or any
+        3-tuple of linear RGB floats), and calculates its difference from this
+        color according to *method*, which accepts the same values as
+        :meth:`difference`. For example::
+
+            >>> compare = Color('red').comparator()
+            >>> compare(Color('#900'))
+            21.078146289272155
+            >>> sorted(['purple', 'orange', 'brown'], key=lambda name:
+            ...        compare(Color(name)))
+            ['brown', 'orange', 'purple']
+
+        The result of ``Color('red').comparator(method)(other)`` is the same
+        as ``Color('red').difference(other, method)``, but the method is looked
+        up and the terms of its formula depending on this color alone (like
+        its CIE Lab representation) are calculated once, rather than on every
+        call. When comparing one color against many, this leaves only the cost
+        of converting each candidate. See :func:`~colorzero.deltae.comparator`
+        to compare pre-converted candidates.
+
+        .. versionadded:: 2.1
+        """
+        if isinstance(method, bytes):
+            method = method.decode('ascii')
+        if method in ('cie1976', 'cie1994g', 'cie1994t', 'ciede2000'):
+            compare = deltae.comparator(self.lab, method)
+            return lambda other: compare(cv.rgb_to_lab(*other))
+        elif method == 'oklab':
+            compare = deltae.comparator(self.oklab, method)
+            return lambda other: compare(cv.rgb_to_oklab(*other))
+        else:
+            return deltae.comparator(self, method)
+
     def gradient(self, other, steps=10, easing=easings.linear):
         """
         Returns a generator which fades between this color and *other* in the
@@ -966,6 +1235,73 @@ class Color(types.RGB):
             yield self + types.RGB(*(delta_i * t for delta_i in delta))
 
 
+# Color components are always clamped between 0.0 and 1.0 so there's no need
+# to guess whether they're bytes
+Color._from_tuple[Color] = 'from_rgb'
+
+
+def _arithmetic(op, table):
+    # Populate *table* with the implementations of *op* for each supported
+    # type of operand
+    def rgb(color, other):
+        r, g, b = color
+        return Color.from_rgb(
+            op(r, other[0]), op(g, other[1]), op(b, other[2]))
+
+    def red(color, other):
+        r, g, b = color
+        return Color.from_rgb(op(r, other), g, b)
+
+    def green(color, other):
+        r, g, b = color
+        return Color.from_rgb(r, op(g, other), b)
+
+    def blue(color, other):
+        r, g, b = color
+        return Color.from_rgb(r, g, op(b, other))
+
+    def hue(color, other):
+        h, l, s = cv.rgb_to_hls(*color)
+        return Color.from_hls(op(h, other), l, s)
+
+    def lightness(color, other):
+        h, l, s = cv.rgb_to_hls(*color)
+        return Color.from_hls(h, op(l, other), s)
+
+    def saturation(color, other):
+        h, l, s = cv.rgb_to_hls(*color)
+        return Color.from_hls(h, l, op(s, other))
+
+    def luma(color, other):
+        y, u, v = cv.rgb_to_yuv(*color)
+        return Color.from_yuv(op(y, other), u, v)
+
+    table.update({
+        types.RGB: rgb, Color: rgb,
+        attr.Red: red, attr.Green: green, attr.Blue: blue,
+        attr.Hue: hue, attr.Lightness: lightness,
+        attr.Saturation: saturation, attr.Luma: luma,
+    })
+
+
+def _reflected_sub(cls):
+    # Subtracting a color from a single channel yields just that channel
+    index = (attr.Red, attr.Green, attr.Blue).index(cls)
+
+    def sub(color, other):
+        rgb = [0.0, 0.0, 0.0]
+        rgb[index] = other - color[index]
+        return Color.from_rgb(*rgb)
+    return sub
+
+
+_arithmetic(operator.add, Color._add_ops)
+_arithmetic(operator.sub, Color._sub_ops)
+_arithmetic(operator.mul, Color._mul_ops)
+Color._rsub_ops.update({
+    cls: _reflected_sub(cls) for cls in (attr.Red, attr.Green, attr.Blue)})
+
+
 class _Default:
     """
     The Default singleton is a special value representing the default color for
@@ -984,7 +1320,7 @@ class _Default:
         return '<Color Default>'
 
     def __format__(self, format_spec):
-        m = Color._format_re.match(format_spec)
+        m = Color._format_match(format_spec)
         if not m:
             raise ValueError(
                 'Invalid format {!r} for Default'.format(format_spec))
@@ -19,6 +19,7 @@ routines are as follows:
 * `YIQ`_ article from Wikipedia
 * `HSL and HSV`_ article from Wikipedia
 * `CIE 1931 color space`_ article from Wikipedia
+* `Björn Ottosson's Oklab`_ color space
 
 .. _RGB color space: https://en.wikipedia.org/wiki/RGB_color_space
 .. _SRGB: https://en.wikipedia.org/wiki/SRGB
@@ -28,14 +29,19 @@ routines are as follows:
 .. _CIE 1931 color space: https://en.wikipedia.org/wiki/CIE_1931_color_space
 .. _Charles Poynton's Color FAQ: http://www.poynton.com/notes/colour_and_gamma/ColorFAQ.html
 .. _Bruce Lindbloom's Color Equations: https://www.brucelindbloom.com/
+.. _Björn Ottosson's Oklab: https://bottosson.github.io/posts/oklab/
 """
 
 import colorsys
+from functools import lru_cache
+from math import copysign, hypot, atan2, degrees, radians, sin, cos
 from collections import namedtuple
 from fractions import Fraction
 
+from . import matrix
 from .tables import NAMED_COLORS
-from .types import RGB, YIQ, YUV, CMY, CMYK, HLS, HSV, XYZ, Luv, Lab
+from .types import (
+    RGB, YIQ, YUV, CMY, CMYK, HLS, HSV, XYZ, Luv, Lab, LCh, OkLab, OkLCh)
 
 # Lots of the conversion functions use single character parameter names and
 # variables internally; this is is normal and in keeping with most of the
@@ -71,12 +77,33 @@ def xyz_to_uv(x, y, z):
     return (0, 0) if d == 0 else (4 * x / d, 9 * y / d)
 
 
+def cbrt(v):
+    "Return the real cube root of *v* (which may be negative)"
+    return copysign(abs(v) ** (1 / 3), v)
+
+
 def matrix_mult(m, n):
-    "Generator function that multiplies matrices *m* and *n*"
-    return (
-        sum(mval * nval for mval, nval in zip(mrow, n))
-        for mrow in m
-    )
+    """
+    Return the product of the 3x3 matrix *m* and the 3-vector *n* (see
+    :func:`colorzero.matrix.mult`)
+    """
+    return matrix.mult(m, *n)
+
+
+def matrix_product(m, n):
+    """
+    Return the product of the 3x3 matrices *m* and *n* (see
+    :func:`colorzero.matrix.product`)
+    """
+    return matrix.product(m, n)
+
+
+def matrix_inverse(m):
+    """
+    Return the inverse of the 3x3 matrix *m* (see
+    :func:`colorzero.matrix.inverse`)
+    """
+    return matrix.inverse(m)
 
 
 class YUVCoefficients(namedtuple('YUVCoefficients', (
@@ -107,21 +134,182 @@ class YUVCoefficients(namedtuple('YUVCoefficients', (
 BT601 = YUVCoefficients(Wr=0.299, Wb=0.114)
 BT709 = YUVCoefficients(Wr=0.2126, Wb=0.0722)
 SMPTE240M = YUVCoefficients(Wr=0.212, Wb=0.087)
-# TODO define some API to use these in Color
+
+# The standards which may be selected by name for Y'UV conversions
+YUV_STANDARDS = {
+    'bt601': BT601,
+    'bt709': BT709,
+    'smpte240m': SMPTE240M,
+}
+
+
+def yuv_standard(standard):
+    """
+    Return the :class:`YUVCoefficients` for *standard*, which may be the name
+    of one of the :data:`YUV_STANDARDS` or a :class:`YUVCoefficients`
+    instance (which is returned as is)
+    """
+    if isinstance(standard, YUVCoefficients):
+        return standard
+    try:
+        return YUV_STANDARDS[standard.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(
+            'invalid YUV standard: {!r}'.format(standard)) from None
+
+
+# The integer coefficients of the studio swing conversions for each standard,
+# calculated on first use by studio_coefficients
+_studio = {}
+
+
+def studio_coefficients(std):
+    """
+    Return the integer coefficients (scaled by 256) of the studio swing
+    conversion for the :class:`YUVCoefficients` *std* as a 2-tuple of the
+    forward coefficients (Yr, Yg, Yb, Ur, Ug, Ub, Vr, Vg, Vb) and the inverse
+    coefficients (Y, Rv, Gu, Gv, Bu). The results are cached, so this is cheap
+    to call repeatedly
+    """
+    try:
+        return _studio[std]
+    except KeyError:
+        pass
+    Wr, Wg, Wb = std.Wr, std.Wg, std.Wb
+    y_scale = 219 / 255 * 256
+    c_scale = 224 / 255 * 256
+    # The middle coefficient of each row is derived from the others so that
+    # greys convert exactly (Y' rows sum to 220, chroma rows to 0)
+    Yr = round(Wr * y_scale)
+    Yb = round(Wb * y_scale)
+    Yg = round(y_scale) - Yr - Yb
+    Ur = round(-0.5 * Wr / (1 - Wb) * c_scale)
+    Ub = round(0.5 * c_scale)
+    Ug = -Ur - Ub
+    Vr = Ub
+    Vb = round(-0.5 * Wb / (1 - Wr) * c_scale)
+    Vg = -Vr - Vb
+    y_scale = 255 / 219 * 256
+    c_scale = 255 / 224 * 256
+    result = _studio[std] = (
+        (Yr, Yg, Yb, Ur, Ug, Ub, Vr, Vg, Vb),
+        (
+            round(y_scale),
+            round(2 * (1 - Wr) * c_scale),
+            round(2 * (1 - Wb) * Wb / Wg * c_scale),
+            round(2 * (1 - Wr) * Wr / Wg * c_scale),
+            round(2 * (1 - Wb) * c_scale),
+        ),
+    )
+    return result
 
 
 # The standard illuminants in the CIE XYZ space
 D50 = XYZ(0.966797, 1.0, 0.825188)
 D65 = XYZ(0.95047, 1.0, 1.08883)
-# TODO define some more of these and figure out some API to use them in Color
 # TODO what about standard observers? color temperature?
 
+# The standard illuminants (for the CIE 1931 2 degree observer) which may be
+# selected by name as white points
+ILLUMINANTS = {
+    'a':   XYZ(1.09850, 1.0, 0.35585),
+    'b':   XYZ(0.99072, 1.0, 0.85223),
+    'c':   XYZ(0.98074, 1.0, 1.18232),
+    'd50': D50,
+    'd55': XYZ(0.95682, 1.0, 0.92149),
+    'd65': D65,
+    'd75': XYZ(0.94972, 1.0, 1.22638),
+    'e':   XYZ(1.0, 1.0, 1.0),
+    'f2':  XYZ(0.99187, 1.0, 0.67395),
+    'f7':  XYZ(0.95044, 1.0, 1.08755),
+    'f11': XYZ(1.00966, 1.0, 0.64370),
+}
+
+
+def white_point(white):
+    """
+    Return the :class:`XYZ` white point for *white*, which may be the name of
+    one of the :data:`ILLUMINANTS` or any (X, Y, Z) tuple of positive values
+    """
+    if isinstance(white, str):
+        try:
+            return ILLUMINANTS[white.lower()]
+        except KeyError:
+            pass
+    else:
+        try:
+            white = XYZ(*white)
+            if all(v > 0 for v in white):
+                return white
+        except TypeError:
+            pass
+    raise ValueError('invalid white point: {!r}'.format(white))
+
+
+# The cone response matrices of the chromatic adaptation transforms
+ADAPTATIONS = {
+    'bradford': (
+        ( 0.8951000,  0.2664000, -0.1614000),
+        (-0.7502000,  1.7135000,  0.0367000),
+        ( 0.0389000, -0.0685000,  1.0296000)),
+    'von-kries': (
+        ( 0.4002400,  0.7076000, -0.0808100),
+        (-0.2263000,  1.1653200,  0.0457000),
+        ( 0.0000000,  0.0000000,  0.9182200)),
+    'xyz-scaling': (
+        (1.0, 0.0, 0.0),
+        (0.0, 1.0, 0.0),
+        (0.0, 0.0, 1.0)),
+}
+
+# The number of white points (or pairs of them) for which the adaptation
+# matrices, and the sRGB to XYZ matrices (and inverses), are cached
+_WHITE_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=_WHITE_CACHE_SIZE)
+def adaptation_matrix(source, target, method='bradford'):
+    """
+    Return the matrix which adapts CIE XYZ colors relative to the white point
+    *source* to the white point *target* with the chromatic adaptation
+    *method*, which must be one of the :data:`ADAPTATIONS`. The results are
+    cached, so this is cheap to call repeatedly
+    """
+    try:
+        cone = ADAPTATIONS[method]
+    except KeyError:
+        raise ValueError(
+            'invalid adaptation method: {!r}'.format(method)) from None
+    src = matrix.mult(cone, *source)
+    dest = matrix.mult(cone, *target)
+    scale = matrix.diagonal(*(d / s for s, d in zip(src, dest)))
+    return matrix.product(matrix.inverse(cone), scale, cone)
+
+
+def adapt(x, y, z, source, target, method='bradford'):
+    """
+    Convert the CIE XYZ color relative to the white point *source* to be
+    relative to the white point *target* (see :func:`adaptation_matrix`)
+    """
+    return XYZ._make(matrix.mult(
+        adaptation_matrix(source, target, method), x, y, z))
+
 
 # Conversion functions #######################################################
 
+# The matrix converting YIQ to linear RGB, with the coefficients of Python
+# 3.4+ (applied in the same order, so results match colorsys exactly)
+_YIQ_TO_RGB = (
+    (1.0,  0.9468822170900693,  0.6235565819861433),
+    (1.0, -0.27478764629897834, -0.6356910791873801),
+    (1.0, -1.1085450346420322,  1.7090069284064666))
+
+
 def rgb_to_yiq(r, g, b):
     "Convert a linear RGB color to YIQ"
-    # Coefficients from Python 3.4+
+    # Coefficients from Python 3.4+. I and Q are formed from the color
+    # differences, rather than premultiplied into a single matrix, as the
+    # latter differs from colorsys in the last bit
     y = 0.30 * r + 0.59 * g + 0.11 * b
     i = 0.74 * (r - y) - 0.27 * (b - y)
     q = 0.48 * (r - y) + 0.41 * (b - y)
@@ -130,12 +318,8 @@ def rgb_to_yiq(r, g, b):
 
 def yiq_to_rgb(y, i, q):
     "Convert a YIQ color to linear RGB"
-    # Coefficients from Python 3.4+
-    return RGB(
-        clamp_float(y + 0.9468822170900693  * i + 0.6235565819861433 * q),
-        clamp_float(y - 0.27478764629897834 * i - 0.6356910791873801 * q),
-        clamp_float(y - 1.1085450346420322  * i + 1.7090069284064666 * q),
-    )
+    r, g, b = matrix.mult(_YIQ_TO_RGB, y, i, q)
+    return RGB(clamp_float(r), clamp_float(g), clamp_float(b))
 
 
 def rgb_to_hls(r, g, b):
@@ -239,36 +423,45 @@ def rgb_to_yuv(r, g, b, std=BT601):
     return YUV(y, std.U * (b - y), std.V * (r - y))
 
 
-def yuv_to_rgb(y, u, v, std=BT601):
+def yuv_to_rgb(y, u, v, std=BT601, gamut='clip'):
     """
     Convert Y'CbCr to linear RGB using the specified coefficients (the default
-    coefficients are from BT.601)
+    coefficients are from BT.601). Colors outside the sRGB gamut are mapped
+    into it with the *gamut* method (see :func:`gamut_map`)
     """
-    return RGB(
-        clamp_float(y + std.Rv * v),
-        clamp_float(y - std.Gu * u - std.Gv * v),
-        clamp_float(y + std.Bu * u),
-    )
+    return gamut_map(
+        y + std.Rv * v,
+        y - std.Gu * u - std.Gv * v,
+        y + std.Bu * u,
+        gamut)
 
 
-def rgb_bytes_to_yuv_bytes(r, g, b):
-    "Convert RGB888 to YUV444 bytes using studio swing from BT.601"
+def rgb_bytes_to_yuv_bytes(r, g, b, std=BT601):
+    """
+    Convert RGB888 to YUV444 bytes using studio swing and the specified
+    coefficients (the default coefficients are from BT.601)
+    """
+    (Yr, Yg, Yb, Ur, Ug, Ub, Vr, Vg, Vb), _ = studio_coefficients(std)
     return YUV(
-        (( 66 * r + 129 * g +  25 * b + 128) >> 8) + 16,
-        ((-38 * r -  74 * g + 112 * b + 128) >> 8) + 128,
-        ((112 * r -  94 * g -  18 * b + 128) >> 8) + 128,
+        ((Yr * r + Yg * g + Yb * b + 128) >> 8) + 16,
+        ((Ur * r + Ug * g + Ub * b + 128) >> 8) + 128,
+        ((Vr * r + Vg * g + Vb * b + 128) >> 8) + 128,
     )
 
 
-def yuv_bytes_to_rgb_bytes(y, u, v):
-    "Convert YUV444 bytes to RGB888 using studio swing from BT.601"
-    c = y - 16
+def yuv_bytes_to_rgb_bytes(y, u, v, std=BT601):
+    """
+    Convert YUV444 bytes to RGB888 using studio swing and the specified
+    coefficients (the default coefficients are from BT.601)
+    """
+    _, (Y, Rv, Gu, Gv, Bu) = studio_coefficients(std)
+    c = Y * (y - 16)
     d = u - 128
     e = v - 128
     return RGB(
-        clamp_bytes((298 * c + 409 * e + 128) >> 8),
-        clamp_bytes((298 * c - 100 * d - 208 * e + 128) >> 8),
-        clamp_bytes((298 * c + 516 * d + 128) >> 8),
+        clamp_bytes((c + Rv * e + 128) >> 8),
+        clamp_bytes((c - Gu * d - Gv * e + 128) >> 8),
+        clamp_bytes((c + Bu * d + 128) >> 8),
     )
 
 
@@ -298,31 +491,59 @@ def cmyk_to_cmy(c, m, y, k):
     return CMY(c * n + k, m * n + k, y * n + k)
 
 
-def rgb_to_xyz(r, g, b):
+# The matrices converting linear sRGB to CIE XYZ (with reference white D65)
+# and back
+_SRGB_TO_XYZ = (
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041))
+_XYZ_TO_SRGB = (
+    ( 3.2404542, -1.5371385, -0.4985314),
+    (-0.9692660,  1.8760108,  0.0415560),
+    ( 0.0556434, -0.2040259,  1.0572252))
+
+
+@lru_cache(maxsize=_WHITE_CACHE_SIZE)
+def rgb_xyz_matrix(white=D65):
+    """
+    Return the matrix converting linear sRGB to CIE XYZ relative to the
+    reference *white*, adapted from D65 by the Bradford transform. The results
+    are cached, so this is cheap to call repeatedly
+    """
+    if white == D65:
+        return _SRGB_TO_XYZ
+    return matrix.product(adaptation_matrix(D65, white), _SRGB_TO_XYZ)
+
+
+@lru_cache(maxsize=_WHITE_CACHE_SIZE)
+def xyz_rgb_matrix(white=D65):
+    """
+    Return the matrix converting CIE XYZ relative to the reference *white* to
+    linear sRGB; the inverse of :func:`rgb_xyz_matrix`
+    """
+    if white == D65:
+        return _XYZ_TO_SRGB
+    return matrix.product(_XYZ_TO_SRGB, adaptation_matrix(white, D65))
+
+
+def rgb_to_xyz(r, g, b, white=D65):
     """
     Convert linear RGB to CIE XYZ representation. RGB is assumed to be sRGB and
-    conversion uses D65 as reference white.
+    conversion uses D65 as reference white, unless another reference *white*
+    is specified in which case the result is adapted to it
     """
-    return XYZ(*matrix_mult(
-        ((0.4124564, 0.3575761, 0.1804375),
-         (0.2126729, 0.7151522, 0.0721750),
-         (0.0193339, 0.1191920, 0.9503041)),
-        (from_srgb(r), from_srgb(g), from_srgb(b))
-    ))
+    return XYZ._make(matrix.mult(
+        rgb_xyz_matrix(white), from_srgb(r), from_srgb(g), from_srgb(b)))
 
 
-def xyz_to_rgb(x, y, z):
+def xyz_to_rgb(x, y, z, white=D65):
     """
     Convert CIE XYZ representation to linear RGB. sRGB is used as the output
-    color space, and D65 as reference white.
+    color space, and D65 as reference white, unless another reference *white*
+    is specified for the input
     """
-    m = matrix_mult(
-        (( 3.2404542, -1.5371385, -0.4985314),
-         (-0.9692660,  1.8760108,  0.0415560),
-         ( 0.0556434, -0.2040259,  1.0572252)),
-        (x, y, z)
-    )
-    return RGB(*(to_srgb(c) for c in m))
+    r, g, b = matrix.mult(xyz_rgb_matrix(white), x, y, z)
+    return RGB(to_srgb(r), to_srgb(g), to_srgb(b))
 
 
 def luv_to_xyz(l, u, v, white=D65):
@@ -381,3 +602,221 @@ def xyz_to_lab(x, y, z, white=D65):
         for t in (x, y, z)
     )
     return Lab(116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def lab_to_lch(l, a, b):
+    "Convert CIE L*a*b* to CIE L*C*h representation, with the hue in degrees"
+    return LCh(l, hypot(a, b), degrees(atan2(b, a)) % 360)
+
+
+def lch_to_lab(l, c, h):
+    "Convert CIE L*C*h, with the hue in degrees, to CIE L*a*b* representation"
+    h = radians(h)
+    return Lab(l, c * cos(h), c * sin(h))
+
+
+# Constants of the CIE L*a*b* and L*u*v* transfer functions: theta cubed,
+# 3 * theta squared, and 4 / 29, where theta is 6 / 29, and (3 / 29) cubed
+_LAB_E = 216 / 24389
+_LAB_T2 = 108 / 841
+_LAB_C = 4 / 29
+_LUV_K = 24389 / 27
+_LUV_E = 27 / 24389
+
+
+def rgb_to_lab(r, g, b, white=D65):
+    """
+    Convert linear RGB to CIE L*a*b* representation; equivalent to
+    :func:`xyz_to_lab` of :func:`rgb_to_xyz`, with all the arithmetic in one
+    pass
+    """
+    wx, wy, wz = white
+    x, y, z = matrix.mult(
+        rgb_xyz_matrix(white),
+        r / 12.92 if r <= 0.04045 else ((r + 0.055) / 1.055) ** 2.4,
+        g / 12.92 if g <= 0.04045 else ((g + 0.055) / 1.055) ** 2.4,
+        b / 12.92 if b <= 0.04045 else ((b + 0.055) / 1.055) ** 2.4)
+    x /= wx
+    y /= wy
+    z /= wz
+    x = x ** (1 / 3) if x > _LAB_E else x / _LAB_T2 + _LAB_C
+    y = y ** (1 / 3) if y > _LAB_E else y / _LAB_T2 + _LAB_C
+    z = z ** (1 / 3) if z > _LAB_E else z / _LAB_T2 + _LAB_C
+    return Lab(116 * y - 16, 500 * (x - y), 200 * (y - z))
+
+
+def lab_to_rgb(l, a, b, white=D65):
+    """
+    Convert CIE L*a*b* to linear RGB representation; equivalent to
+    :func:`xyz_to_rgb` of :func:`lab_to_xyz`, with all the arithmetic in one
+    pass
+    """
+    wx, wy, wz = white
+    y = (l + 16) / 116
+    x = y + a / 500
+    z = y - b / 200
+    x = wx * (x ** 3 if x > 6 / 29 else _LAB_T2 * (x - _LAB_C))
+    y = wy * (y ** 3 if y > 6 / 29 else _LAB_T2 * (y - _LAB_C))
+    z = wz * (z ** 3 if z > 6 / 29 else _LAB_T2 * (z - _LAB_C))
+    r, g, b = matrix.mult(xyz_rgb_matrix(white), x, y, z)
+    return RGB(
+        12.92 * r if r <= 0.0031308 else 1.055 * r ** (1 / 2.4) - 0.055,
+        12.92 * g if g <= 0.0031308 else 1.055 * g ** (1 / 2.4) - 0.055,
+        12.92 * b if b <= 0.0031308 else 1.055 * b ** (1 / 2.4) - 0.055)
+
+
+def rgb_to_luv(r, g, b, white=D65):
+    """
+    Convert linear RGB to CIE L*u*v* representation; equivalent to
+    :func:`xyz_to_luv` of :func:`rgb_to_xyz`, with all the arithmetic in one
+    pass
+    """
+    wx, wy, wz = white
+    x, y, z = matrix.mult(
+        rgb_xyz_matrix(white),
+        r / 12.92 if r <= 0.04045 else ((r + 0.055) / 1.055) ** 2.4,
+        g / 12.92 if g <= 0.04045 else ((g + 0.055) / 1.055) ** 2.4,
+        b / 12.92 if b <= 0.04045 else ((b + 0.055) / 1.055) ** 2.4)
+    d = x + 15 * y + 3 * z
+    dw = wx + 15 * wy + 3 * wz
+    l = y / wy
+    l = 116 * l ** (1 / 3) - 16 if l > _LAB_E else _LUV_K * l
+    if d == 0:
+        u = v = 0
+    else:
+        u, v = 4 * x / d, 9 * y / d
+    return Luv(l, 13 * l * (u - 4 * wx / dw), 13 * l * (v - 9 * wy / dw))
+
+
+def luv_to_rgb(l, u, v, white=D65):
+    """
+    Convert CIE L*u*v* to linear RGB representation; equivalent to
+    :func:`xyz_to_rgb` of :func:`luv_to_xyz`, with all the arithmetic in one
+    pass
+    """
+    if l == 0:
+        return RGB(0.0, 0.0, 0.0)
+    wx, wy, wz = white
+    dw = wx + 15 * wy + 3 * wz
+    u = u / (13 * l) + 4 * wx / dw
+    v = v / (13 * l) + 9 * wy / dw
+    y = wy * (l * _LUV_E if l <= 8 else ((l + 16) / 116) ** 3)
+    x = y * (9 * u) / (4 * v)
+    z = y * (12 - 3 * u - 20 * v) / (4 * v)
+    r, g, b = matrix.mult(xyz_rgb_matrix(white), x, y, z)
+    return RGB(
+        12.92 * r if r <= 0.0031308 else 1.055 * r ** (1 / 2.4) - 0.055,
+        12.92 * g if g <= 0.0031308 else 1.055 * g ** (1 / 2.4) - 0.055,
+        12.92 * b if b <= 0.0031308 else 1.055 * b ** (1 / 2.4) - 0.055)
+
+
+# The matrices converting linear sRGB to the LMS cone responses of OKLab, and
+# the (cube-rooted) responses to OKLab, with their inverses. The values are
+# those of Björn Ottosson's reference implementation
+_SRGB_TO_LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005))
+_LMS_TO_OKLAB = (
+    (0.2104542553,  0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050,  0.4505937099),
+    (0.0259040371,  0.7827717662, -0.8086757660))
+_OKLAB_TO_LMS = (
+    (1.0,  0.3963377774,  0.2158037573),
+    (1.0, -0.1055613458, -0.0638541728),
+    (1.0, -0.0894841775, -1.2914855480))
+_LMS_TO_SRGB = (
+    ( 4.0767416621, -3.3077115913,  0.2309699292),
+    (-1.2684380046,  2.6097574011, -0.3413193965),
+    (-0.0041960863, -0.7034186147,  1.7076147010))
+
+
+def rgb_to_oklab(r, g, b):
+    """
+    Convert linear RGB to OKLab representation. RGB is assumed to be sRGB (and
+    OKLab is defined relative to D65)
+    """
+    l, m, s = matrix.mult(
+        _SRGB_TO_LMS, from_srgb(r), from_srgb(g), from_srgb(b))
+    return OkLab._make(
+        matrix.mult(_LMS_TO_OKLAB, cbrt(l), cbrt(m), cbrt(s)))
+
+
+def oklab_to_rgb(l, a, b):
+    """
+    Convert OKLab to linear RGB representation. sRGB is used as the output
+    color space
+    """
+    l, m, s = matrix.mult(_OKLAB_TO_LMS, l, a, b)
+    r, g, b = matrix.mult(_LMS_TO_SRGB, l ** 3, m ** 3, s ** 3)
+    return RGB(to_srgb(r), to_srgb(g), to_srgb(b))
+
+
+def oklab_to_oklch(l, a, b):
+    "Convert OKLab to OKLCh representation, with the hue in degrees"
+    return OkLCh(l, hypot(a, b), degrees(atan2(b, a)) % 360)
+
+
+def oklch_to_oklab(l, c, h):
+    "Convert OKLCh, with the hue in degrees, to OKLab representation"
+    h = radians(h)
+    return OkLab(l, c * cos(h), c * sin(h))
+
+
+# Gamut mapping ##############################################################
+
+# Components within this distance of the range 0.0 to 1.0 are considered in
+# gamut, absorbing the rounding of the conversions (and of the published
+# matrices, which are not quite inverses of one another)
+_GAMUT_EPS = 1e-5
+# The number of bisections made by gamut_map; the chroma of the result falls
+# short of the greatest the gamut permits by at most 2 ** -16 of the original
+# chroma
+_GAMUT_STEPS = 16
+
+
+def _in_gamut(r, g, b):
+    return (
+        -_GAMUT_EPS <= r <= 1 + _GAMUT_EPS and
+        -_GAMUT_EPS <= g <= 1 + _GAMUT_EPS and
+        -_GAMUT_EPS <= b <= 1 + _GAMUT_EPS)
+
+
+# The functions converting linear RGB to the space in which each gamut mapping
+# method reduces chroma and back, and the lightness of white in that space
+_GAMUT_SPACES = {
+    'lch':   (rgb_to_lab, lab_to_rgb, 100.0),
+    'oklch': (rgb_to_oklab, oklab_to_rgb, 1.0),
+}
+
+
+def gamut_map(r, g, b, method='clip'):
+    """
+    Map the linear RGB color *r*, *g*, *b*, whose components may lie outside
+    the range 0.0 to 1.0 (the sRGB gamut), into the gamut with *method*. The
+    "clip" method clamps each component, which can shift the hue of the
+    color. The "lch" and "oklch" methods instead preserve the lightness and
+    hue of the color, reducing its chroma (in CIE LCh or OKLCh respectively)
+    to the greatest the gamut permits, which is found by bisection
+    """
+    if method == 'clip':
+        return RGB(clamp_float(r), clamp_float(g), clamp_float(b))
+    try:
+        to_lab, from_lab, white = _GAMUT_SPACES[method]
+    except (KeyError, TypeError):
+        raise ValueError(
+            'invalid gamut method: {!r}'.format(method)) from None
+    if not _in_gamut(r, g, b):
+        l, a, b = to_lab(r, g, b)
+        l = max(0.0, min(white, l))
+        # The neutral color (scale 0) of the lightness is in gamut; scaling a
+        # and b together reduces the chroma without changing the hue
+        lo, hi = 0.0, 1.0
+        for _ in range(_GAMUT_STEPS):
+            mid = (lo + hi) / 2
+            if _in_gamut(*from_lab(l, a * mid, b * mid)):
+                lo = mid
+            else:
+                hi = mid
+        r, g, b = from_lab(l, a * lo, b * lo)
+    return RGB(clamp_float(r), clamp_float(g), clamp_float(b))
@@ -10,6 +10,9 @@
 
 from math import sqrt, atan2, degrees, radians, sin, cos, exp
 
+from .types import LCh
+from .conversions import lab_to_lch, lch_to_lab
+
 # Lots of the delta-e functions use single character parameter names and
 # variables internally; this is is normal and in keeping with most of the
 # referenced sources
@@ -44,6 +47,13 @@ def cie1976(color1, color2):
     return sqrt(sum((e1 - e2) ** 2 for e1, e2 in zip(color1, color2)))
 
 
+# The (kL, K1, K2) weights of the variants of CIE 1994
+_CIE1994 = {
+    'cie1994g': (1, 0.045, 0.015),
+    'cie1994t': (2, 0.048, 0.014),
+}
+
+
 def cie1994(color1, color2, method):
     """
     Calculates color difference according to the `CIE 1994`_ formula. The
@@ -51,23 +61,41 @@ def cie1994(color1, color2, method):
     for the "textile" biases. The CIE1994 is also basically the Euclidean
     formula (with biases) but in CIE L*C*H* space.
 
+    Either color may be given as CIE L*C*h (an :class:`~colorzero.LCh`)
+    instead of CIE L*a*b*, in which case its chroma and hue are not
+    re-calculated. When one color is compared against many, converting it
+    (or all of them) with :attr:`Color.lch <colorzero.Color.lch>` first saves
+    this work on every comparison.
+
     .. _CIE 1994: https://en.wikipedia.org/wiki/Color_difference#CIE94
+
+    .. versionchanged:: 2.1
+        Accept colors as CIE L*C*h.
     """
-    C1 = sqrt(color1.a ** 2 + color1.b ** 2)
-    C2 = sqrt(color2.a ** 2 + color2.b ** 2)
+    if isinstance(color1, LCh) or isinstance(color2, LCh):
+        if not isinstance(color1, LCh):
+            color1 = lab_to_lch(*color1)
+        if not isinstance(color2, LCh):
+            color2 = lab_to_lch(*color2)
+        C1 = color1.c
+        C2 = color2.c
+        dC = C1 - C2
+        # The squared hue difference follows from the law of cosines
+        dH2 = 2 * C1 * C2 * (1 - cos(radians(color1.h - color2.h)))
+    else:
+        C1 = sqrt(color1.a ** 2 + color1.b ** 2)
+        C2 = sqrt(color2.a ** 2 + color2.b ** 2)
+        dC = C1 - C2
+        # Don't bother with the sqrt here as due to limited float precision
+        # we can wind up with a domain error (because the value is ever so
+        # slightly negative - try it with black'n'white for an example), and
+        # we're just going to square the result in the final equation anyway
+        dH2 = (
+            (color1.a - color2.a) ** 2 + (color1.b - color2.b) ** 2 - dC ** 2)
 
     dL = color1.l - color2.l
-    dC = C1 - C2
-    # Don't bother with the sqrt here as due to limited float precision
-    # we can wind up with a domain error (because the value is ever so
-    # slightly negative - try it with black'n'white for an example), and we're
-    # just going to square the result in the final equation anyway
-    dH2 = (color1.a - color2.a) ** 2 + (color1.b - color2.b) ** 2 - dC ** 2
-
-    kL, K1, K2 = {
-        'cie1994g': (1, 0.045, 0.015),
-        'cie1994t': (2, 0.048, 0.014),
-    }[method]
+
+    kL, K1, K2 = _CIE1994[method]
     SC = 1 + K1 * C1
     SH = 1 + K2 * C1
     return sqrt(
@@ -97,6 +125,17 @@ def cie1994t(color1, color2):
     return cie1994(color1, color2, 'cie1994t')
 
 
+def _lab_chroma(color):
+    # Return the L*, a*, b*, and chroma of *color*, which may be CIE L*a*b* or
+    # CIE L*C*h
+    if isinstance(color, LCh):
+        l, c, h = color
+        h = radians(h)
+        return l, c * cos(h), c * sin(h), c
+    l, a, b = color
+    return l, a, b, sqrt(a ** 2 + b ** 2)
+
+
 def ciede2000(color1, color2):
     """
     Calculates color difference according to the `CIEDE 2000`_ formula. This is
@@ -104,36 +143,47 @@ def ciede2000(color1, color2):
     and slowest. Like CIE1994 it is largely based in CIE L*C*h* space, but with
     several modifications to account for perceptual uniformity flaws.
 
+    As with :func:`cie1994`, either color may be given as CIE L*C*h (an
+    :class:`~colorzero.LCh`) instead of CIE L*a*b*. Only the chroma of such
+    colors is re-used, as the hue used by the formula depends upon the mean
+    chroma of the pair.
+
     .. _CIEDE 2000: https://en.wikipedia.org/wiki/Color_difference#CIEDE2000
+
+    .. versionchanged:: 2.1
+        Accept colors as CIE L*C*h.
     """
+    return _ciede2000(*_lab_chroma(color1), *_lab_chroma(color2))
+
+
+def _ciede2000(L1, a1, b1, C1, L2, a2, b2, C2):
+    # The CIEDE 2000 formula, given the L*, a*, b*, and chroma of both colors.
+    #
     # See WP article and Sharma 2005 for important implementation notes:
     # http://www.ece.rochester.edu/~gsharma/ciede2000/ciede2000noteCRNA.pdf
     #
     # Yes, there's lots of locals; but this is easiest to understand as it's a
     # near straight translation of the math
-    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-locals,too-many-arguments
 
-    C_ = (
-        sqrt(color1.a ** 2 + color1.b ** 2) +
-        sqrt(color2.a ** 2 + color2.b ** 2)
-    ) / 2
+    C_ = (C1 + C2) / 2
 
     G = (1 - sqrt(C_ ** 7 / (C_ ** 7 + 25 ** 7))) / 2
-    a1_prime = (1 + G) * color1.a
-    a2_prime = (1 + G) * color2.a
+    a1_prime = (1 + G) * a1
+    a2_prime = (1 + G) * a2
 
-    C1_prime = sqrt(a1_prime ** 2 + color1.b ** 2)
-    C2_prime = sqrt(a2_prime ** 2 + color2.b ** 2)
-    L_ = (color1.l + color2.l) / 2
+    C1_prime = sqrt(a1_prime ** 2 + b1 ** 2)
+    C2_prime = sqrt(a2_prime ** 2 + b2 ** 2)
+    L_ = (L1 + L2) / 2
     C_ = (C1_prime + C2_prime) / 2
 
     h1 = (
-        0.0 if color1.b == a1_prime == 0 else
-        degrees(atan2(color1.b, a1_prime)) % 360
+        0.0 if b1 == a1_prime == 0 else
+        degrees(atan2(b1, a1_prime)) % 360
     )
     h2 = (
-        0.0 if color2.b == a2_prime == 0 else
-        degrees(atan2(color2.b, a2_prime)) % 360
+        0.0 if b2 == a2_prime == 0 else
+        degrees(atan2(b2, a2_prime)) % 360
     )
     if C1_prime * C2_prime == 0.0:
         dh = 0.0
@@ -151,7 +201,7 @@ def ciede2000(color1, color2):
         else:
             h_ = (h1 + h2 + 360) / 2
 
-    dL = color2.l - color1.l
+    dL = L2 - L1
     dC = C2_prime - C1_prime
     dH = 2 * sqrt(C1_prime * C2_prime) * sin(radians(dh / 2))
 
@@ -176,3 +226,282 @@ def ciede2000(color1, color2):
         (dH / SH) ** 2 +
         RT * (dC / SC) * (dH / SH)
     )
+
+
+def oklab(color1, color2):
+    """
+    Calculates color difference as the Euclidean distance between two colors
+    in the `OKLab`_ color space. Like :func:`cie1976` this is a simple
+    distance, but OKLab is more perceptually uniform than CIE Lab, so the
+    result is a reasonable approximation of :func:`ciede2000` at a fraction
+    of the cost.
+
+    .. note::
+
+        The lightness of OKLab colors is between 0.0 and 1.0, rather than 0
+        and 100, so the results of this function are roughly one hundredth of
+        those of the CIE functions; a just-noticeable difference is around
+        0.02.
+
+    .. _OKLab: https://bottosson.github.io/posts/oklab/
+
+    .. versionadded:: 2.1
+    """
+    return sqrt(
+        (color1[0] - color2[0]) ** 2 +
+        (color1[1] - color2[1]) ** 2 +
+        (color1[2] - color2[2]) ** 2)
+
+
+def comparator(color, method='ciede2000'):
+    """
+    Returns a function which accepts a single color, and calculates its
+    difference from *color* according to *method*, which is the name of one of
+    the functions in this module. For example::
+
+        >>> from colorzero import Color, deltae
+        >>> compare = deltae.comparator(Color('red').lab, 'ciede2000')
+        >>> compare(Color('#900').lab)
+        21.078146289272155
+
+    The colors must be in the system the *method* expects (CIE L*a*b*, or CIE
+    L*C*h, for the CIE methods, OKLab for :func:`oklab`, and RGB for
+    :func:`euclid`). The terms of the formula which depend on *color* alone
+    (like its chroma, and the weights of CIE 1994) are calculated once, when
+    the function is constructed, rather than on every call, which is useful
+    when comparing one color against many.
+
+    .. versionadded:: 2.1
+    """
+    try:
+        factory = _comparators[method]
+    except (KeyError, TypeError):
+        raise ValueError('invalid method: {}'.format(method)) from None
+    return factory(color)
+
+
+def _distance_comparator(color):
+    x1, y1, z1 = color
+
+    def compare(color2):
+        x2, y2, z2 = color2
+        return sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2 + (z1 - z2) ** 2)
+    return compare
+
+
+def _cie1994_comparator(method):
+    kL, K1, K2 = _CIE1994[method]
+
+    def factory(color):
+        L1, a1, b1, C1 = _lab_chroma(color)
+        SC = 1 + K1 * C1
+        SH2 = (1 + K2 * C1) ** 2
+
+        def compare(color2):
+            L2, a2, b2, C2 = _lab_chroma(color2)
+            dC = C1 - C2
+            dH2 = (a1 - a2) ** 2 + (b1 - b2) ** 2 - dC ** 2
+            return sqrt(
+                ((L1 - L2) / kL) ** 2 +
+                (dC / SC) ** 2 +
+                (dH2 / SH2)
+            )
+        return compare
+    return factory
+
+
+def _ciede2000_comparator(color):
+    L1, a1, b1, C1 = _lab_chroma(color)
+
+    def compare(color2):
+        return _ciede2000(L1, a1, b1, C1, *_lab_chroma(color2))
+    return compare
+
+
+_comparators = {
+    'euclid': _distance_comparator,
+    'cie1976': _distance_comparator,
+    'cie1994g': _cie1994_comparator('cie1994g'),
+    'cie1994t': _cie1994_comparator('cie1994t'),
+    'ciede2000': _ciede2000_comparator,
+    'oklab': _distance_comparator,
+}
+
+
+def within(color1, color2, threshold, method='ciede2000'):
+    """
+    Returns :data:`True` if the difference between *color1* and *color2*
+    according to *method* (the name of one of the functions in this module)
+    is no greater than *threshold*. The colors must be in the system the
+    *method* expects, as with :func:`comparator`. For example, to test
+    whether two colors are within a `just-noticeable difference`_::
+
+        >>> from colorzero import Color, deltae
+        >>> deltae.within(Color('red').lab, Color('#fe0101').lab, 2.3)
+        True
+        >>> deltae.within(Color('red').lab, Color('#900').lab, 2.3)
+        False
+
+    The result is the same as comparing the result of the *method* with
+    *threshold*, but cheap bounds on the difference (like the difference in
+    lightness, or the Euclidean distance in a* and b*) are tested first, and
+    the full formula is only evaluated for pairs which those bounds cannot
+    decide. With :func:`ciede2000`, this makes testing pairs which are
+    clearly alike, or clearly different, several times quicker.
+
+    .. _just-noticeable difference: https://en.wikipedia.org/wiki/Just-noticeable_difference
+
+    .. versionadded:: 2.1
+    """
+    return _within_test(color1, threshold, method)(color2)
+
+
+def within_many(color, colors, threshold, method='ciede2000'):
+    """
+    Returns a list of :class:`bool` indicating whether each of *colors* is
+    within *threshold* of *color*, as :func:`within` would. The terms of the
+    bounds (and formula) which depend upon *color* alone are calculated once.
+    *colors* may be a sequence of colors, or an array from
+    :mod:`colorzero.arrays` (like the result of :attr:`ColorArray.lab
+    <colorzero.arrays.ColorArray.lab>`) in which case its columns are read
+    directly.
+
+    .. versionadded:: 2.1
+    """
+    test = _within_test(color, threshold, method)
+    return [test(color2) for color2 in _rows(colors)]
+
+
+def within_pairs(colors1, colors2, threshold, method='ciede2000'):
+    """
+    Returns a list of :class:`bool` indicating whether each color of
+    *colors1* is within *threshold* of the corresponding color of *colors2*,
+    as :func:`within` would. Both may be sequences of colors, or arrays from
+    :mod:`colorzero.arrays` (see :func:`within_many`).
+
+    .. versionadded:: 2.1
+    """
+    try:
+        factory = _within_tests[method]
+    except (KeyError, TypeError):
+        raise ValueError('invalid method: {}'.format(method)) from None
+    return [
+        factory(color1, threshold)(color2)
+        for color1, color2 in zip(_rows(colors1), _rows(colors2))
+    ]
+
+
+def _rows(colors):
+    # Iterate over the colors of an array as plain tuples, which is quicker
+    # than constructing the array's named tuples; other sequences are
+    # returned as is
+    try:
+        columns = colors.columns
+    except AttributeError:
+        return colors
+    return zip(*columns)
+
+
+def _within_test(color, threshold, method):
+    try:
+        factory = _within_tests[method]
+    except (KeyError, TypeError):
+        raise ValueError('invalid method: {}'.format(method)) from None
+    return factory(color, threshold)
+
+
+def _distance_within(color, threshold):
+    x1, y1, z1 = color
+    t2 = threshold ** 2
+
+    def test(color2):
+        x2, y2, z2 = color2
+        dx = x1 - x2
+        if dx > threshold or -dx > threshold:
+            return False
+        return dx ** 2 + (y1 - y2) ** 2 + (z1 - z2) ** 2 <= t2
+    return test
+
+
+def _cie1994_within(method):
+    kL, K1, K2 = _CIE1994[method]
+
+    def factory(color, threshold):
+        if isinstance(color, LCh):
+            color = lch_to_lab(*color)
+        L1, a1, b1 = color
+        C1 = sqrt(a1 ** 2 + b1 ** 2)
+        SC = 1 + K1 * C1
+        SH2 = (1 + K2 * C1) ** 2
+        t2 = threshold ** 2
+
+        def test(color2):
+            if isinstance(color2, LCh):
+                color2 = lch_to_lab(*color2)
+            L2, a2, b2 = color2
+            dL2 = ((L1 - L2) / kL) ** 2
+            if dL2 > t2:
+                return False
+            # SC and SH are both at least 1, and the squares of the chroma
+            # and hue differences sum to that of the a* and b* differences,
+            # which bounds the result from above
+            dab2 = (a1 - a2) ** 2 + (b1 - b2) ** 2
+            if dL2 + dab2 <= t2:
+                return True
+            dC = C1 - sqrt(a2 ** 2 + b2 ** 2)
+            return dL2 + (dC / SC) ** 2 + (dab2 - dC ** 2) / SH2 <= t2
+        return test
+    return factory
+
+
+# The largest magnitude of the CIEDE 2000 rotation term, RT; the cross term
+# RT * x * y of the formula is bounded by _RT_MAX / 2 * (x ** 2 + y ** 2)
+_RT_MAX = sqrt(3)
+
+
+def _ciede2000_within(color, threshold):
+    # pylint: disable=too-many-locals
+    if isinstance(color, LCh):
+        color = lch_to_lab(*color)
+    L1, a1, b1 = color
+    C1 = sqrt(a1 ** 2 + b1 ** 2)
+    t2 = threshold ** 2
+    upper = 1 + _RT_MAX / 2
+    lower = 1 - _RT_MAX / 2
+
+    def test(color2):
+        if isinstance(color2, LCh):
+            color2 = lch_to_lab(*color2)
+        L2, a2, b2 = color2
+        # SL is at most 1 + 0.015 * |mean L* - 50|, so the lightness term
+        # alone can rule out the pair
+        dL = L1 - L2
+        L_ = (L1 + L2) / 2 - 50
+        if dL * dL > t2 * (1 + 0.015 * abs(L_)) ** 2:
+            return False
+        # SL, SC and SH are all at least 1, a' is at most 1.5 * a*, and the
+        # squares of the (primed) chroma and hue differences sum to those of
+        # a' and b*, which bounds the result from above...
+        da2 = (a1 - a2) ** 2
+        db2 = (b1 - b2) ** 2
+        if dL * dL + upper * (2.25 * da2 + db2) <= t2:
+            return True
+        # ...and, as SH is at most SC, which grows with the mean chroma, from
+        # below
+        C2 = sqrt(a2 ** 2 + b2 ** 2)
+        SL = 1 + 0.015 * L_ ** 2 / sqrt(20 + L_ ** 2)
+        SC = 1 + 0.045 * 1.5 * (C1 + C2) / 2
+        if (dL / SL) ** 2 + lower * (da2 + db2) / SC ** 2 > t2:
+            return False
+        return _ciede2000(L1, a1, b1, C1, L2, a2, b2, C2) <= threshold
+    return test
+
+
+_within_tests = {
+    'euclid': _distance_within,
+    'cie1976': _distance_within,
+    'cie1994g': _cie1994_within('cie1994g'),
+    'cie1994t': _cie1994_within('cie1994t'),
+    'ciede2000': _ciede2000_within,
+    'oklab': _distance_within,
+}
@@ -0,0 +1,290 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines routines for converting whole video frames between packed RGB888 and
+the common Y'CbCr formats with chroma sub-sampling (I420, NV12, and YUYV).
+"""
+
+from . import conversions as cv
+
+
+# Clamping of the integer studio swing conversion used by
+# colorzero.conversions.yuv_bytes_to_rgb_bytes is an index into _CLIP (offset
+# by _CLIP_OFFSET as the unclamped results range roughly from -300 to 560)
+_CLIP_OFFSET = 512
+_CLIP = bytes(min(255, max(0, i - _CLIP_OFFSET)) for i in range(1536))
+
+
+def _frame(buf, size, name):
+    # Return *buf* as a flat memoryview of bytes, checking it has *size* bytes
+    buf = memoryview(buf).cast('B')
+    if len(buf) != size:
+        raise ValueError(
+            '{name} must be {size} bytes long for the frame size, not '
+            '{length}'.format(name=name, size=size, length=len(buf)))
+    return buf
+
+
+def _check_size(width, height, subsample_rows):
+    # Chroma samples cover pairs of pixels horizontally (and, for 4:2:0
+    # formats, vertically) so the dimensions must be even
+    if width < 2 or width % 2:
+        raise ValueError('width must be a positive even number')
+    if height < 1 or (subsample_rows and height % 2):
+        raise ValueError('height must be a positive{} number'.format(
+            ' even' if subsample_rows else ''))
+
+
+def _output(out, size):
+    if out is None:
+        out = bytearray(size)
+    return out, _frame(out, size, 'out')
+
+
+def _coefficients(standard):
+    # Return the forward and inverse studio swing coefficients of *standard*,
+    # with the inverse luma coefficient expanded into a table of Y' terms
+    forward, (Y, Rv, Gu, Gv, Bu) = cv.studio_coefficients(
+        cv.yuv_standard(standard))
+    return forward, ([Y * (y - 16) for y in range(256)], Rv, Gu, Gv, Bu)
+
+
+def _luma_row(coeffs, row):
+    # Return the Y' samples of the packed RGB888 *row*
+    Yr, Yg, Yb = coeffs[:3]
+    return bytes(
+        ((Yr * r + Yg * g + Yb * b + 128) >> 8) + 16
+        for r, g, b in zip(row[0::3], row[1::3], row[2::3]))
+
+
+def _chroma_row(coeffs, *rows):
+    # Return the Cb and Cr samples of horizontally adjacent pairs of pixels in
+    # the packed RGB888 *rows* (one row for 4:2:2, two for 4:2:0). The RGB
+    # values of each block of pixels are summed, so the shift which divides
+    # by the number of pixels is folded into that of the conversion
+    Ur, Ug, Ub, Vr, Vg, Vb = coeffs[3:]
+    shift = 8 + len(rows)
+    bias = 1 << (shift - 1)
+    rs = [sum(t) for t in zip(*(
+        row[i::6] for row in rows for i in (0, 3)))]
+    gs = [sum(t) for t in zip(*(
+        row[i::6] for row in rows for i in (1, 4)))]
+    bs = [sum(t) for t in zip(*(
+        row[i::6] for row in rows for i in (2, 5)))]
+    return (
+        bytes(
+            ((Ur * r + Ug * g + Ub * b + bias) >> shift) + 128
+            for r, g, b in zip(rs, gs, bs)),
+        bytes(
+            ((Vr * r + Vg * g + Vb * b + bias) >> shift) + 128
+            for r, g, b in zip(rs, gs, bs)),
+    )
+
+
+def _rgb_row(coeffs, ys, us, vs):
+    # Return the packed RGB888 row for the Y' samples *ys*, and the Cb and Cr
+    # samples *us* and *vs* which each cover a pair of Y' samples
+    luma, Rv, Gu, Gv, Bu = coeffs
+    clip = _CLIP
+    offset = _CLIP_OFFSET
+    rv = [Rv * (v - 128) + 128 for v in vs]
+    guv = [-Gu * (u - 128) - Gv * (v - 128) + 128 for u, v in zip(us, vs)]
+    bu = [Bu * (u - 128) + 128 for u in us]
+    row = bytearray(len(ys) * 3)
+    for i, y_s in enumerate((ys[0::2], ys[1::2])):
+        c = [luma[y] for y in y_s]
+        row[i * 3 + 0::6] = bytes(
+            clip[((c_ + t) >> 8) + offset] for c_, t in zip(c, rv))
+        row[i * 3 + 1::6] = bytes(
+            clip[((c_ + t) >> 8) + offset] for c_, t in zip(c, guv))
+        row[i * 3 + 2::6] = bytes(
+            clip[((c_ + t) >> 8) + offset] for c_, t in zip(c, bu))
+    return row
+
+
+def frame_size(fmt, width, height):
+    """
+    Returns the size in bytes of a *width* by *height* frame in the format
+    *fmt*, which must be one of "rgb", "i420", "nv12", or "yuyv".
+
+    .. versionadded:: 2.1
+    """
+    try:
+        return {
+            'rgb':  width * height * 3,
+            'i420': width * height * 3 // 2,
+            'nv12': width * height * 3 // 2,
+            'yuyv': width * height * 2,
+        }[fmt]
+    except KeyError:
+        raise ValueError('invalid frame format: {!r}'.format(fmt)) from None
+
+
+def rgb_to_i420(rgb, width, height, out=None, standard='bt601'):
+    """
+    Convert the packed RGB888 frame *rgb* (a :class:`bytes`-like object of
+    *width* × *height* × 3 bytes) to I420, the planar 4:2:0 format (also
+    known as YUV420p) consisting of a full resolution Y' plane followed by
+    quarter resolution Cb (U) and Cr (V) planes.
+
+    The result is written to *out* if specified, which must be a writable
+    buffer of :func:`frame_size` bytes (the buffer of a video encoder, for
+    example). Otherwise a new :class:`bytearray` is returned. Either way, the
+    frame is converted two rows at a time so, beyond *out*, memory usage is
+    proportional to the width of the frame rather than its area. Input and
+    output may equally be memory-mapped files.
+
+    The conversion uses the integer studio swing arithmetic of
+    :meth:`Color.to_yuv_bytes <colorzero.Color.to_yuv_bytes>`, with the
+    coefficients of *standard* ("bt601", the default, "bt709", or
+    "smpte240m"). Each chroma sample is calculated from the average RGB of
+    the 2×2 block of pixels it covers. The *width* and *height* must both be
+    even.
+
+    .. versionadded:: 2.1
+    """
+    _check_size(width, height, True)
+    coeffs, _ = _coefficients(standard)
+    src = _frame(rgb, frame_size('rgb', width, height), 'rgb')
+    out, dst = _output(out, frame_size('i420', width, height))
+    stride = width * 3
+    luma_size = width * height
+    chroma_width = width // 2
+    u_offset = luma_size
+    v_offset = luma_size + luma_size // 4
+    for j in range(0, height, 2):
+        row0 = bytes(src[j * stride:(j + 1) * stride])
+        row1 = bytes(src[(j + 1) * stride:(j + 2) * stride])
+        dst[j * width:(j + 1) * width] = _luma_row(coeffs, row0)
+        dst[(j + 1) * width:(j + 2) * width] = _luma_row(coeffs, row1)
+        us, vs = _chroma_row(coeffs, row0, row1)
+        k = (j // 2) * chroma_width
+        dst[u_offset + k:u_offset + k + chroma_width] = us
+        dst[v_offset + k:v_offset + k + chroma_width] = vs
+    return out
+
+
+def i420_to_rgb(yuv, width, height, out=None, standard='bt601'):
+    """
+    Convert the I420 frame *yuv* to packed RGB888; the reverse of
+    :func:`rgb_to_i420`. Each chroma sample is applied to all four pixels it
+    covers. The result is written to *out* (if specified) or a new
+    :class:`bytearray`, one row at a time.
+
+    .. versionadded:: 2.1
+    """
+    _check_size(width, height, True)
+    _, coeffs = _coefficients(standard)
+    src = _frame(yuv, frame_size('i420', width, height), 'yuv')
+    out, dst = _output(out, frame_size('rgb', width, height))
+    stride = width * 3
+    luma_size = width * height
+    chroma_width = width // 2
+    u_offset = luma_size
+    v_offset = luma_size + luma_size // 4
+    for j in range(height):
+        k = (j // 2) * chroma_width
+        dst[j * stride:(j + 1) * stride] = _rgb_row(
+            coeffs, bytes(src[j * width:(j + 1) * width]),
+            bytes(src[u_offset + k:u_offset + k + chroma_width]),
+            bytes(src[v_offset + k:v_offset + k + chroma_width]))
+    return out
+
+
+def rgb_to_nv12(rgb, width, height, out=None, standard='bt601'):
+    """
+    Convert the packed RGB888 frame *rgb* to NV12, the semi-planar 4:2:0
+    format consisting of a full resolution Y' plane followed by a single
+    plane of interleaved, quarter resolution Cb (U) and Cr (V) samples.
+    Otherwise, this behaves as :func:`rgb_to_i420`.
+
+    .. versionadded:: 2.1
+    """
+    _check_size(width, height, True)
+    coeffs, _ = _coefficients(standard)
+    src = _frame(rgb, frame_size('rgb', width, height), 'rgb')
+    out, dst = _output(out, frame_size('nv12', width, height))
+    stride = width * 3
+    luma_size = width * height
+    for j in range(0, height, 2):
+        row0 = bytes(src[j * stride:(j + 1) * stride])
+        row1 = bytes(src[(j + 1) * stride:(j + 2) * stride])
+        dst[j * width:(j + 1) * width] = _luma_row(coeffs, row0)
+        dst[(j + 1) * width:(j + 2) * width] = _luma_row(coeffs, row1)
+        uv = bytearray(width)
+        uv[0::2], uv[1::2] = _chroma_row(coeffs, row0, row1)
+        k = luma_size + (j // 2) * width
+        dst[k:k + width] = uv
+    return out
+
+
+def nv12_to_rgb(yuv, width, height, out=None, standard='bt601'):
+    """
+    Convert the NV12 frame *yuv* to packed RGB888; the reverse of
+    :func:`rgb_to_nv12`. Otherwise, this behaves as :func:`i420_to_rgb`.
+
+    .. versionadded:: 2.1
+    """
+    _check_size(width, height, True)
+    _, coeffs = _coefficients(standard)
+    src = _frame(yuv, frame_size('nv12', width, height), 'yuv')
+    out, dst = _output(out, frame_size('rgb', width, height))
+    stride = width * 3
+    luma_size = width * height
+    for j in range(height):
+        k = luma_size + (j // 2) * width
+        uv = bytes(src[k:k + width])
+        dst[j * stride:(j + 1) * stride] = _rgb_row(
+            coeffs, bytes(src[j * width:(j + 1) * width]),
+            uv[0::2], uv[1::2])
+    return out
+
+
+def rgb_to_yuyv(rgb, width, height, out=None, standard='bt601'):
+    """
+    Convert the packed RGB888 frame *rgb* to YUYV (also known as YUY2), the
+    packed 4:2:2 format in which each horizontal pair of pixels is
+    represented by four bytes: Y'\\ :sub:`0`, Cb, Y'\\ :sub:`1`, Cr. Each
+    chroma sample is calculated from the average RGB of the pair of pixels it
+    covers. The *width* must be even. Otherwise, this behaves as
+    :func:`rgb_to_i420`, converting one row at a time.
+
+    .. versionadded:: 2.1
+    """
+    _check_size(width, height, False)
+    coeffs, _ = _coefficients(standard)
+    src = _frame(rgb, frame_size('rgb', width, height), 'rgb')
+    out, dst = _output(out, frame_size('yuyv', width, height))
+    stride = width * 3
+    for j in range(height):
+        row = bytes(src[j * stride:(j + 1) * stride])
+        packed = bytearray(width * 2)
+        packed[0::2] = _luma_row(coeffs, row)
+        packed[1::4], packed[3::4] = _chroma_row(coeffs, row)
+        dst[j * width * 2:(j + 1) * width * 2] = packed
+    return out
+
+
+def yuyv_to_rgb(yuv, width, height, out=None, standard='bt601'):
+    """
+    Convert the YUYV frame *yuv* to packed RGB888; the reverse of
+    :func:`rgb_to_yuyv`. Otherwise, this behaves as :func:`i420_to_rgb`.
+
+    .. versionadded:: 2.1
+    """
+    _check_size(width, height, False)
+    _, coeffs = _coefficients(standard)
+    src = _frame(yuv, frame_size('yuyv', width, height), 'yuv')
+    out, dst = _output(out, frame_size('rgb', width, height))
+    stride = width * 3
+    for j in range(height):
+        packed = bytes(src[j * width * 2:(j + 1) * width * 2])
+        dst[j * stride:(j + 1) * stride] = _rgb_row(
+            coeffs, packed[0::2], packed[1::4], packed[3::4])
+    return out
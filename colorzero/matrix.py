@@ -0,0 +1,102 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines the 3x3 matrix arithmetic shared by the conversions between color
+systems related by linear transforms (sRGB and CIE XYZ, the RGB working
+spaces, chromatic adaptation, YIQ, and the LMS responses of OKLab).
+
+Matrices are tuples of three rows, each a tuple of three floats. Every
+operation is written out in full, rather than looping over rows and columns,
+as the matrices are always 3x3 and these functions are called for every
+color converted. Where a conversion passes through several linear steps
+(e.g. from one RGB working space to CIE XYZ, adapting the white point, then
+to another RGB space), the steps should be combined once with :func:`product`
+and the resulting matrix applied to each color.
+"""
+
+# Lots of the routines use single character variable names for components;
+# this is in keeping with colorzero.conversions
+# pylint: disable=invalid-name
+
+
+#: The 3x3 identity matrix
+IDENTITY = (
+    (1.0, 0.0, 0.0),
+    (0.0, 1.0, 0.0),
+    (0.0, 0.0, 1.0))
+
+
+def diagonal(x, y, z):
+    "Return the 3x3 matrix with *x*, *y*, *z* along its diagonal"
+    return (
+        (x, 0.0, 0.0),
+        (0.0, y, 0.0),
+        (0.0, 0.0, z))
+
+
+def mult(m, x, y, z):
+    "Return the product of the 3x3 matrix *m* and the vector (*x*, *y*, *z*)"
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = m
+    return (
+        m00 * x + m01 * y + m02 * z,
+        m10 * x + m11 * y + m12 * z,
+        m20 * x + m21 * y + m22 * z)
+
+
+def mult_columns(m, x, y, z):
+    """
+    Return the product of the 3x3 matrix *m* and each of the vectors in the
+    columns *x*, *y*, *z* (sequences, such as the columns of a
+    :class:`~colorzero.arrays.ColorArray`, rather than iterators), as a tuple
+    of three lists
+    """
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = m
+    return (
+        [m00 * x_ + m01 * y_ + m02 * z_ for x_, y_, z_ in zip(x, y, z)],
+        [m10 * x_ + m11 * y_ + m12 * z_ for x_, y_, z_ in zip(x, y, z)],
+        [m20 * x_ + m21 * y_ + m22 * z_ for x_, y_, z_ in zip(x, y, z)])
+
+
+def product(m, *matrices):
+    """
+    Return the product of the 3x3 matrix *m* and any further *matrices*, in
+    order. The result applies the last of the matrices first, so
+    ``product(a, b)`` converts as :func:`mult` with *b* followed by *a*
+    """
+    for n in matrices:
+        (a, b, c), (d, e, f), (g, h, i) = m
+        (j, k, l), (p, q, r), (s, t, u) = n
+        m = (
+            (a * j + b * p + c * s, a * k + b * q + c * t,
+             a * l + b * r + c * u),
+            (d * j + e * p + f * s, d * k + e * q + f * t,
+             d * l + e * r + f * u),
+            (g * j + h * p + i * s, g * k + h * q + i * t,
+             g * l + h * r + i * u),
+        )
+    return m
+
+
+def inverse(m):
+    """
+    Return the inverse of the 3x3 matrix *m*. A :exc:`ValueError` is raised
+    if *m* is singular
+    """
+    (a, b, c), (d, e, f), (g, h, i) = m
+    A = e * i - f * h
+    B = f * g - d * i
+    C = d * h - e * g
+    det = a * A + b * B + c * C
+    if det == 0:
+        raise ValueError('matrix is singular')
+    return (
+        (A / det, (c * h - b * i) / det, (b * f - c * e) / det),
+        (B / det, (a * i - c * g) / det, (c * d - a * f) / det),
+        (C / det, (b * g - a * h) / det, (a * e - b * d) / det),
+    )
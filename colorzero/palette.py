@@ -0,0 +1,601 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines the :class:`Palette` class used to find the nearest match for a color
+in a limited set of colors, such as those available to a terminal.
+"""
+
+import os
+import io
+import sys
+import mmap
+import struct
+import hashlib
+from collections.abc import Mapping
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    # Python < 3.8
+    shared_memory = None
+
+from . import conversions as cv, types, deltae, tables, cache
+
+
+class Palette(Mapping):
+    """
+    Represents a read-only mapping of integer codes (e.g. the index of a color
+    in a terminal's palette) to RGB888 colors, along with pre-calculated data
+    for finding the :meth:`nearest` entry to an arbitrary color.
+
+    The *colors* may be given as a mapping of codes to colors, or as a
+    sequence of colors (in which case the codes are the positions of the
+    colors within the sequence). Each color may be anything accepted by the
+    :class:`Color` constructor. For example::
+
+        >>> p = Palette({1: 'red', 2: 'green', 4: 'blue'})
+        >>> p[2]
+        RGB(r=0, g=128, b=0)
+        >>> p.nearest(Color('purple'))
+        1
+        >>> p.nearest(Color('purple'), method='ciede2000')
+        4
+
+    All data is held in a single flat buffer which can be published to other
+    processes with :meth:`publish` (and retrieved with :meth:`attach`), or
+    written to a file with :meth:`save` (and memory-mapped with :meth:`load`).
+    In either case, the receiving process shares the same memory read-only,
+    rather than re-calculating (or copying) the palette.
+
+    .. versionadded:: 2.1
+    """
+    # Header: magic, version, reserved, count, padding
+    _header = struct.Struct('=4sHHI4x')
+    _magic = b'CZPL' if sys.byteorder == 'little' else b'LPZC'
+    _version = 1
+    # LUT header: magic, version, reserved, SHA1 digest of the palette. The
+    # LUT version is that of the content of the table, and must be
+    # incremented whenever the output of _build_lut changes
+    _lut_struct = struct.Struct('=4sHH20s4x')
+    _lut_magic = b'CZLU' if sys.byteorder == 'little' else b'ULZC'
+    _lut_version = 1
+
+    def __init__(self, colors):
+        # pylint: disable=import-outside-toplevel
+        from .color import Color
+
+        if isinstance(colors, Mapping):
+            colors = sorted(colors.items())
+        else:
+            colors = enumerate(colors)
+        codes, rgbs = [], []
+        for code, color in colors:
+            if not isinstance(color, Color):
+                color = Color(color)
+            codes.append(code)
+            rgbs.append(color.rgb_bytes)
+        offset, _, _, size = self._layout(len(codes))
+        buf = bytearray(size)
+        self._header.pack_into(
+            buf, 0, self._magic, self._version, 0, len(codes))
+        struct.pack_into('={}I'.format(len(codes)), buf, offset, *codes)
+        self._attach(memoryview(buf))
+        for i, (r, g, b) in enumerate(rgbs):
+            self._rgb[i * 3:i * 3 + 3] = bytes((r, g, b))
+            self._lab[i * 3:i * 3 + 3] = memoryview(struct.pack(
+                '=3d', *cv.rgb_to_lab(*cv.rgb_bytes_to_rgb(r, g, b))
+            )).cast('d')
+        self._owner = None
+        self._lut = None
+        self._lut_owner = None
+
+    @classmethod
+    def _layout(cls, count):
+        # Calculate the offsets of the codes, RGB888, and Lab sections of the
+        # buffer, followed by the overall size. All sections are aligned to
+        # 8-byte boundaries
+        def align(n):
+            return (n + 7) & ~7
+        codes = cls._header.size
+        rgb = align(codes + count * 4)
+        lab = align(rgb + count * 3)
+        size = lab + count * 3 * 8
+        return codes, rgb, lab, size
+
+    def _attach(self, buf):
+        # Construct the views of the various sections of *buf*, checking the
+        # header in the process
+        try:
+            magic, version, _, count = self._header.unpack_from(buf)
+        except struct.error:
+            raise ValueError('buffer is too small for a palette') from None
+        if magic != self._magic:
+            raise ValueError('buffer does not contain a palette')
+        if version != self._version:
+            raise ValueError(
+                'unsupported palette version {}'.format(version))
+        codes, rgb, lab, size = self._layout(count)
+        if len(buf) < size:
+            raise ValueError('palette buffer is truncated')
+        self._buf = buf
+        self._count = count
+        self._codes = buf[codes:rgb].cast('I')[:count]
+        self._rgb = buf[rgb:rgb + count * 3]
+        self._lab = buf[lab:size].cast('d')
+        # Map each code to its position, for look-ups by code; where a code
+        # is repeated, the first position is used
+        self._index = {}
+        for i, code in enumerate(self._codes):
+            self._index.setdefault(code, i)
+
+    @classmethod
+    def _from_buffer(cls, buf, owner):
+        self = cls.__new__(cls)
+        self._attach(buf)
+        self._owner = owner
+        self._lut = None
+        self._lut_owner = None
+        return self
+
+    def close(self):
+        """
+        Release the resources associated with the palette. If the palette was
+        published with :meth:`publish`, this also removes the shared memory
+        block (processes which have already attached may continue to use it).
+        If the palette was loaded from a file with :meth:`load`, this closes
+        the underlying memory map.
+
+        The palette can no longer be used after this method is called.
+        """
+        self._close_lut()
+        for view in (self._codes, self._rgb, self._lab, self._buf):
+            view.release()
+        owner, self._owner = self._owner, None
+        if owner is not None:
+            owner.close()
+            if isinstance(owner, _Published):
+                owner.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter(self._codes)
+
+    def __getitem__(self, code):
+        i = self._index[code]
+        return types.RGB(*self._rgb[i * 3:i * 3 + 3])
+
+    def __repr__(self):
+        return '<{self.__class__.__name__} len={self._count}>'.format(
+            self=self)
+
+    def nearest(self, color, method='euclid'):
+        """
+        Returns the code of the entry in the palette closest to *color* (a
+        :class:`Color`, or any 3-tuple of linear RGB floats) according to the
+        specified *method*, which accepts the same values as
+        :meth:`Color.difference`. If several entries are equally close, the
+        lowest code is returned.
+
+        If a look-up table has been attached with :meth:`build_lut` or
+        :meth:`load_lut`, searches with the "euclid" method are answered by a
+        single index into the table. Note that the table is indexed by
+        RGB888 values, so *color* is rounded to the nearest RGB888 value
+        first; for colors which lie almost exactly between two entries of the
+        palette this may select a different entry to a search without the
+        table.
+        """
+        if method == 'euclid' and self._lut is not None:
+            r, g, b = cv.rgb_to_rgb_bytes(*color)
+            if 0 <= min(r, g, b) and max(r, g, b) <= 255:
+                return self._lut[cv.rgb_bytes_to_rgb24(r, g, b)]
+        if isinstance(method, bytes):
+            method = method.decode('ascii')
+        if method == 'euclid':
+            # Euclidean distance in RGB888 space is equivalent (for ordering)
+            # to that in linear RGB space, and avoids scaling every entry
+            r, g, b = (c * 255 for c in color)
+            rgb = self._rgb
+            best = min(
+                range(self._count),
+                key=lambda i: (
+                    (r - rgb[i * 3]) ** 2 +
+                    (g - rgb[i * 3 + 1]) ** 2 +
+                    (b - rgb[i * 3 + 2]) ** 2))
+        elif method in ('cie1976', 'cie1994g', 'cie1994t', 'ciede2000'):
+            compare = deltae.comparator(
+                cv.rgb_to_lab(*color), method)
+            labs = self._lab
+            best = min(
+                range(self._count),
+                key=lambda i: compare(labs[i * 3:i * 3 + 3]))
+        elif method == 'oklab':
+            compare = deltae.comparator(cv.rgb_to_oklab(*color), method)
+            rgb = self._rgb
+            best = min(
+                range(self._count),
+                key=lambda i: compare(cv.rgb_to_oklab(
+                    *cv.rgb_bytes_to_rgb(*rgb[i * 3:i * 3 + 3]))))
+        else:
+            raise ValueError('invalid method: {}'.format(method))
+        return self._codes[best]
+
+    def publish(self, name=None):
+        """
+        Copy the palette into a :mod:`~multiprocessing.shared_memory` block
+        named *name* (or a generated name if :data:`None`), and return the
+        name of the block. Other processes can then use :meth:`attach` with
+        the returned name to use the palette without re-calculating it.
+
+        The returned palette owns the shared memory block; when it is closed
+        (see :meth:`close`) the block is removed. For example::
+
+            >>> p = Palette(['black', 'red', 'green', 'blue'])
+            >>> name = p.publish()
+
+        Then, in another process::
+
+            >>> p = Palette.attach(name)
+
+        .. note::
+
+            Prior to Python 3.13, attaching to a shared memory block registers
+            it for removal when the attaching process ends unless the attaching
+            process shares a resource tracker with the publishing process. In
+            practice, this means the attaching processes should be children of
+            the publishing process (as in a pre-fork server). Unrelated
+            processes should use :meth:`save` and :meth:`load` instead.
+        """
+        if shared_memory is None:  # pragma: no cover
+            raise NotImplementedError(
+                'publishing a palette requires Python 3.8+')
+        if self._owner is not None:
+            raise ValueError('palette is already published or mapped')
+        shm = _Published(name=name, create=True, size=len(self._buf))
+        shm.buf[:len(self._buf)] = self._buf
+        old_buf = self._buf
+        for view in (self._codes, self._rgb, self._lab):
+            view.release()
+        self._attach(shm.buf)
+        old_buf.release()
+        self._owner = shm
+        return shm.name
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Construct a palette from the shared memory block *name* previously
+        returned by :meth:`publish` (potentially in another process). The
+        resulting palette is read-only and shares its memory with all other
+        processes attached to the same block.
+        """
+        if shared_memory is None:  # pragma: no cover
+            raise NotImplementedError(
+                'attaching a palette requires Python 3.8+')
+        if sys.version_info >= (3, 13):  # pragma: no cover
+            # pylint: disable=unexpected-keyword-arg
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        buf = shm.buf.toreadonly()
+        try:
+            return cls._from_buffer(buf, shm)
+        except:
+            buf.release()
+            shm.close()
+            raise
+
+    def save(self, path):
+        """
+        Write the palette to the file at *path*. The file is written
+        atomically (a temporary file is written, then renamed over *path*) so
+        processes concurrently calling :meth:`load` never observe a partial
+        palette.
+        """
+        cache.write_atomic(path, (self._buf,))
+
+    @property
+    def lut(self):
+        """
+        The look-up table attached by :meth:`build_lut` or :meth:`load_lut`,
+        or :data:`None` if no table is attached. The table is a
+        :class:`memoryview` of 2\\ :sup:`24` bytes, indexed by the RGB24 value
+        of a color (see :meth:`Color.from_rgb24`), each of which contains the
+        code of the nearest entry in the palette (using the "euclid" method).
+        """
+        return self._lut
+
+    def build_lut(self, *, cached=False):
+        """
+        Calculate the look-up table for the palette (see :attr:`lut`) and
+        attach it. All codes of the palette must lie between 0 and 255 to be
+        representable in the table.
+
+        If *cached* is :data:`True`, the table is obtained from the on-disk
+        cache (see :func:`colorzero.cache.table`) which will only calculate
+        it if no process has done so before; the cached table is keyed by the
+        content of the palette.
+
+        .. warning::
+
+            The table occupies 16MB of memory, and takes several seconds to
+            build for palettes with many colors (like the 256 color xterm
+            palette). Consider using *cached*, or building the table once,
+            with :file:`scripts/mklut`, or with :meth:`save_lut` and then
+            using :meth:`load_lut` which will share the (memory-mapped) table
+            between all processes that load it.
+
+        .. versionchanged:: 2.1
+            Added the *cached* parameter
+        """
+        if any(code > 255 for code in self._codes):
+            raise ValueError(
+                'look-up tables require all codes to be between 0 and 255')
+        self._close_lut()
+        if cached:
+            self._lut = cache.table(
+                'lut-' + hashlib.sha1(self._buf).hexdigest(),
+                self._lut_version, self._calc_lut)
+        else:
+            self._lut = memoryview(self._calc_lut())
+
+    def _calc_lut(self):
+        # Where several entries share a color, only the lowest code can ever
+        # be selected
+        entries = {}
+        for i, code in enumerate(self._codes):
+            entries.setdefault(tuple(self._rgb[i * 3:i * 3 + 3]), code)
+        return _build_lut(sorted(
+            (code, r, g, b) for (r, g, b), code in entries.items()))
+
+    def _lut_header(self):
+        return self._lut_struct.pack(
+            self._lut_magic, self._lut_version, 0,
+            hashlib.sha1(self._buf).digest())
+
+    def save_lut(self, path):
+        """
+        Write the attached look-up table (see :attr:`lut`) to the file at
+        *path*. The file is written atomically (in the same manner as
+        :meth:`save`), and records which palette it was built for, so that
+        :meth:`load_lut` can refuse tables built for a different palette.
+        """
+        if self._lut is None:
+            raise ValueError('palette has no look-up table')
+        cache.write_atomic(path, (self._lut_header(), self._lut))
+
+    def load_lut(self, path):
+        """
+        Memory-map the look-up table in the file at *path* (previously written
+        by :meth:`save_lut`) and attach it (see :attr:`lut`). The operating
+        system shares the mapped pages between all processes that load the
+        same file. A :exc:`ValueError` is raised if the file does not contain
+        a table built for this palette.
+        """
+        with io.open(path, 'rb') as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                raise ValueError(
+                    'file does not contain a look-up table') from None
+        buf = memoryview(mapping)
+        try:
+            size = self._lut_struct.size
+            if len(buf) != size + (1 << 24):
+                raise ValueError('file does not contain a look-up table')
+            if buf[:size] != self._lut_header():
+                raise ValueError(
+                    'look-up table was not built for this palette')
+            self._close_lut()
+            self._lut = buf[size:]
+            self._lut_owner = mapping
+        finally:
+            buf.release()
+            if self._lut_owner is not mapping:
+                mapping.close()
+
+    def _close_lut(self):
+        if self._lut is not None:
+            self._lut.release()
+            self._lut = None
+        owner, self._lut_owner = self._lut_owner, None
+        if owner is not None:
+            owner.close()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Construct a palette by memory-mapping the file at *path* (previously
+        written by :meth:`save`). The resulting palette is read-only, and the
+        operating system shares the mapped pages between all processes that
+        load the same file.
+        """
+        with io.open(path, 'rb') as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                raise ValueError('buffer is too small for a palette') from None
+        buf = memoryview(mapping)
+        try:
+            return cls._from_buffer(buf, mapping)
+        except:
+            buf.release()
+            mapping.close()
+            raise
+
+
+def _build_lut(entries):
+    # Build the look-up table for *entries*, a list of (code, r, g, b) tuples
+    # sorted by code. The RGB cube is recursively divided into octants; for
+    # each the entries that could be nearest to some point within it are
+    # determined by comparing the minimum and maximum distance of each entry
+    # to the box. Boxes with a single candidate are filled wholesale; small
+    # boxes with several candidates are filled a line at a time (along the
+    # red axis, which is contiguous in the table) by walking the lower
+    # envelope of the candidates' distances
+    # pylint: disable=too-many-locals
+    lut = bytearray(1 << 24)
+
+    def fill_lines(r0, g0, b0, size, candidates):
+        r1 = r0 + size
+        for b in range(b0, b0 + size):
+            for g in range(g0, g0 + size):
+                base = (b << 16) | (g << 8)
+                # The distance of an entry from (r, g, b) is k - 2 * r * pr + r
+                # ** 2; as r ** 2 is common to all entries only (k, pr) matter
+                lines = [
+                    ((g - pg) ** 2 + (b - pb) ** 2 + pr ** 2, pr, code)
+                    for code, pr, pg, pb in candidates
+                ]
+                r = r0
+                best = min(lines, key=lambda l: (l[0] - 2 * r * l[1], l[2]))
+                while True:
+                    k, pr, code = best
+                    # Find the first position beyond r at which another
+                    # entry beats the current best. Only entries with a
+                    # larger red component can do so as r increases
+                    stop, best = r1, None
+                    for line in lines:
+                        dr = line[1] - pr
+                        if dr > 0:
+                            at, rem = divmod(line[0] - k, 2 * dr)
+                            if rem or line[2] > code:
+                                at += 1
+                            at = max(at, r + 1)
+                            if at < stop or (at == stop and best and (
+                                    line[0] - 2 * at * line[1], line[2]) < (
+                                    best[0] - 2 * at * best[1], best[2])):
+                                stop, best = at, line
+                    lut[base + r:base + stop] = bytes((code,)) * (stop - r)
+                    if best is None:
+                        break
+                    r = stop
+
+    def fill_box(r0, g0, b0, size, candidates):
+        r1, g1, b1 = r0 + size - 1, g0 + size - 1, b0 + size - 1
+        nearest = []
+        furthest = None
+        for entry in candidates:
+            _, r, g, b = entry
+            dr = r0 - r if r < r0 else r - r1 if r > r1 else 0
+            dg = g0 - g if g < g0 else g - g1 if g > g1 else 0
+            db = b0 - b if b < b0 else b - b1 if b > b1 else 0
+            nearest.append(dr * dr + dg * dg + db * db)
+            dr = max(r - r0, r1 - r)
+            dg = max(g - g0, g1 - g)
+            db = max(b - b0, b1 - b)
+            dist = dr * dr + dg * dg + db * db
+            if furthest is None or dist < furthest:
+                furthest = dist
+        # Exclude any entry whose nearest point is further than the furthest
+        # point of another entry; it can never be the nearest in this box
+        candidates = [
+            entry for entry, dist in zip(candidates, nearest)
+            if dist <= furthest
+        ]
+        if len(candidates) == 1:
+            code = bytes((candidates[0][0],)) * size
+            for b in range(b0, b0 + size):
+                for g in range(g0, g0 + size):
+                    i = (b << 16) | (g << 8) | r0
+                    lut[i:i + size] = code
+        elif size <= 16:
+            fill_lines(r0, g0, b0, size, candidates)
+        else:
+            size //= 2
+            for b in (b0, b0 + size):
+                for g in (g0, g0 + size):
+                    for r in (r0, r0 + size):
+                        fill_box(r, g, b, size, candidates)
+
+    if entries:
+        fill_box(0, 0, 0, 256, entries)
+    return lut
+
+
+if shared_memory is not None:
+    class _Published(shared_memory.SharedMemory):
+        # Distinguishes blocks created by Palette.publish (which must be
+        # unlinked on close) from those created by Palette.attach
+        pass
+else:  # pragma: no cover
+    _Published = ()
+
+
+# The standard palettes used when formatting colors for terminals, keyed by
+# name and constructed on first use
+_standard = {}
+_standard_sources = {
+    'xterm':    lambda: {
+        index: rgb for rgb, index in tables.XTERM_COLORS.items()},
+    'dos-fore': lambda: {
+        bold * 8 + index: rgb
+        for rgb, (bold, index) in tables.DOS_FORE_COLORS.items()},
+    'dos-back': lambda: {
+        index: rgb
+        for rgb, (bold, index) in tables.DOS_BACK_COLORS.items()},
+}
+
+
+def standard(name):
+    """
+    Return the standard :class:`Palette` *name*, which is one of:
+
+    * "xterm" - the 256-color xterm palette; codes are xterm color indexes
+
+    * "dos-fore" - the original DOS foreground colors; codes are the color
+      index (0 to 7) plus 8 if the "bold" attribute is required
+
+    * "dos-back" - the original DOS background colors; codes are the color
+      index (0 to 7)
+
+    The palette is constructed the first time it is requested, unless it has
+    been replaced with :func:`install`. These palettes are used by
+    :class:`Color` when formatting ANSI codes.
+    """
+    try:
+        return _standard[name]
+    except KeyError:
+        try:
+            source = _standard_sources[name]
+        except KeyError:
+            raise ValueError('invalid palette name: {}'.format(name)) from None
+        result = _standard[name] = Palette(source())
+        return result
+
+
+def install(name, palette):
+    """
+    Replace the standard palette *name* (see :func:`standard`) with *palette*.
+    This is typically used by worker processes to install a palette obtained
+    from :meth:`Palette.attach` or :meth:`Palette.load`, avoiding the cost of
+    constructing the palette in every process. For example, in a parent
+    process::
+
+        >>> from colorzero import palette
+        >>> name = palette.standard('xterm').publish()
+
+    Then, in each child::
+
+        >>> palette.install('xterm', palette.Palette.attach(name))
+    """
+    if name not in _standard_sources:
+        raise ValueError('invalid palette name: {}'.format(name))
+    if not isinstance(palette, Palette):
+        raise TypeError('palette must be a Palette instance')
+    _standard[name] = palette
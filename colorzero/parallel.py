@@ -0,0 +1,246 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines routines for converting large numbers of colors by spreading the work
+across several processes.
+"""
+
+import os
+from array import array
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    # Python < 3.8
+    shared_memory = None
+
+from .color import Color
+from .arrays import ColorArray
+
+
+# The Color attributes which may be used as the target of a conversion, and
+# the number of components each produces
+TARGETS = {
+    'rgb':  3,
+    'yuv':  3,
+    'yiq':  3,
+    'hls':  3,
+    'hsv':  3,
+    'cmy':  3,
+    'cmyk': 4,
+    'xyz':  3,
+    'lab':  3,
+    'lch':  3,
+    'luv':  3,
+    'oklab': 3,
+    'oklch': 3,
+}
+
+
+def convert(colors, to='lab', *, workers=None, chunk_size=None, out=None):
+    """
+    Convert the sequence of *colors* to the color system named by *to*, which
+    must be the name of one of the :class:`Color` attributes "rgb", "yuv",
+    "yiq", "hls", "hsv", "cmy", "cmyk", "xyz", "lab", "lch", "luv", "oklab",
+    or "oklch".
+
+    The *colors* may be given as a sequence of :class:`Color` instances (or
+    any 3-tuples of linear RGB floats), as a
+    :class:`~colorzero.arrays.ColorArray`, as a :class:`bytes`-like object
+    containing packed RGB888 triples (as read from an image or video frame,
+    for example), or as a buffer of packed linear RGB floats (such as an
+    :class:`~array.array` with typecode "d").
+
+    The conversion is split into chunks of *chunk_size* colors which are
+    farmed out to a pool of *workers* processes (which defaults to the
+    number of CPUs available). The input and the output are placed in
+    :mod:`~multiprocessing.shared_memory` so that neither needs pickling when
+    passing between processes; each worker writes its results directly into
+    its slice of the output. If *workers* is 1 (or there are too few colors to
+    make a pool worthwhile) the conversion is performed in the calling
+    process.
+
+    The result is an :class:`~array.array` of floats containing the
+    components of each converted color in order. For example, when
+    converting to "lab", the result will be three times the length of
+    *colors* and contain the L*, a*, b* components of the first color,
+    followed by those of the second color, and so on::
+
+        >>> from colorzero.parallel import convert
+        >>> convert([Color('red'), Color('blue')], to='hls', workers=1)
+        array('d', [0.0, 0.5, 1.0, 0.6666666666666666, 0.5, 1.0])
+
+    If *out* is specified, the results are written to it instead, and it is
+    returned. It may be any writable buffer of floats (or bytes) large enough
+    to hold the results, or a block of
+    :class:`~multiprocessing.shared_memory.SharedMemory`. When converting in
+    parallel, the workers write their results to shared memory; they are
+    copied from there to *out*, unless *out* is itself shared memory, in which
+    case the workers write to it directly and nothing is copied.
+
+    .. note::
+
+        Parallel conversion requires Python 3.8 or later; on older versions
+        the conversion is always performed in the calling process.
+
+    .. versionadded:: 2.1
+    """
+    try:
+        width = TARGETS[to]
+    except KeyError:
+        raise ValueError('invalid conversion target: {}'.format(to)) from None
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be >= 1')
+    if isinstance(colors, ColorArray):
+        # Interleave the columns; this avoids constructing a Color for each
+        # element of the array
+        source = array('d', bytes(len(colors) * 3 * 8))
+        with memoryview(source) as view:
+            for i, column in enumerate(colors.columns):
+                view[i::3] = column
+    else:
+        try:
+            source = memoryview(colors)
+        except TypeError:
+            source = array('d', chain.from_iterable(colors))
+        else:
+            if source.format == 'd':
+                source = source.cast('B').cast('d')
+            elif source.itemsize == 1:
+                source = source.cast('B')
+            else:
+                raise ValueError(
+                    'buffer must contain RGB888 bytes or linear RGB floats')
+    fmt = source.typecode if isinstance(source, array) else source.format
+    if len(source) % 3:
+        raise ValueError('length of buffer must be a multiple of 3')
+    count = len(source) // 3
+    if chunk_size is None:
+        # Aim for a few chunks per worker so that stragglers are evened out
+        chunk_size = max(1024, -(-count // (workers * 4)))
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be >= 1')
+
+    size = count * width
+    if out is None:
+        result = target = array('d', bytes(size * 8))
+    else:
+        result = out
+        target = _target(out, size)
+    try:
+        if workers == 1 or count <= chunk_size or shared_memory is None:
+            _convert(source, fmt, target, to, width, 0, count)
+        else:
+            _convert_parallel(
+                source, fmt, out, target, to, width, count, workers,
+                chunk_size)
+    finally:
+        if target is not result:
+            target.release()
+    return result
+
+
+def _target(out, size):
+    # Return a writable memoryview of the first *size* floats of *out*
+    if shared_memory is not None and isinstance(
+            out, shared_memory.SharedMemory):
+        out = out.buf
+    with memoryview(out) as view:
+        if view.readonly:
+            raise ValueError('out must be writable')
+        if view.format != 'd' and view.itemsize != 1:
+            raise ValueError('out must be a buffer of floats or bytes')
+        with view.cast('B') as data:
+            if len(data) < size * 8:
+                raise ValueError('out is too small for the results')
+            with data[:size * 8] as chunk:
+                return chunk.cast('d')
+
+
+def _convert_parallel(
+        source, fmt, out, target, to, width, count, workers, chunk_size):
+    # Convert *source* in chunks across a pool of *workers*, writing the
+    # results to *target* (via a temporary block of shared memory, unless
+    # *out* is itself shared memory)
+    in_shm = shared_memory.SharedMemory(
+        create=True, size=max(1, len(source) * source.itemsize))
+    try:
+        if isinstance(out, shared_memory.SharedMemory):
+            out_shm = None
+            out_name = out.name
+        else:
+            out_shm = shared_memory.SharedMemory(
+                create=True, size=max(1, count * width * 8))
+            out_name = out_shm.name
+        try:
+            in_shm.buf[:len(source) * source.itemsize] = (
+                memoryview(source).cast('B'))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Use of list here ensures any exception from the workers
+                # is re-raised in this process
+                list(executor.map(
+                    _convert_chunk,
+                    *zip(*(
+                        (in_shm.name, fmt, out_name, to, width,
+                         start, min(count, start + chunk_size))
+                        for start in range(0, count, chunk_size)
+                    ))
+                ))
+            if out_shm is not None:
+                with out_shm.buf[:count * width * 8] as chunk:
+                    with memoryview(target).cast('B') as data:
+                        data[:] = chunk
+        finally:
+            if out_shm is not None:
+                out_shm.close()
+                out_shm.unlink()
+    finally:
+        in_shm.close()
+        in_shm.unlink()
+
+
+def _convert_chunk(in_name, fmt, out_name, to, width, start, stop):
+    # NOTE: Worker processes share the resource tracker of the parent which
+    # owns (and will ultimately unlink) both blocks
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    try:
+        out_shm = shared_memory.SharedMemory(name=out_name)
+        try:
+            source = in_shm.buf.cast(fmt)
+            target = out_shm.buf[:stop * width * 8].cast('d')
+            try:
+                _convert(source, fmt, target, to, width, start, stop)
+            finally:
+                source.release()
+                target.release()
+        finally:
+            out_shm.close()
+    finally:
+        in_shm.close()
+
+
+def _convert(source, fmt, target, to, width, start, stop):
+    # Convert the colors from *start* to *stop* in *source* writing the
+    # results to the same positions in *target*
+    conv = getattr(Color, to).fget
+    new = tuple.__new__
+    it = iter(source[start * 3:stop * 3])
+    if fmt == 'B':
+        colors = (
+            new(Color, (r / 255, g / 255, b / 255))
+            for r, g, b in zip(it, it, it)
+        )
+    else:
+        colors = (new(Color, rgb) for rgb in zip(it, it, it))
+    target[start * width:stop * width] = array(
+        'd', chain.from_iterable(conv(color) for color in colors))
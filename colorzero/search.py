@@ -0,0 +1,473 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines routines for finding alike colors amongst large numbers of colors,
+without comparing every pair, and the :class:`ColorIndex` class for finding
+the colors of a catalog closest to others.
+"""
+
+import io
+import sys
+import heapq
+import struct
+from array import array
+from collections.abc import Mapping
+from math import floor, sqrt, inf
+
+from . import conversions as cv, deltae, cache
+from .types import Lab
+from .arrays import ColorArray
+
+# Lots of the routines use single character variable names for components;
+# this is in keeping with colorzero.conversions
+# pylint: disable=invalid-name
+
+
+def _values(colors, method):
+    # Return *colors* as a list of tuples in the system the difference
+    # *method* expects
+    if not isinstance(colors, ColorArray):
+        colors = ColorArray(colors)
+    if method == 'euclid':
+        array = colors
+    elif method == 'oklab':
+        array = colors.oklab
+    else:
+        array = colors.lab
+    return list(zip(*array.columns))
+
+
+# Each method is associated with the size of the cells of the grid used by
+# dedupe (along L* and along a* and b*, as multiples of the threshold), and a
+# function of a color and the threshold returning the distances (again, as
+# multiples of the threshold) along those axes beyond which a color cannot be
+# alike to the one given
+
+def _euclid_reach(value, threshold):
+    # The Euclidean methods are bounded by the distance along every axis
+    return 1, 1
+
+
+def _cie1994_reach(method):
+    kL, K1, _ = deltae._CIE1994[method]
+
+    def reach(value, threshold):
+        # The lightness difference is weighted by 1 / kL, and the chroma and
+        # hue differences (which together are the a*, b* distance) by at
+        # least 1 / SC, where SC grows with the chroma of the first color
+        _, a, b = value
+        return kL, 1 + K1 * sqrt(a ** 2 + b ** 2)
+    return reach
+
+
+def _ciede2000_reach(value, threshold):
+    # The least difference at a distance d along the a*, b* plane is
+    # sab * d / (1 + kab * d) (see _ciede2000_bounds), which only reaches the
+    # threshold at d = threshold / (sab - kab * threshold). As d grows, the
+    # least difference approaches sab / kab; no distance is too great for
+    # thresholds beyond that
+    sl, sab, kab = _ciede2000_bounds(*value)
+    limit = sab - kab * threshold
+    return 1 / sl, 1 / limit if limit > 0 else inf
+
+
+_GRIDS = {
+    'euclid':    (1, 1, _euclid_reach),
+    'cie1976':   (1, 1, _euclid_reach),
+    'cie1994g':  (2, 3, _cie1994_reach('cie1994g')),
+    'cie1994t':  (2, 3, _cie1994_reach('cie1994t')),
+    'ciede2000': (2, 8, _ciede2000_reach),
+    'oklab':     (1, 1, _euclid_reach),
+}
+
+
+def dedupe(colors, threshold, method='ciede2000'):
+    """
+    Groups alike *colors* (a sequence of :class:`~colorzero.Color` instances,
+    or a :class:`~colorzero.arrays.ColorArray`), returning a 2-tuple of the
+    list of the indexes of the representative of each group, and a list of
+    the group of each color (the position of its representative in the first
+    list). For example::
+
+        >>> from colorzero import Color
+        >>> from colorzero.search import dedupe
+        >>> colors = [Color(c) for c in ('red', '#fe0101', 'blue', '#f00')]
+        >>> dedupe(colors, 2.3)
+        ([0, 2], [0, 0, 1, 0])
+
+    Colors are considered alike when their difference according to *method*
+    (which accepts the same values as :meth:`Color.difference
+    <colorzero.Color.difference>`) is no greater than *threshold*. Colors are
+    considered in order; each joins the group of the closest representative
+    it is alike to, or becomes the representative of a new group if there is
+    none. Every color is therefore alike to its representative, and the
+    representatives are the first of each group.
+
+    Rather than comparing each color against every representative, the
+    representatives are placed in a grid of cells (in CIE Lab, OKLab, or RGB
+    as required by *method*) sized in proportion to *threshold*, and each
+    color is only compared with those in nearby cells. This scales close to
+    linearly with the number of colors, unless most of them are alike. For
+    the Euclidean methods and CIE 1994, the nearby cells are those which could
+    contain an alike color. For CIEDE 2000, they are those which could contain
+    a color within the least difference the formula permits for their
+    distance; for large thresholds (around 10 or more), this may be all of
+    them.
+
+    .. versionadded:: 2.1
+    """
+    if isinstance(method, bytes):
+        method = method.decode('ascii')
+    try:
+        size_x, size_yz, reach = _GRIDS[method]
+    except (KeyError, TypeError):
+        raise ValueError('invalid method: {}'.format(method)) from None
+    if not threshold > 0:
+        raise ValueError('threshold must be positive')
+    values = _values(colors, method)
+    size_x *= threshold
+    size_yz *= threshold
+    representatives = []
+    groups = []
+    grid = {}
+    # The least and greatest occupied cell along each axis; the search is
+    # limited to these (which matters when the reach is unbounded)
+    lo = [0, 0, 0]
+    hi = [-1, -1, -1]
+    for index, value in enumerate(values):
+        x, y, z = value
+        rx, ryz = reach(value, threshold)
+        rx *= threshold
+        ryz *= threshold
+        test = deltae._within_test(value, threshold, method)
+        compare = deltae.comparator(value, method)
+        best = best_group = None
+        xs = range(
+            floor(max((x - rx) / size_x, lo[0])),
+            floor(min((x + rx) / size_x, hi[0])) + 1)
+        ys = range(
+            floor(max((y - ryz) / size_yz, lo[1])),
+            floor(min((y + ryz) / size_yz, hi[1])) + 1)
+        zs = range(
+            floor(max((z - ryz) / size_yz, lo[2])),
+            floor(min((z + ryz) / size_yz, hi[2])) + 1)
+        for i in xs:
+            for j in ys:
+                for k in zs:
+                    for group in grid.get((i, j, k), ()):
+                        rep = values[representatives[group]]
+                        if test(rep):
+                            diff = compare(rep)
+                            if best is None or diff < best:
+                                best, best_group = diff, group
+        if best_group is None:
+            best_group = len(representatives)
+            representatives.append(index)
+            cell = (floor(x / size_x), floor(y / size_yz), floor(z / size_yz))
+            grid.setdefault(cell, []).append(best_group)
+            if best_group:
+                lo = list(map(min, lo, cell))
+                hi = list(map(max, hi, cell))
+            else:
+                lo = hi = list(cell)
+        groups.append(best_group)
+    return representatives, groups
+
+
+# The lower bound of CIEDE 2000 differences. The rotation term can subtract
+# at most sqrt(3) / 2 of the combined chroma and hue terms
+_CIEDE2000_LAMBDA = sqrt(1 - sqrt(3) / 2)
+
+
+def _cie1976_bounds(l, a, b):
+    return 1, 1, 0
+
+
+def _cie1994_bounds(method):
+    kL, K1, _ = deltae._CIE1994[method]
+
+    def bounds(l, a, b):
+        # Exact, as SC depends only upon the chroma of the first color
+        return 1 / kL, 1 / (1 + K1 * sqrt(a ** 2 + b ** 2)), 0
+    return bounds
+
+
+def _ciede2000_bounds(l, a, b):
+    # SL is at most 1.75 for L* between 0 and 100. The mean chroma is at most
+    # 1.5 times the mean of the chromas after the a* correction, and the
+    # chroma of a color at a distance of d along the a*, b* plane is at most
+    # C + d, so SC is at most c0 + c1 * d
+    c0 = 1 + 0.0675 * sqrt(a ** 2 + b ** 2)
+    return 1 / 1.75, _CIEDE2000_LAMBDA / c0, 0.03375 / c0
+
+
+_BOUNDS = {
+    'cie1976':   _cie1976_bounds,
+    'cie1994g':  _cie1994_bounds('cie1994g'),
+    'cie1994t':  _cie1994_bounds('cie1994t'),
+    'ciede2000': _ciede2000_bounds,
+}
+
+
+class ColorIndex:
+    """
+    Represents a read-only catalog of colors in CIE Lab, arranged in a k-d
+    tree for finding the entries closest to an arbitrary color without
+    comparing it to every entry.
+
+    The *colors* may be given as a mapping of keys to colors (such as
+    :data:`~colorzero.tables.NAMED_COLORS`), or as a sequence of colors or a
+    :class:`~colorzero.arrays.ColorArray` (in which case the keys are the
+    positions of the colors within the sequence). Each color may be anything
+    accepted by the :class:`~colorzero.Color` constructor. For example::
+
+        >>> from colorzero import Color, NAMED_COLORS
+        >>> from colorzero.search import ColorIndex
+        >>> index = ColorIndex(NAMED_COLORS)
+        >>> index.knn(Color('#c04040'), 3)
+        [('crimson', 5.573291480598204), ('firebrick', 7.275924886558258), ('brown', 7.736948198682245)]
+        >>> index.radius(Color('#c04040'), 7.5)
+        [('crimson', 5.573291480598204), ('firebrick', 7.275924886558258)]
+
+    Searches accept the "cie1976", "cie1994g", "cie1994t", and "ciede2000"
+    methods of :meth:`Color.difference <colorzero.Color.difference>`. Each
+    split of the tree is skipped when the distance in Lab from the color to
+    the split is too great for any entry beyond it to be close enough
+    (according to the least difference the method permits for that
+    distance); the entries which remain are compared exactly.
+
+    The index can be written to a file with :meth:`save` (and read with
+    :meth:`load`) to avoid rebuilding it, provided its keys are all integers
+    or all strings.
+
+    .. versionadded:: 2.1
+    """
+    __slots__ = ('_keys', '_positions', '_labs')
+    # Header: magic, version, kind of keys, count, padding
+    _header = struct.Struct('=4sHHI4x')
+    _magic = b'CZIX' if sys.byteorder == 'little' else b'XIZC'
+    _version = 1
+    _int_keys, _str_keys = 0, 1
+
+    def __init__(self, colors):
+        # pylint: disable=import-outside-toplevel
+        from .color import Color
+
+        if isinstance(colors, ColorArray):
+            keys = range(len(colors))
+        else:
+            if isinstance(colors, Mapping):
+                keys = list(colors.keys())
+                colors = colors.values()
+            else:
+                colors = list(colors)
+                keys = range(len(colors))
+            colors = ColorArray.from_colors(
+                color if isinstance(color, Color) else Color(color)
+                for color in colors)
+        labs = list(zip(*colors.lab.columns))
+        # Re-order the entries into an implicit k-d tree; the root of each
+        # range of entries is its median along the axis of its depth, with
+        # the entries before it on the lower side of the split
+        order = list(range(len(labs)))
+
+        def build(lo, hi, axis):
+            if hi - lo > 1:
+                order[lo:hi] = sorted(
+                    order[lo:hi], key=lambda i: labs[i][axis])
+                mid = (lo + hi) // 2
+                axis = (axis + 1) % 3
+                build(lo, mid, axis)
+                build(mid + 1, hi, axis)
+        build(0, len(order), 0)
+        self._attach(
+            [keys[i] for i in order], order, [labs[i] for i in order])
+
+    def _attach(self, keys, positions, labs):
+        self._keys = keys
+        self._positions = positions
+        self._labs = labs
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return '<{self.__class__.__name__} len={len}>'.format(
+            self=self, len=len(self))
+
+    def _search(self, color, method, visit):
+        # Traverse the tree, calling *visit* with the position in the tree
+        # of each entry which may be close enough to *color*; *visit* returns
+        # the greatest difference that is still close enough
+        sl, sab, kab = _BOUNDS[method](*color)
+        labs = self._labs
+
+        def search(lo, hi, axis, bound):
+            mid = (lo + hi) // 2
+            lab = labs[mid]
+            bound = visit(mid, lab)
+            dist = color[axis] - lab[axis]
+            if dist > 0:
+                near, far = (mid + 1, hi), (lo, mid)
+            else:
+                near, far = (lo, mid), (mid + 1, hi)
+            nxt = (axis + 1) % 3
+            if near[0] < near[1]:
+                bound = search(near[0], near[1], nxt, bound)
+            if far[0] < far[1]:
+                dist = abs(dist)
+                if axis:
+                    least = sab * dist / (1 + kab * dist)
+                else:
+                    least = sl * dist
+                if least <= bound:
+                    bound = search(far[0], far[1], nxt, bound)
+            return bound
+
+        if labs:
+            search(0, len(labs), 0, inf)
+
+    @staticmethod
+    def _query(color, method):
+        # Validate *method*, and return it with *color* in Lab
+        if isinstance(method, bytes):
+            method = method.decode('ascii')
+        if method not in _BOUNDS:
+            raise ValueError('invalid method: {}'.format(method))
+        if not isinstance(color, Lab):
+            color = cv.rgb_to_lab(*color)
+        return color, method
+
+    def knn(self, color, k=1, method='ciede2000'):
+        """
+        Returns a list of the keys of the *k* entries closest to *color* (a
+        :class:`~colorzero.Color`, any 3-tuple of linear RGB floats, or a
+        :class:`~colorzero.Lab`) according to *method*, each paired with its
+        difference from *color*, in order of difference. Entries with equal
+        differences are ordered as they were given.
+        """
+        color, method = self._query(color, method)
+        if not k > 0:
+            raise ValueError('k must be positive')
+        compare = deltae.comparator(color, method)
+        positions = self._positions
+        # The best (negated difference, negated position, index) found so
+        # far, with the worst of them at the root of the heap
+        best = []
+
+        def visit(index, lab):
+            entry = (-compare(lab), -positions[index], index)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+                if len(best) < k:
+                    return inf
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            return -best[0][0]
+
+        self._search(color, method, visit)
+        keys = self._keys
+        return [
+            (keys[index], -diff)
+            for diff, _, index in sorted(best, reverse=True)
+        ]
+
+    def radius(self, color, r, method='ciede2000'):
+        """
+        Returns a list of the keys of all entries no further than *r* from
+        *color* (a :class:`~colorzero.Color`, any 3-tuple of linear RGB floats,
+        or a :class:`~colorzero.Lab`) according to *method*, each paired with
+        its difference from *color*, in order of difference. Entries with
+        equal differences are ordered as they were given.
+        """
+        color, method = self._query(color, method)
+        if not r >= 0:
+            raise ValueError('r must not be negative')
+        test = deltae._within_test(color, r, method)
+        compare = deltae.comparator(color, method)
+        positions = self._positions
+        found = []
+
+        def visit(index, lab):
+            if test(lab):
+                found.append((compare(lab), positions[index], index))
+            return r
+
+        self._search(color, method, visit)
+        keys = self._keys
+        return [(keys[index], diff) for diff, _, index in sorted(found)]
+
+    def save(self, path):
+        """
+        Write the index to the file at *path*, atomically (in the same manner
+        as :meth:`Palette.save <colorzero.palette.Palette.save>`). A
+        :exc:`ValueError` is raised if the keys of the index are not all
+        integers, or all strings.
+        """
+        keys = self._keys
+        if all(isinstance(key, int) for key in keys):
+            kind = self._int_keys
+            chunks = [array('q', keys)]
+        elif all(isinstance(key, str) for key in keys):
+            kind = self._str_keys
+            keys = [key.encode('utf-8') for key in keys]
+            chunks = [array('I', map(len, keys)), b''.join(keys)]
+        else:
+            raise ValueError('keys must be all integers or all strings')
+        cache.write_atomic(path, [
+            self._header.pack(self._magic, self._version, kind, len(keys)),
+            array('d', (v for lab in self._labs for v in lab)),
+            array('I', self._positions),
+        ] + chunks)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Construct an index from the file at *path* (previously written by
+        :meth:`save`).
+        """
+        with io.open(path, 'rb') as f:
+            buf = f.read()
+        try:
+            magic, version, kind, count = cls._header.unpack_from(buf)
+        except struct.error:
+            raise ValueError('file does not contain a color index') from None
+        if magic != cls._magic or kind not in (cls._int_keys, cls._str_keys):
+            raise ValueError('file does not contain a color index')
+        if version != cls._version:
+            raise ValueError(
+                'unsupported color index version {}'.format(version))
+        offset = cls._header.size
+        sections = [('d', count * 3), ('I', count)]
+        if kind == cls._int_keys:
+            sections.append(('q', count))
+        else:
+            sections.append(('I', count))
+        values = []
+        for typecode, size in sections:
+            section = array(typecode)
+            end = offset + size * section.itemsize
+            if len(buf) < end:
+                raise ValueError('color index file is truncated')
+            section.frombytes(buf[offset:end])
+            values.append(section)
+            offset = end
+        labs, positions, keys = values
+        if kind == cls._str_keys:
+            if len(buf) < offset + sum(keys):
+                raise ValueError('color index file is truncated')
+            lengths, keys = keys, []
+            for length in lengths:
+                keys.append(buf[offset:offset + length].decode('utf-8'))
+                offset += length
+        self = cls.__new__(cls)
+        self._attach(
+            list(keys), list(positions),
+            list(zip(labs[0::3], labs[1::3], labs[2::3])))
+        return self
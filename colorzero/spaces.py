@@ -0,0 +1,244 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines the :class:`ColorSpace` class, and a registry of the common RGB
+working spaces, for conversion of colors between them.
+"""
+
+from math import copysign
+from functools import lru_cache
+
+from . import conversions as cv, matrix
+from .types import RGB, XYZ
+from .arrays import RGBArray
+
+
+# Transfer functions #########################################################
+
+def _gamma(gamma):
+    # Return the (decode, encode) pair of a simple power law transfer function;
+    # negative (out of gamut) values are mirrored
+    def decode(c):
+        return copysign(abs(c) ** gamma, c)
+
+    def encode(c):
+        return copysign(abs(c) ** (1 / gamma), c)
+    return decode, encode
+
+
+# Constants of the BT.2020 transfer function (at 12-bit precision)
+_REC2020_ALPHA = 1.09929682680944
+_REC2020_BETA = 0.018053968510807
+
+
+def _rec2020_decode(c):
+    if abs(c) < _REC2020_BETA * 4.5:
+        return c / 4.5
+    return copysign(
+        ((abs(c) + _REC2020_ALPHA - 1) / _REC2020_ALPHA) ** (1 / 0.45), c)
+
+
+def _rec2020_encode(c):
+    if abs(c) < _REC2020_BETA:
+        return 4.5 * c
+    return copysign(
+        _REC2020_ALPHA * abs(c) ** 0.45 - (_REC2020_ALPHA - 1), c)
+
+
+# Color spaces ###############################################################
+
+class ColorSpace:
+    """
+    Represents an RGB working space, defined by the chromaticities of its red,
+    green, and blue *primaries* (a 3-tuple of (x, y) tuples), its *white*
+    point (an (X, Y, Z) tuple, or the name of one of the standard illuminants
+    accepted by :meth:`Color.to_xyz <colorzero.Color.to_xyz>`), and its
+    transfer function, given as the *decode* function converting a
+    (non-linear) component of the space to linear light, and the *encode*
+    function performing the reverse.
+
+    The matrices converting linear components of the space to CIE XYZ (and
+    back) are derived from the primaries and white point once, on
+    construction. As with :class:`~colorzero.Color`, the components of colors
+    converted to or from the space are the encoded (non-linear) values.
+
+    .. versionadded:: 2.1
+    """
+    __slots__ = (
+        'name', 'primaries', 'white', 'decode', 'encode', 'to_xyz_matrix',
+        'from_xyz_matrix')
+
+    def __init__(self, name, primaries, white, decode, encode):
+        self.name = name
+        self.primaries = tuple(tuple(p) for p in primaries)
+        self.white = cv.white_point(white)
+        self.decode = decode
+        self.encode = encode
+        # The XYZ of each primary (with Y=1) scaled so that they sum to the
+        # white point
+        m = tuple(zip(*(
+            (x / y, 1.0, (1 - x - y) / y) for x, y in self.primaries)))
+        scale = matrix.mult(matrix.inverse(m), *self.white)
+        self.to_xyz_matrix = matrix.product(m, matrix.diagonal(*scale))
+        self.from_xyz_matrix = matrix.inverse(self.to_xyz_matrix)
+
+    def __repr__(self):
+        return '<ColorSpace name={!r}>'.format(self.name)
+
+    def rgb_to_xyz(self, r, g, b):
+        """
+        Convert the (encoded) *r*, *g*, *b* components of a color in this
+        space to CIE XYZ relative to the space's white point.
+        """
+        decode = self.decode
+        return XYZ._make(matrix.mult(
+            self.to_xyz_matrix, decode(r), decode(g), decode(b)))
+
+    def xyz_to_rgb(self, x, y, z):
+        """
+        Convert CIE XYZ, relative to the space's white point, to the (encoded)
+        components of the color in this space. The result is not clamped, so
+        colors outside the gamut of the space will have components outside
+        the range 0.0 to 1.0.
+        """
+        encode = self.encode
+        r, g, b = matrix.mult(self.from_xyz_matrix, x, y, z)
+        return RGB(encode(r), encode(g), encode(b))
+
+
+#: The sRGB space (IEC 61966-2-1) used by :class:`~colorzero.Color`
+SRGB = ColorSpace(
+    'srgb', ((0.64, 0.33), (0.30, 0.60), (0.15, 0.06)), cv.D65,
+    cv.from_srgb, cv.to_srgb)
+#: The Display P3 space, with the DCI-P3 primaries and the sRGB transfer
+#: function and white point
+DISPLAY_P3 = ColorSpace(
+    'display-p3', ((0.680, 0.320), (0.265, 0.690), (0.150, 0.060)), cv.D65,
+    cv.from_srgb, cv.to_srgb)
+#: The Adobe RGB (1998) space
+ADOBE_RGB = ColorSpace(
+    'adobe-rgb', ((0.64, 0.33), (0.21, 0.71), (0.15, 0.06)), cv.D65,
+    *_gamma(563 / 256))
+#: The ITU-R BT.2020 space used by ultra high definition video
+REC2020 = ColorSpace(
+    'rec2020', ((0.708, 0.292), (0.170, 0.797), (0.131, 0.046)), cv.D65,
+    _rec2020_decode, _rec2020_encode)
+
+_spaces = {
+    space.name: space
+    for space in (SRGB, DISPLAY_P3, ADOBE_RGB, REC2020)
+}
+
+def register(space):
+    """
+    Add the :class:`ColorSpace` *space* to the registry so that it may be
+    referred to by its name in subsequent conversions, replacing any space
+    already registered under that name.
+
+    .. versionadded:: 2.1
+    """
+    if not isinstance(space, ColorSpace):
+        raise TypeError('space must be a ColorSpace')
+    _spaces[space.name] = space
+    # The replaced space may have fused conversions cached
+    _conversion_matrix.cache_clear()
+
+
+def get(name):
+    """
+    Return the :class:`ColorSpace` registered as *name*. The spaces registered
+    by default are "srgb" (the space of :class:`~colorzero.Color`),
+    "display-p3", "adobe-rgb", and "rec2020". If *name* is a
+    :class:`ColorSpace` it is returned as is.
+
+    .. versionadded:: 2.1
+    """
+    if isinstance(name, ColorSpace):
+        return name
+    try:
+        return _spaces[name]
+    except (KeyError, TypeError):
+        raise ValueError('unknown color space: {!r}'.format(name)) from None
+
+
+def conversion_matrix(source, target):
+    """
+    Return the matrix converting linear components of colors in the *source*
+    space to linear components in the *target* space (each a
+    :class:`ColorSpace` or the name of a registered one). This is the product
+    of the source's matrix to CIE XYZ, the Bradford adaptation between the
+    white points of the spaces (if they differ), and the target's matrix from
+    CIE XYZ. The result is calculated once for each pair of spaces and cached.
+
+    .. versionadded:: 2.1
+    """
+    return _conversion_matrix(get(source), get(target))
+
+
+# The fused matrices of the most recently used (source, target) pairs of
+# spaces are cached; the cache is bounded so that ad-hoc spaces passed to
+# conversions are not kept alive indefinitely
+@lru_cache(maxsize=64)
+def _conversion_matrix(source, target):
+    if source.white == target.white:
+        return matrix.product(target.from_xyz_matrix, source.to_xyz_matrix)
+    return matrix.product(
+        target.from_xyz_matrix,
+        cv.adaptation_matrix(source.white, target.white),
+        source.to_xyz_matrix)
+
+
+def convert(r, g, b, source, target='srgb'):
+    """
+    Convert the (encoded) *r*, *g*, *b* components of a color in the *source*
+    space to the *target* space (which defaults to "srgb", so the result may
+    be passed to :meth:`Color.from_rgb <colorzero.Color.from_rgb>`). For
+    example::
+
+        >>> from colorzero import Color, spaces
+        >>> spaces.convert(*Color('red'), 'srgb', 'display-p3')
+        RGB(r=0.917501, g=0.200306, b=0.138591)
+
+    The conversion decodes the components, multiplies them by the fused
+    :func:`conversion_matrix`, and encodes the result. The result is not
+    clamped, so colors outside the gamut of *target* will have components
+    outside the range 0.0 to 1.0.
+
+    .. versionadded:: 2.1
+    """
+    source = get(source)
+    target = get(target)
+    decode = source.decode
+    encode = target.encode
+    r, g, b = matrix.mult(
+        conversion_matrix(source, target), decode(r), decode(g), decode(b))
+    return RGB(encode(r), encode(g), encode(b))
+
+
+def convert_columns(r, g, b, source, target='srgb'):
+    """
+    Convert columns of (encoded) *r*, *g*, *b* components of colors in the
+    *source* space to an :class:`~colorzero.arrays.RGBArray` of components in
+    the *target* space, as :func:`convert` does for individual colors. The
+    columns of a :class:`~colorzero.arrays.ColorArray` may be passed
+    directly; the result may be passed to
+    :meth:`ColorArray.from_rgb <colorzero.arrays.ColorArray.from_rgb>`.
+
+    .. versionadded:: 2.1
+    """
+    source = get(source)
+    target = get(target)
+    decode = source.decode
+    encode = target.encode
+    return RGBArray._from_lists(*(
+        list(map(encode, col))
+        for col in matrix.mult_columns(
+            conversion_matrix(source, target),
+            *(list(map(decode, col)) for col in (r, g, b)))))
+
@@ -14,6 +14,7 @@ from collections import namedtuple
 from collections.abc import Mapping, MutableMapping
 
 from .color import Color, Default
+from .term import term_colors
 
 
 class Style(namedtuple('Style', ('fg', 'bg'))):
@@ -236,6 +237,9 @@ class TermStyles(BaseStyles):
     * "16m" - indicating the terminal supports ~16 million colors via `24-bit
       color ANSI codes`_
 
+    If you do not know the capabilities of the terminal in advance, use
+    :func:`auto_styles` to construct an appropriately configured instance.
+
     .. _ANSI escape codes: https://en.wikipedia.org/wiki/ANSI_escape_code
     .. _8-bit color ANSI codes: https://en.wikipedia.org/wiki/ANSI_escape_code#8-bit
     .. _24-bit color ANSI codes: https://en.wikipedia.org/wiki/ANSI_escape_code#24-bit
@@ -263,3 +267,32 @@ class TermStyles(BaseStyles):
                 '{new_state.fg:f{self.term_colors}}'
                 '{new_state.bg:b{self.term_colors}}'.format(
                 new_state=new_state, self=self))
+
+
+def auto_styles(styles=None, *, stream=None, **kwargs):
+    """
+    Construct a stylesheet suitable for output to *stream* (which defaults to
+    :data:`sys.stdout`). The *styles* and any keyword arguments are passed to
+    the constructor of the selected stylesheet class.
+
+    The capabilities of the terminal are determined by :func:`term_colors`. If
+    *stream* is not a terminal (e.g. output is being redirected to a file or a
+    pipe), or color output has been disabled, a :class:`StripStyles` instance
+    is returned so no escape sequences are emitted at all. Otherwise, a
+    :class:`TermStyles` instance is returned with *term_colors* set to the
+    richest type the terminal supports. Where "16m" is supported, colors are
+    output directly, avoiding any search for the nearest palette entry. For
+    example::
+
+        >>> import io
+        >>> auto_styles(warn='red', stream=io.StringIO())
+        StripStyles({'warn': Style(fg=<Color html='#ff0000' rgb=(1, 0, 0)>,
+        bg=<Color Default>)})
+
+    .. versionadded:: 2.1
+    """
+    colors = term_colors(stream)
+    if colors is None:
+        return StripStyles(styles, **kwargs)
+    else:
+        return TermStyles(styles, term_colors=colors, **kwargs)
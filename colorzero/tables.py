@@ -14,6 +14,8 @@ XTerm colors (for :func:`format` output).
 .. _CSS Color Module: http://www.w3.org/TR/css3-color/#svg-color
 """
 
+import sys
+
 
 def _transpose(table):
     # Swap keys and values in a dict, but in the case of duplicated keys, use
@@ -24,7 +26,9 @@ def _transpose(table):
     return result
 
 
-DOS_FORE_COLORS = _transpose({
+# The tables mapping RGB888 values to color indexes are constructed from these
+# on first use (see __getattr__ below)
+_DOS_INDEXES = {
 #    Bold,  Index: (R,   G,   B),
     (False, 0):    (0,   0,   0),
     (False, 1):    (128, 0,   0),
@@ -42,16 +46,10 @@ DOS_FORE_COLORS = _transpose({
     (True,  5):    (255, 0,   255),
     (True,  6):    (0,   255, 255),
     (True,  7):    (255, 255, 255),
-})
-
-DOS_BACK_COLORS = {
-    RGB: (bold, index)
-    for RGB, (bold, index) in DOS_FORE_COLORS.items()
-    if not bold
 }
 
 
-XTERM_COLORS = _transpose({
+_XTERM_INDEXES = {
 # Index: (R,   G,   B)
     0:   (0,   0,   0),
     1:   (128, 0,   0),
@@ -309,7 +307,44 @@ XTERM_COLORS = _transpose({
     253: (218, 218, 218),
     254: (228, 228, 228),
     255: (238, 238, 238),
-})
+}
+
+
+def _dos_fore_colors():
+    return _transpose(_DOS_INDEXES)
+
+
+def _dos_back_colors():
+    return {
+        RGB: (bold, index)
+        for RGB, (bold, index) in _transpose(_DOS_INDEXES).items()
+        if not bold
+    }
+
+
+def _xterm_colors():
+    return _transpose(_XTERM_INDEXES)
+
+
+_deferred = {
+    'DOS_FORE_COLORS': _dos_fore_colors,
+    'DOS_BACK_COLORS': _dos_back_colors,
+    'XTERM_COLORS':    _xterm_colors,
+}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        try:
+            build = _deferred[name]
+        except KeyError:
+            raise AttributeError(
+                'module {!r} has no attribute {!r}'.format(__name__, name)
+            ) from None
+        value = globals()[name] = build()
+        return value
+else:  # pragma: no cover
+    # Module __getattr__ (PEP 562) is unavailable; construct tables eagerly
+    globals().update((name, build()) for name, build in _deferred.items())
 
 
 NAMED_COLORS = {
@@ -0,0 +1,72 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Defines the routines used to detect the capabilities of the terminal."
+
+import os
+import sys
+
+
+# Detection results keyed by file-descriptor. The environment and the
+# terminal attached to a descriptor are not expected to change during the
+# lifetime of a process, so each descriptor is only ever examined once
+_cache = {}
+
+
+def term_colors(stream=None):
+    """
+    Returns the type of color codes supported by the terminal attached to
+    *stream* (which defaults to :data:`sys.stdout`). The result is one of the
+    terminal types accepted by :class:`TermStyles` ("8", "256", or "16m"), or
+    :data:`None` if *stream* is not a terminal, or color output has been
+    disabled (via the `NO_COLOR`_ environment variable, or a "dumb" terminal).
+
+    The detection considers the ``NO_COLOR``, ``TERM``, and ``COLORTERM``
+    environment variables, and whether *stream* is a TTY. As these are not
+    expected to change for the lifetime of a process, the result is cached
+    against the file-descriptor of *stream*; subsequent calls are effectively
+    free.
+
+    .. _NO_COLOR: https://no-color.org/
+
+    .. versionadded:: 2.1
+    """
+    if stream is None:
+        stream = sys.stdout
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Streams with no underlying descriptor (io.StringIO, closed files,
+        # etc.) cannot be terminals
+        return None
+    try:
+        return _cache[fd]
+    except KeyError:
+        result = _cache[fd] = _detect(stream, os.environ)
+        return result
+
+
+def _detect(stream, env):
+    if env.get('NO_COLOR'):
+        return None
+    try:
+        if not stream.isatty():
+            return None
+    except (AttributeError, OSError, ValueError):
+        return None
+    term = env.get('TERM', '')
+    if term in ('', 'dumb'):
+        return None
+    if (
+            env.get('COLORTERM', '').lower() in ('truecolor', '24bit') or
+            term.endswith('-direct')):
+        return '16m'
+    elif '256color' in term:
+        return '256'
+    else:
+        return '8'
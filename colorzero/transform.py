@@ -0,0 +1,150 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Defines the :class:`Transform` class, a reusable chain of the manipulations
+in :mod:`colorzero.attr`.
+"""
+
+import operator
+
+from . import conversions as cv, types, attr
+from .color import Color
+from .arrays import _plan, _transform
+
+
+_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+}
+
+
+class Transform:
+    """
+    Records a chain of manipulations of colors which can later be applied to
+    a single :class:`Color`, or to many colors at once.
+
+    A transform is constructed with the same arithmetic that
+    :class:`Color` supports, starting from an empty transform. For example,
+    the following are equivalent::
+
+        >>> from colorzero import *
+        >>> t = (Transform() + Hue(deg=30)) * Saturation(0.5) - Luma(0.1)
+        >>> t(Color('wheat'))
+        <Color html='#c6cbaa' rgb=(0.776471, 0.796078, 0.666667)>
+        >>> (Color('wheat') + Hue(deg=30)) * Saturation(0.5) - Luma(0.1)
+        <Color html='#c6cbaa' rgb=(0.776471, 0.796078, 0.666667)>
+
+    Alternatively, the *operations* may be given as 2-tuples of an operator
+    ("+", "-", or "*") and an operand, as accepted by
+    :func:`colorzero.arrays.transform`. Transforms are immutable; arithmetic
+    returns a new transform with the operation appended.
+
+    When the transform is constructed, consecutive operations which apply in
+    the same color system are grouped so that each group converts colors
+    into (and out of) that system once, rather than once per operation; the
+    example above converts to HLS once, rather than twice, and allocates no
+    intermediate :class:`Color` instances. As with
+    :func:`colorzero.arrays.transform`, the result of grouped operations is
+    not clamped to the RGB gamut between steps.
+
+    Calling the transform with a :class:`Color` returns the transformed
+    :class:`Color`. Calling it with a :class:`~colorzero.arrays.ColorArray`
+    (or anything :class:`~colorzero.arrays.ColorArray` accepts, like a list of
+    colors) returns a new :class:`~colorzero.arrays.ColorArray`, which is
+    considerably quicker for large numbers of colors.
+
+    .. versionadded:: 2.1
+    """
+    __slots__ = ('_operations', '_runs')
+
+    def __init__(self, *operations):
+        self._runs = _plan(operations)
+        self._operations = tuple(operations)
+
+    def __repr__(self):
+        return 'Transform({})'.format(
+            ', '.join(repr(operation) for operation in self._operations))
+
+    def __eq__(self, other):
+        if isinstance(other, Transform):
+            return self._operations == other._operations
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._operations)
+
+    def __len__(self):
+        return len(self._operations)
+
+    @property
+    def operations(self):
+        """
+        A tuple of the operations in the transform, as (operator, operand)
+        2-tuples.
+        """
+        return self._operations
+
+    def _append(self, op, other):
+        try:
+            return Transform(*self._operations + ((op, other),))
+        except ValueError:
+            return NotImplemented
+
+    def __add__(self, other):
+        return self._append('+', other)
+
+    def __sub__(self, other):
+        return self._append('-', other)
+
+    def __mul__(self, other):
+        return self._append('*', other)
+
+    # Addition and multiplication are commutative
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def __call__(self, colors):
+        if isinstance(colors, Color):
+            return self._apply(colors)
+        return _transform(colors, self._runs)
+
+    def _apply(self, color):
+        r, g, b = color
+        for system, ops in self._runs:
+            if system == 'rgb':
+                for op, value in ops:
+                    op = _OPERATORS[op]
+                    if isinstance(value, types.RGB):
+                        r = cv.clamp_float(op(r, value[0]))
+                        g = cv.clamp_float(op(g, value[1]))
+                        b = cv.clamp_float(op(b, value[2]))
+                    elif isinstance(value, attr.Red):
+                        r = cv.clamp_float(op(r, value))
+                    elif isinstance(value, attr.Green):
+                        g = cv.clamp_float(op(g, value))
+                    else:
+                        b = cv.clamp_float(op(b, value))
+            elif system == 'hls':
+                h, l, s = cv.rgb_to_hls(r, g, b)
+                for op, value in ops:
+                    op = _OPERATORS[op]
+                    if isinstance(value, attr.Hue):
+                        h = op(h % 1.0, value)
+                    elif isinstance(value, attr.Lightness):
+                        l = op(l, value)
+                    else:
+                        s = op(s, value)
+                r, g, b = (cv.clamp_float(v) for v in cv.hls_to_rgb(h, l, s))
+            else:
+                y, u, v = cv.rgb_to_yuv(r, g, b)
+                for op, value in ops:
+                    y = _OPERATORS[op](y, value)
+                r, g, b = cv.yuv_to_rgb(y, u, v)
+        return Color.from_rgb(r, g, b)
@@ -320,3 +320,6 @@ YIQ = namedtuple('YIQ', ('y', 'i', 'q'))
 XYZ = namedtuple('XYZ', ('x', 'y', 'z'))
 Luv = namedtuple('Luv', ('l', 'u', 'v'))
 Lab = namedtuple('Lab', ('l', 'a', 'b'))
+LCh = namedtuple('LCh', ('l', 'c', 'h'))
+OkLab = namedtuple('OkLab', ('l', 'a', 'b'))
+OkLCh = namedtuple('OkLCh', ('l', 'c', 'h'))
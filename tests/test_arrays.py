@@ -0,0 +1,239 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.arrays module"
+
+import colorsys
+import random
+from array import array
+from math import isclose
+
+import pytest
+
+from colorzero import *
+from colorzero import arrays, conversions as cv
+from colorzero.arrays import *
+
+
+@pytest.fixture()
+def colors(request):
+    return [
+        Color.from_rgb_bytes(r, g, b)
+        for r in range(0, 256, 51)
+        for g in range(0, 256, 85)
+        for b in range(0, 256, 63)
+    ]
+
+
+def test_array_init():
+    a = HLSArray([0, 0.5], [0.5, 0.5], [1, 1])
+    assert len(a) == 2
+    assert repr(a) == '<HLSArray len=2>'
+    assert a[1] == HLS(0.5, 0.5, 1)
+    assert isinstance(a[1], HLS)
+    assert list(a) == [HLS(0, 0.5, 1), HLS(0.5, 0.5, 1)]
+    assert a.h.tolist() == a.hue.tolist() == [0, 0.5]
+    assert a.s.tolist() == a.saturation.tolist() == [1, 1]
+    assert [col.format for col in a.columns] == ['d', 'd', 'd']
+    assert CMYKArray(b'\x00', b'\x01', b'\x00', b'\x01')[0] == (0, 1, 0, 1)
+    with pytest.raises(ValueError):
+        HLSArray([0], [0])
+    with pytest.raises(ValueError):
+        HLSArray([0], [0], [0, 1])
+    with pytest.raises(ValueError):
+        HLSArray(memoryview(bytes(4)).cast('B', (2, 2)), [0, 1], [0, 1])
+
+
+def test_array_zero_copy():
+    h = array('d', [0.0, 0.25, 0.5, 0.75])
+    a = HLSArray(h, [0.5] * 4, [1] * 4)
+    b = a[1:3]
+    assert isinstance(b, HLSArray)
+    assert len(b) == 2
+    h[1] = 0.125
+    assert a[1].h == 0.125
+    assert b[0].h == 0.125
+    assert b.h.obj is h
+
+
+def test_color_array_init(colors):
+    a = ColorArray(colors)
+    assert len(a) == len(colors)
+    assert list(a) == colors
+    assert isinstance(a[0], Color)
+    assert isinstance(a[:2], ColorArray)
+    assert ColorArray(a.r, a.g, a.b).r.obj is a.r.obj
+    assert list(ColorArray(a.rgb)) == colors
+    assert list(ColorArray.from_rgb_bytes(a.rgb_bytes)) == colors
+    assert list(ColorArray.from_rgb([-1, 2], [0.5, 0.5], [0, 1])) == [
+        Color(0, 0.5, 0), Color(1, 0.5, 1)]
+    assert len(ColorArray([])) == 0
+    with pytest.raises(ValueError):
+        ColorArray([(0, 0, 0), (1, 1)])
+    with pytest.raises(ValueError):
+        ColorArray.from_rgb_bytes(b'\x00\x00')
+
+
+@pytest.mark.parametrize('name', [
+    'yuv', 'yiq', 'hls', 'hsv', 'cmy', 'cmyk', 'xyz', 'lab', 'lch', 'luv',
+    'oklab', 'oklch'])
+def test_color_array_conversions(colors, name):
+    a = ColorArray(colors)
+    converted = getattr(a, name)
+    assert len(converted) == len(colors)
+    for value, color in zip(converted, colors):
+        assert type(value) is type(getattr(color, name))
+        for elem1, elem2 in zip(value, getattr(color, name)):
+            assert isclose(elem1, elem2, abs_tol=1e-12)
+    from_method = getattr(Color, 'from_' + name)
+    for color, value in zip(ColorArray(converted), converted):
+        for elem1, elem2 in zip(color, from_method(*value)):
+            assert isclose(elem1, elem2, abs_tol=1e-12)
+
+
+def test_color_array_yuv_standards(colors):
+    a = ColorArray(colors)
+    assert list(a.to_yuv()) == list(a.yuv)
+    for standard in ('bt601', 'bt709', 'smpte240m'):
+        converted = a.to_yuv(standard)
+        for value, color in zip(converted, colors):
+            assert value == color.to_yuv(standard)
+        for color1, color2 in zip(
+                ColorArray.from_yuv(*converted.columns, standard=standard),
+                colors):
+            for elem1, elem2 in zip(color1, color2):
+                assert isclose(elem1, elem2, abs_tol=1e-12)
+    with pytest.raises(ValueError):
+        a.to_yuv('foo')
+
+
+def test_color_array_white_points(colors):
+    a = ColorArray(colors)
+    for name in ('xyz', 'lab', 'luv'):
+        to_method = 'to_' + name
+        from_method = 'from_' + name
+        assert list(getattr(a, to_method)()) == list(getattr(a, name))
+        for white in ('d50', 'f2'):
+            converted = getattr(a, to_method)(white)
+            for value, color in zip(converted, colors):
+                for elem1, elem2 in zip(
+                        value, getattr(color, to_method)(white)):
+                    assert isclose(elem1, elem2, abs_tol=1e-12)
+            for color, value in zip(
+                    getattr(ColorArray, from_method)(
+                        *converted.columns, white=white), converted):
+                for elem1, elem2 in zip(color, getattr(Color, from_method)(
+                        *value, white=white)):
+                    assert isclose(elem1, elem2, abs_tol=1e-12)
+
+
+def test_gamut_map():
+    rnd = random.Random(1)
+    lch = [
+        (rnd.uniform(-5, 105), rnd.uniform(0, 150), rnd.uniform(0, 360))
+        for i in range(200)]
+    columns = LChArray(*zip(*lch)).columns
+    for gamut in ('clip', 'lch', 'oklch'):
+        mapped = ColorArray.from_lch(*columns, gamut=gamut)
+        assert list(mapped) == [
+            Color.from_lch(*value, gamut=gamut) for value in lch]
+        oklab = mapped.oklab
+        assert list(ColorArray.from_oklab(*oklab.columns, gamut=gamut)) == [
+            Color.from_oklab(*value, gamut=gamut) for value in oklab]
+    xyz = [cv.lab_to_xyz(*cv.lch_to_lab(*value)) for value in lch]
+    luv = [cv.xyz_to_luv(*value) for value in xyz]
+    yuv = [(y, u * 2, v * 2) for y, u, v in ColorArray(mapped).yuv]
+    for name, values in (('xyz', xyz), ('luv', luv), ('yuv', yuv)):
+        method = 'from_' + name
+        for gamut in ('clip', 'lch', 'oklch'):
+            assert list(getattr(ColorArray, method)(
+                *zip(*values), gamut=gamut)) == [
+                    getattr(Color, method)(*value, gamut=gamut)
+                    for value in values]
+    with pytest.raises(ValueError):
+        gamut_map([2.0], [0.0], [0.0], 'foo')
+
+
+def test_luv_black():
+    assert list(luv_to_xyz([0], [0], [0])) == [XYZ(0, 0, 0)]
+    assert list(xyz_to_luv([0], [0], [0])) == [Luv(0, 0, 0)]
+
+
+@pytest.mark.parametrize('name', [
+    'rgb_to_hls', 'hls_to_rgb', 'rgb_to_hsv', 'hsv_to_rgb'])
+def test_colorsys_compatible(name):
+    rand = random.Random(1)
+    columns = [
+        [rand.uniform(-0.5, 1.5) for i in range(2000)] +
+        [rand.randrange(256) / 255 for i in range(2000)] +
+        [0.0, 0.5, 1.0, 0.5, 0.5, 0.0]
+        for col in range(3)
+    ]
+    # Include some greys and zero saturations
+    columns[1][-3:] = columns[2][-3:] = [0.0, 0.5, 1.0]
+    expected = list(map(getattr(colorsys, name), *columns))
+    assert [tuple(t) for t in getattr(arrays, name)(*columns)] == expected
+
+
+@pytest.mark.parametrize('value', [
+    Red(0.3), Green(0.5), Blue(0.9), RGB(0.5, 0.2, 0.9), Color('#336699'),
+    Hue(deg=30), Hue(0.9), Lightness(0.2), Saturation(0.5), Luma(0.1)])
+def test_color_array_arithmetic(colors, value):
+    a = ColorArray(colors)
+    for result, expected in (
+            (a + value, [c + value for c in colors]),
+            (a - value, [c - value for c in colors]),
+            (a * value, [c * value for c in colors])):
+        assert isinstance(result, ColorArray)
+        for color1, color2 in zip(result, expected):
+            for elem1, elem2 in zip(color1, color2):
+                assert isclose(elem1, elem2, abs_tol=1e-12)
+    assert list(value + a) == list(a + value)
+    assert list(value * a) == list(a * value)
+
+
+@pytest.mark.parametrize('value', [
+    Red(0.3), Green(0.5), Blue(0.9), Red(1), Blue(0)])
+def test_color_array_reflected_sub(colors, value):
+    a = ColorArray(colors)
+    result = value - a
+    assert isinstance(result, ColorArray)
+    assert list(result) == [value - c for c in colors]
+    assert list(value - ColorArray([])) == []
+
+
+def test_color_array_arithmetic_invalid(colors):
+    a = ColorArray(colors)
+    with pytest.raises(TypeError):
+        a + 1
+    with pytest.raises(TypeError):
+        a - 'foo'
+    with pytest.raises(TypeError):
+        Hue(0.5) - a
+
+
+def test_transform(colors):
+    operations = [
+        ('+', Hue(deg=30)), ('*', Saturation(0.5)), ('-', Lightness(0.1)),
+        ('*', Luma(0.9)), ('+', Red(0.1)), ('-', Hue(deg=60))]
+    result = transform(colors, *operations)
+    assert len(result) == len(colors)
+    for color1, color in zip(result, colors):
+        for op, value in operations:
+            color = {
+                '+': lambda a, b: a + b,
+                '-': lambda a, b: a - b,
+                '*': lambda a, b: a * b,
+            }[op](color, value)
+        for elem1, elem2 in zip(color1, color):
+            assert isclose(elem1, elem2, abs_tol=1e-12)
+    assert list(transform(colors)) == colors
+    with pytest.raises(ValueError):
+        transform(colors, ('/', Hue(0.5)))
+    with pytest.raises(ValueError):
+        transform(colors, ('+', 0.5))
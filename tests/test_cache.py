@@ -0,0 +1,139 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.cache module"
+
+import os
+
+import pytest
+
+from colorzero import cache
+from colorzero.palette import Palette
+
+
+@pytest.fixture()
+def cache_path(request, tmp_path, monkeypatch):
+    path = tmp_path / 'cache'
+    monkeypatch.setenv('COLORZERO_CACHE', str(path))
+    yield path
+
+
+class Builder:
+    def __init__(self, data):
+        self.data = data
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.data
+
+
+def test_cache_dir(monkeypatch):
+    monkeypatch.setenv('COLORZERO_CACHE', '/foo/bar')
+    assert cache.cache_dir() == '/foo/bar'
+    monkeypatch.delenv('COLORZERO_CACHE')
+    monkeypatch.setenv('XDG_CACHE_HOME', '/foo')
+    assert cache.cache_dir() == os.path.join('/foo', 'colorzero')
+    monkeypatch.setenv('XDG_CACHE_HOME', 'relative')
+    monkeypatch.setenv('HOME', '/home/foo')
+    assert cache.cache_dir() == os.path.join(
+        '/home/foo', '.cache', 'colorzero')
+    monkeypatch.delenv('XDG_CACHE_HOME')
+    assert cache.cache_dir() == os.path.join(
+        '/home/foo', '.cache', 'colorzero')
+
+
+def test_cache_table(cache_path):
+    build = Builder(bytes(range(256)))
+    table = cache.table('test', 1, build)
+    assert table.readonly
+    assert table == bytes(range(256))
+    assert build.calls == 1
+    assert [p.name for p in cache_path.iterdir()] == ['test.table']
+    table = cache.table('test', 1, build)
+    assert table == bytes(range(256))
+    assert build.calls == 1
+    # A different version causes a rebuild
+    build.data = b'foo'
+    assert cache.table('test', 2, build) == b'foo'
+    assert build.calls == 2
+    with pytest.raises(ValueError):
+        cache.table('test', -1, build)
+    with pytest.raises(ValueError):
+        cache.table('test', 65536, build)
+
+
+def test_cache_table_corrupt(cache_path):
+    build = Builder(b'foo bar baz')
+    cache.table('test', 1, build)
+    path = cache_path / 'test.table'
+    data = path.read_bytes()
+    for corrupt in (
+            b'', data[:8], data[:-1], b'ABCD' + data[4:],
+            data[:4] + b'\xff\xff' + data[6:]):
+        path.write_bytes(corrupt)
+        calls = build.calls
+        assert cache.table('test', 1, build) == b'foo bar baz'
+        assert build.calls == calls + 1
+        assert path.read_bytes() == data
+    # Corruption of the payload alone is only detected when the checksum is
+    # verified
+    path.write_bytes(data[:-1] + b'Z')
+    calls = build.calls
+    assert cache.table('test', 1, build) == b'foo bar baZ'
+    assert build.calls == calls
+    assert cache.table('test', 1, build, verify=True) == b'foo bar baz'
+    assert build.calls == calls + 1
+    assert path.read_bytes() == data
+
+
+def test_cache_table_unwritable(tmp_path, monkeypatch):
+    (tmp_path / 'file').write_bytes(b'')
+    monkeypatch.setenv('COLORZERO_CACHE', str(tmp_path / 'file' / 'cache'))
+    build = Builder(bytearray(b'foo'))
+    table = cache.table('test', 1, build)
+    assert table == b'foo'
+    assert table.readonly
+    assert build.calls == 1
+
+
+def test_cache_clear(cache_path):
+    cache.clear()
+    cache.table('foo', 1, Builder(b'foo'))
+    cache.table('bar', 1, Builder(b'bar'))
+    (cache_path / 'other').write_bytes(b'')
+    cache.clear()
+    assert [p.name for p in cache_path.iterdir()] == ['other']
+
+
+def test_cache_palette_lut(cache_path):
+    with Palette({0: 'black', 1: 'white'}) as p:
+        p.build_lut(cached=True)
+        assert p.lut[0x7F7F7F] == 0
+        assert p.lut[0x808080] == 1
+        assert len(list(cache_path.iterdir())) == 1
+    with Palette({0: 'black', 1: 'white'}) as p:
+        p.build_lut(cached=True)
+        assert p.lut[0x808080] == 1
+        assert len(list(cache_path.iterdir())) == 1
+    with Palette({0: 'black', 1: 'red'}) as p:
+        p.build_lut(cached=True)
+        assert p.lut[0x0000FF] == 1
+        assert len(list(cache_path.iterdir())) == 2
+
+
+def test_cache_palette_lut_version(cache_path, monkeypatch):
+    # Cached tables from a different version of _build_lut are rebuilt
+    with Palette({0: 'black', 1: 'white'}) as p:
+        p.build_lut(cached=True)
+        path, = cache_path.iterdir()
+        data = path.read_bytes()
+        monkeypatch.setattr(Palette, '_lut_version', Palette._lut_version + 1)
+        p.build_lut(cached=True)
+        assert path.read_bytes() != data
+        assert p.lut[0x808080] == 1
@@ -13,6 +13,7 @@ from math import sqrt, isclose
 import pytest
 
 from colorzero import *
+from colorzero import term, conversions as cv
 
 
 def verify_color(color1, color2, abs_tol=1e-7):
@@ -57,6 +58,22 @@ def test_color_new():
         Color(0.1)
 
 
+def test_color_new_tuples():
+    # Every type from colorzero.types round-trips through the constructor,
+    # as do user-defined named tuples (via their fields)
+    from collections import namedtuple
+    c = Color('#c08040')
+    for attr in ('rgb', 'yuv', 'yiq', 'hls', 'hsv', 'xyz', 'lab', 'luv', 'cmy',
+                 'cmyk'):
+        verify_color(Color(getattr(c, attr)), c)
+    assert type(Color(c)) is Color
+    verify_color(Color(c), c)
+    verify_color(Color(RGB(255, 0, 0)), (1.0, 0.0, 0.0))
+    verify_color(Color(YUV(235, 128, 128)), (1.0, 1.0, 1.0))
+    HSL = namedtuple('HSL', ('hue', 'saturation', 'lightness'))
+    verify_color(Color(HSL(0, 1, 0.5)), (1.0, 0.0, 0.0))
+
+
 def test_color_from_rgb():
     verify_color(Color.from_rgb(0, 0, 0), (0.0, 0.0, 0.0))
     verify_color(Color.from_rgb(1, 1, 1), (1.0, 1.0, 1.0))
@@ -118,6 +135,31 @@ def test_color_from_lab():
                  abs_tol=1e-4)
 
 
+def test_color_from_gamut():
+    for method in ('from_lab', 'from_lch', 'from_luv', 'from_xyz'):
+        value = getattr(Color('red'), method[5:])
+        assert getattr(Color, method)(*value, gamut='lch') == (
+            getattr(Color, method)(*value))
+    color = Color.from_lch(60, 120, 140)
+    assert color == Color.from_lch(60, 120, 140, gamut='clip')
+    assert color.lch.l > 62
+    color = Color.from_lch(60, 120, 140, gamut='lch')
+    verify_color(color.lch, (60, 79.6, 140), abs_tol=0.1)
+    color = Color.from_lab(*cv.lch_to_lab(60, 120, 140), gamut='lch')
+    verify_color(color.lch, (60, 79.6, 140), abs_tol=0.1)
+    color = Color.from_oklch(0.7, 0.4, 140, gamut='oklch')
+    verify_color(color.oklch, (0.7, 0.2, 140), abs_tol=0.05)
+    assert Color.from_oklch(0.7, 0.4, 140, gamut='oklch') == (
+        Color.from_oklab(*cv.oklch_to_oklab(0.7, 0.4, 140), gamut='oklch'))
+    y, u, v = Color('red').yuv
+    assert Color.from_yuv(y, u * 1.5, v * 1.5, gamut='lch') != (
+        Color.from_yuv(y, u * 1.5, v * 1.5))
+    assert Color.from_luv(53.24, 200, 40, gamut='lch').luv.l == (
+        pytest.approx(53.24, abs=1e-3))
+    with pytest.raises(ValueError):
+        Color.from_lab(50, 0, 0, gamut='foo')
+
+
 def test_color_from_luv():
     verify_color(Color.from_luv(0, 0, 0), (0.0, 0.0, 0.0))
     verify_color(Color.from_luv(100, 0, 0), (1.0, 1.0, 1.0))
@@ -207,6 +249,33 @@ def test_color_mul():
         1 * Color('magenta')
 
 
+def test_color_arithmetic_subclasses():
+    # Subclasses of the operand types behave as their bases
+    class MyHue(Hue):
+        pass
+
+    class MyRed(Red):
+        pass
+
+    class MyRGB(RGB):
+        pass
+
+    class MyColor(Color):
+        pass
+
+    verify_color(Color('red') + MyHue(deg=120), Color('lime'))
+    verify_color(Color('red') + MyHue(deg=120), Color('lime'))
+    verify_color(MyRed(1) - Color('magenta'), Color(0, 0, 0))
+    verify_color(Color('red') * MyRGB(0.5, 1, 1), Color(0.5, 0, 0))
+    verify_color(Color('red') + MyColor('blue'), Color('magenta'))
+    verify_color(MyColor('blue') + Color('red'), Color('magenta'))
+    assert type(MyColor('blue') + Color('red')) is Color
+    with pytest.raises(TypeError):
+        Color('red') + True
+    with pytest.raises(TypeError):
+        Hue(0.5) - Color('red')
+
+
 def test_color_repr():
     save_style = Color.repr_style
     try:
@@ -227,6 +296,22 @@ def test_color_repr():
         Color.repr_style = save_style
 
 
+def test_color_repr_term(monkeypatch):
+    save_style = Color.repr_style
+    try:
+        Color.repr_style = 'term'
+        for colors, expected in (
+            (None, "<Color html=%r rgb=(1, 0, 0)>" % '#ff0000'),
+            ('8', "<Color html=%r rgb=(1, 0, 0)>" % '#ff0000'),
+            ('256', "<Color \x1b[38;5;9m###\x1b[0m rgb=(1, 0, 0)>"),
+            ('16m', "<Color \x1b[38;2;255;0;0m###\x1b[0m rgb=(1, 0, 0)>"),
+        ):
+            monkeypatch.setattr(term, 'term_colors', lambda: colors)
+            assert repr(Color('red')) == expected
+    finally:
+        Color.repr_style = save_style
+
+
 def test_color_str():
     assert str(Color('black')) == '#000000'
     assert str(Color('red')) == '#ff0000'
@@ -270,6 +355,45 @@ def test_color_yuv_bytes():
     verify_color(Color('red').yuv_bytes, YUV(82, 90, 240))
 
 
+def test_color_white_points():
+    color = Color('#336699')
+    assert color.to_xyz() == color.xyz
+    assert color.to_lab() == color.lab
+    assert color.to_luv('D65') == color.luv
+    verify_color(Color('white').to_xyz('d50'), cv.D50, abs_tol=1e-6)
+    verify_color(Color('white').to_lab('a'), (100, 0, 0), abs_tol=1e-4)
+    verify_color(Color('white').to_luv('f2'), (100, 0, 0), abs_tol=1e-4)
+    for white in ('d50', 'a', 'f11', (0.9, 1.0, 1.1)):
+        verify_color(Color.from_xyz(*color.to_xyz(white), white=white), color)
+        verify_color(Color.from_lab(*color.to_lab(white), white=white), color)
+        verify_color(Color.from_luv(*color.to_luv(white), white=white), color)
+    assert color.to_lab('d50') != color.lab
+    with pytest.raises(ValueError):
+        color.to_lab('foo')
+
+
+def test_color_yuv_standards():
+    red = Color('red')
+    assert red.to_yuv() == red.yuv
+    assert red.to_yuv_bytes() == red.yuv_bytes
+    verify_color(red.to_yuv('bt709'), YUV(0.2126, -0.0999, 0.615),
+                 abs_tol=1e-4)
+    verify_color(red.to_yuv('SMPTE240M'), YUV(0.212, -0.1013, 0.615),
+                 abs_tol=1e-4)
+    verify_color(red.to_yuv_bytes('bt709'), YUV(63, 102, 240))
+    for standard in ('bt601', 'bt709', 'smpte240m'):
+        verify_color(Color.from_yuv(
+            *red.to_yuv(standard), standard=standard), red)
+        verify_color(Color.from_yuv_bytes(
+            *red.to_yuv_bytes(standard), standard=standard), red,
+            abs_tol=1/255)
+        verify_color(Color('white').to_yuv_bytes(standard), (235, 128, 128))
+    with pytest.raises(ValueError):
+        red.to_yuv('foo')
+    with pytest.raises(ValueError):
+        Color.from_yuv(0, 0, 0, standard=None)
+
+
 def test_color_yiq():
     verify_color(Color('black').yiq, YIQ(0, 0, 0))
     verify_color(Color('white').yiq, YIQ(1, 0, 0))
@@ -321,6 +445,40 @@ def test_color_luv():
                  abs_tol=1e-4)
 
 
+def test_color_lch():
+    verify_color(Color('black').lch, LCh(0, 0, 0))
+    verify_color(Color('red').lch, LCh(53.24079, 104.55177, 39.99901),
+                 abs_tol=1e-4)
+    verify_color(Color.from_lch(53.24079, 104.55177, 39.99901),
+                 (1.0, 0.0, 0.0), abs_tol=1e-5)
+    color = Color('#2a6f9c')
+    verify_color(Color(color.lch), color)
+    verify_color(
+        Color.from_lch(*cv.lab_to_lch(*color.to_lab('d50')), white='d50'),
+        color)
+
+
+def test_color_oklab():
+    verify_color(Color('black').oklab, OkLab(0, 0, 0))
+    verify_color(Color('white').oklab, OkLab(1, 0, 0), abs_tol=1e-6)
+    verify_color(Color('red').oklab, OkLab(0.62796, 0.22486, 0.12585),
+                 abs_tol=1e-5)
+    verify_color(Color('red').oklch, OkLCh(0.62796, 0.25768, 29.23389),
+                 abs_tol=1e-5)
+
+
+def test_color_from_oklab():
+    verify_color(Color.from_oklab(0, 0, 0), (0.0, 0.0, 0.0))
+    verify_color(Color.from_oklab(1, 0, 0), (1.0, 1.0, 1.0), abs_tol=1e-6)
+    verify_color(Color.from_oklab(0.62796, 0.22486, 0.12585),
+                 (1.0, 0.0, 0.0), abs_tol=1e-4)
+    verify_color(Color.from_oklch(0.62796, 0.25768, 29.23389),
+                 (1.0, 0.0, 0.0), abs_tol=1e-4)
+    color = Color('#2a6f9c')
+    verify_color(Color(color.oklab), color)
+    verify_color(Color(color.oklch), color)
+
+
 def test_color_attr():
     assert Color('red').hue == Hue(0)
     assert Color('red').lightness == Lightness(0.5)
@@ -334,12 +492,33 @@ def test_color_diff():
     assert Color('red').difference(Color('black')) == 1.0
     assert Color('black').difference(Color('black'), 'cie1976') == 0.0
     assert Color('black').difference(Color('black'), 'ciede2000') == 0.0
+    assert Color('black').difference(Color('black'), 'oklab') == 0.0
+    assert isclose(
+        Color('white').difference(Color('black'), 'oklab'), 1.0, abs_tol=1e-6)
     with pytest.raises(ValueError):
         Color('red').difference(Color('black'), method='foo')
     with pytest.raises(ValueError):
         Color('red').difference(Color('black'), method=b'foo')
 
 
+def test_color_comparator():
+    colors = [Color(name) for name in ('red', 'navy', 'wheat', 'black')]
+    for method in (
+            'euclid', 'cie1976', 'cie1994g', 'cie1994t', 'ciede2000', 'oklab'):
+        for color1 in colors:
+            compare = color1.comparator(method)
+            for color2 in colors:
+                assert isclose(
+                    compare(color2), color1.difference(color2, method),
+                    abs_tol=1e-9)
+    compare = Color('red').comparator(b'cie1976')
+    assert compare(Color('red')) == 0.0
+    with pytest.raises(ValueError):
+        Color('red').comparator('foo')
+    with pytest.raises(ValueError):
+        Color('red').comparator('cie1994')
+
+
 def test_color_format():
     black = Color('black')
     red = Color('red')
@@ -8,6 +8,8 @@
 
 "Tests for the colorzero.conversions module"
 
+import random
+import colorsys
 from math import isclose
 
 import pytest
@@ -91,6 +93,15 @@ def test_yiq_knowns():
         verify_floats(cv.yiq_to_rgb(*yiq), rgb)
 
 
+def test_yiq_colorsys():
+    rnd = random.Random(1)
+    for n in range(1000):
+        rgb = (rnd.random(), rnd.random(), rnd.random())
+        yiq = cv.rgb_to_yiq(*rgb)
+        assert yiq == colorsys.rgb_to_yiq(*rgb)
+        assert cv.yiq_to_rgb(*yiq) == colorsys.yiq_to_rgb(*yiq)
+
+
 def test_hls_roundtrip(rgb):
     verify_floats(cv.hls_to_rgb(*cv.rgb_to_hls(*rgb)), rgb)
 
@@ -308,6 +319,30 @@ def test_yuv_bytes_knowns():
         verify_ints(cv.yuv_bytes_to_rgb_bytes(*yuv), rgb)
 
 
+def test_studio_coefficients():
+    # The derived BT.601 coefficients are the well known integer ones
+    assert cv.studio_coefficients(cv.BT601) == (
+        (66, 129, 25, -38, -74, 112, 112, -94, -18),
+        (298, 409, 100, 208, 516))
+    assert cv.studio_coefficients(cv.BT601) is cv.studio_coefficients(
+        cv.BT601)
+    for std in cv.YUV_STANDARDS.values():
+        (Yr, Yg, Yb, Ur, Ug, Ub, Vr, Vg, Vb), _ = cv.studio_coefficients(std)
+        assert Yr + Yg + Yb == 220
+        assert Ur + Ug + Ub == 0
+        assert Vr + Vg + Vb == 0
+
+
+def test_yuv_standard():
+    assert cv.yuv_standard('bt709') is cv.BT709
+    assert cv.yuv_standard('BT601') is cv.BT601
+    assert cv.yuv_standard(cv.SMPTE240M) is cv.SMPTE240M
+    with pytest.raises(ValueError):
+        cv.yuv_standard('foo')
+    with pytest.raises(ValueError):
+        cv.yuv_standard(1)
+
+
 def test_yuv_coefficients():
     with pytest.raises(TypeError):
         cv.YUVCoefficients()
@@ -355,6 +390,59 @@ def test_luv_roundtrip(rgb):
                     *cv.rgb_to_xyz(*rgb)))), rgb, abs_tol=1e-5)
 
 
+def test_lab_fused(rgb):
+    for white in (cv.D65, cv.D50):
+        lab = cv.rgb_to_lab(*rgb, white)
+        assert lab == cv.xyz_to_lab(*cv.rgb_to_xyz(*rgb, white), white)
+        assert cv.lab_to_rgb(*lab, white) == cv.xyz_to_rgb(
+            *cv.lab_to_xyz(*lab, white), white)
+        verify_floats(cv.lab_to_rgb(*lab, white), rgb, abs_tol=1e-5)
+
+
+def test_luv_fused(rgb):
+    for white in (cv.D65, cv.D50):
+        luv = cv.rgb_to_luv(*rgb, white)
+        assert luv == cv.xyz_to_luv(*cv.rgb_to_xyz(*rgb, white), white)
+        assert cv.luv_to_rgb(*luv, white) == cv.xyz_to_rgb(
+            *cv.luv_to_xyz(*luv, white), white)
+        verify_floats(cv.luv_to_rgb(*luv, white), rgb, abs_tol=1e-5)
+
+
+def test_lch():
+    verify_floats(cv.lab_to_lch(50, 0, 0), (50, 0, 0))
+    verify_floats(cv.lab_to_lch(50, -10, 0), (50, 10, 180))
+    verify_floats(cv.lch_to_lab(50, 10, 90), (50, 0, 10))
+    verify_floats(
+        cv.lch_to_lab(*cv.lab_to_lch(53.24, 80.09, 67.2)), (53.24, 80.09, 67.2))
+
+
+def test_oklab_roundtrip(rgb):
+    verify_floats(cv.oklab_to_rgb(*cv.rgb_to_oklab(*rgb)), rgb, abs_tol=1e-5)
+    verify_floats(
+        cv.oklch_to_oklab(*cv.oklab_to_oklch(*cv.rgb_to_oklab(*rgb))),
+        cv.rgb_to_oklab(*rgb))
+
+
+def test_oklab_known():
+    values = [
+        # rgb, oklab
+        ((0.0, 0.0, 0.0), (0.0,     0.0,      0.0)),      # black
+        ((1.0, 1.0, 1.0), (1.0,     0.0,      0.0)),      # white
+        ((1.0, 0.0, 0.0), (0.62796, 0.22486,  0.12585)),  # red
+        ((0.0, 1.0, 0.0), (0.86644, -0.23389, 0.17950)),  # green
+        ((0.0, 0.0, 1.0), (0.45201, -0.03246, -0.31153)), # blue
+    ]
+    for rgb, oklab in values:
+        verify_floats(cv.rgb_to_oklab(*rgb), oklab, abs_tol=1e-5)
+        verify_floats(cv.oklab_to_rgb(*oklab), rgb, abs_tol=1e-4)
+
+
+def test_oklch():
+    verify_floats(cv.oklab_to_oklch(0.5, 0.0, 0.0), (0.5, 0.0, 0.0))
+    verify_floats(cv.oklab_to_oklch(0.5, 0.0, -0.1), (0.5, 0.1, 270.0))
+    verify_floats(cv.oklch_to_oklab(0.5, 0.1, 90.0), (0.5, 0.0, 0.1))
+
+
 def test_bad_html():
     with pytest.raises(ValueError):
         cv.html_to_rgb_bytes('foo')
@@ -365,3 +453,110 @@ def test_bad_html():
 def test_bad_name():
     with pytest.raises(ValueError):
         cv.name_to_html('foo')
+
+
+def test_white_point():
+    assert cv.white_point('d65') is cv.D65
+    assert cv.white_point('D50') is cv.D50
+    assert cv.white_point((1, 1, 1)) == cv.ILLUMINANTS['e']
+    with pytest.raises(ValueError):
+        cv.white_point('foo')
+    with pytest.raises(ValueError):
+        cv.white_point(1)
+    with pytest.raises(ValueError):
+        cv.white_point((1, 1))
+    with pytest.raises(ValueError):
+        cv.white_point((0.95, 0, 1.09))
+    with pytest.raises(ValueError):
+        cv.white_point((-1, 1, 1))
+    with pytest.raises(ValueError):
+        cv.white_point((1, float('nan'), 1))
+    with pytest.raises(ValueError):
+        cv.white_point(('a', 'b', 'c'))
+
+
+def test_white_cache():
+    # Sweeping many white points does not grow the caches without limit
+    for n in range(1, 1000):
+        white = cv.XYZ(0.9 + n / 10000, 1.0, 1.0)
+        assert cv.rgb_xyz_matrix(white) is cv.rgb_xyz_matrix(white)
+        cv.xyz_rgb_matrix(white)
+    for fn in (cv.adaptation_matrix, cv.rgb_xyz_matrix, cv.xyz_rgb_matrix):
+        assert fn.cache_info().currsize <= cv._WHITE_CACHE_SIZE
+
+
+def test_adaptation_matrix():
+    # Known Bradford matrix for D65 to D50 (with the ICC D50 white)
+    d50 = cv.XYZ(0.96422, 1.0, 0.82521)
+    m = cv.adaptation_matrix(cv.D65, d50)
+    for row1, row2 in zip(m, (
+            ( 1.0478112,  0.0228866, -0.0501270),
+            ( 0.0295424,  0.9904844, -0.0170491),
+            (-0.0092345,  0.0150436,  0.7521316))):
+        verify_floats(row1, row2, abs_tol=1e-5)
+    assert cv.adaptation_matrix(cv.D65, d50) is m
+    for method in cv.ADAPTATIONS:
+        for white in cv.ILLUMINANTS.values():
+            verify_floats(cv.adapt(*cv.D65, cv.D65, white, method), white)
+            verify_floats(
+                cv.adapt(*cv.adapt(0.2, 0.3, 0.4, cv.D65, white, method),
+                         white, cv.D65, method), (0.2, 0.3, 0.4))
+    with pytest.raises(ValueError):
+        cv.adaptation_matrix(cv.D65, d50, 'foo')
+
+
+def test_matrix_inverse():
+    m = ((1, 2, 3), (0, 1, 4), (5, 6, 0))
+    for row1, row2 in zip(
+            cv.matrix_product(m, cv.matrix_inverse(m)),
+            ((1, 0, 0), (0, 1, 0), (0, 0, 1))):
+        verify_floats(row1, row2)
+
+
+def test_xyz_white(rgb):
+    assert cv.rgb_to_xyz(*rgb, white=cv.D65) == cv.rgb_to_xyz(*rgb)
+    for white in cv.ILLUMINANTS.values():
+        verify_floats(
+            cv.xyz_to_rgb(*cv.rgb_to_xyz(*rgb, white=white), white=white),
+            rgb, abs_tol=1e-5)
+    verify_floats(cv.rgb_to_xyz(1, 1, 1, white=cv.D50), cv.D50, abs_tol=1e-6)
+
+
+def test_gamut_map_in_gamut(rgb):
+    for method in ('clip', 'lch', 'oklch'):
+        assert cv.gamut_map(*rgb, method=method) == rgb
+    with pytest.raises(ValueError):
+        cv.gamut_map(*rgb, method='foo')
+
+
+def test_gamut_map():
+    for l, c, h in (
+            (60, 120, 140), (53.24, 120, 40), (30, 130, 300), (90, 90, 90),
+            (10, 50, 200), (97, 30, 180)):
+        raw = cv.lab_to_rgb(*cv.lch_to_lab(l, c, h))
+        assert not all(0 <= v <= 1 for v in raw)
+        clipped = cv.gamut_map(*raw)
+        assert clipped == tuple(cv.clamp_float(v) for v in raw)
+        # The lightness and hue are preserved, while the chroma is reduced
+        # until the color lies on the boundary of the gamut
+        mapped = cv.gamut_map(*raw, method='lch')
+        lch = cv.lab_to_lch(*cv.rgb_to_lab(*mapped))
+        assert isclose(lch.l, l, abs_tol=1e-3)
+        assert isclose(lch.h, h, abs_tol=1e-2)
+        assert lch.c < c
+        assert min(mapped) < 1e-3 or max(mapped) > 1 - 1e-3
+        mapped = cv.gamut_map(*raw, method='oklch')
+        before = cv.oklab_to_oklch(*cv.rgb_to_oklab(*raw))
+        after = cv.oklab_to_oklch(*cv.rgb_to_oklab(*mapped))
+        assert isclose(after.l, before.l, abs_tol=1e-5)
+        assert isclose(after.h, before.h, abs_tol=1e-2)
+        assert after.c < before.c
+        assert min(mapped) < 1e-3 or max(mapped) > 1 - 1e-3
+    # Lightness beyond white or black maps to white or black
+    for method in ('lch', 'oklch'):
+        verify_floats(
+            cv.gamut_map(*cv.lab_to_rgb(105, 20, 20), method=method),
+            (1, 1, 1), abs_tol=1e-4)
+        verify_floats(
+            cv.gamut_map(*cv.lab_to_rgb(-5, 20, 20), method=method),
+            (0, 0, 0), abs_tol=1e-4)
@@ -10,7 +10,9 @@
 
 from math import isclose
 
-from colorzero import Lab, deltae as de
+import pytest
+
+from colorzero import Color, Lab, LCh, OkLab, deltae as de
 
 
 def test_cie1976_known():
@@ -144,3 +146,106 @@ def test_ciede2000_known():
     ]
     for color1, color2, diff in values:
         assert isclose(de.ciede2000(color1, color2), diff, abs_tol=1e-4)
+
+
+def test_oklab():
+    assert de.oklab(OkLab(0.5, 0.1, 0.1), OkLab(0.5, 0.1, 0.1)) == 0.0
+    assert isclose(de.oklab(OkLab(0.5, 0.0, 0.0), OkLab(0.8, 0.0, 0.4)), 0.5)
+    assert isclose(de.oklab(OkLab(1.0, 0.0, 0.0), OkLab(0.0, 0.0, 0.0)), 1.0)
+
+
+def test_lch():
+    colors = [
+        Color.from_rgb_bytes(r, g, b)
+        for r in range(0, 256, 85)
+        for g in range(0, 256, 85)
+        for b in range(0, 256, 85)
+    ]
+    for fn in (de.cie1994g, de.cie1994t, de.ciede2000):
+        for color1 in colors:
+            for color2 in colors:
+                expected = fn(color1.lab, color2.lab)
+                assert isclose(
+                    fn(color1.lch, color2.lch), expected, abs_tol=1e-9)
+                assert isclose(
+                    fn(color1.lch, color2.lab), expected, abs_tol=1e-9)
+                assert isclose(
+                    fn(color1.lab, color2.lch), expected, abs_tol=1e-9)
+
+
+def test_comparator():
+    colors = [
+        Color.from_rgb_bytes(r, g, b)
+        for r in range(0, 256, 85)
+        for g in range(0, 256, 85)
+        for b in range(0, 256, 85)
+    ]
+    for method in ('cie1976', 'cie1994g', 'cie1994t', 'ciede2000'):
+        fn = getattr(de, method)
+        for color1 in colors:
+            compare = de.comparator(color1.lab, method)
+            for color2 in colors:
+                assert isclose(
+                    compare(color2.lab), fn(color1.lab, color2.lab),
+                    abs_tol=1e-9)
+    for method, convert in (('euclid', tuple), ('oklab', lambda c: c.oklab)):
+        fn = getattr(de, method)
+        compare = de.comparator(convert(colors[1]), method)
+        for color in colors:
+            assert isclose(
+                compare(convert(color)),
+                fn(convert(colors[1]), convert(color)))
+    with pytest.raises(ValueError):
+        de.comparator(Lab(0, 0, 0), 'foo')
+    with pytest.raises(ValueError):
+        de.comparator(Lab(0, 0, 0), 'cie1994')
+
+
+def test_within():
+    colors = [
+        Color.from_rgb_bytes(r, g, b)
+        for r in range(0, 256, 51)
+        for g in range(0, 256, 85)
+        for b in range(0, 256, 85)
+    ]
+    # Include pairs of near duplicates, which the bounds cannot always decide
+    colors += [Color.from_rgb_bytes(*(v + 3 for v in c.rgb_bytes)) for c in
+               colors if max(c.rgb_bytes) < 250]
+    for method in ('cie1976', 'cie1994g', 'cie1994t', 'ciede2000', 'oklab'):
+        fn = getattr(de, method)
+        if method == 'oklab':
+            convert = lambda c: c.oklab
+        else:
+            convert = lambda c: c.lab
+        values = [convert(c) for c in colors]
+        for threshold in (0.02, 0.5, 2.3, 10, 50):
+            for value in values[::10]:
+                expected = [fn(value, v) <= threshold for v in values]
+                assert [
+                    de.within(value, v, threshold, method) for v in values
+                ] == expected
+                assert de.within_many(value, values, threshold, method) == (
+                    expected)
+                assert de.within_pairs(
+                    [value] * len(values), values, threshold, method) == (
+                    expected)
+    assert de.within(Color('red').lch, Color('#fe0101').lch, 2.3)
+    assert not de.within(Color('red').lch, Color('#900').lab, 2.3)
+    assert de.within((1, 0, 0), (0.9, 0, 0), 0.1, 'euclid')
+    assert not de.within((1, 0, 0), (0.8, 0, 0), 0.1, 'euclid')
+    with pytest.raises(ValueError):
+        de.within(Lab(0, 0, 0), Lab(0, 0, 0), 1, 'foo')
+    with pytest.raises(ValueError):
+        de.within_pairs([Lab(0, 0, 0)], [Lab(0, 0, 0)], 1, 'foo')
+
+
+def test_within_arrays():
+    from colorzero.arrays import ColorArray
+
+    colors = ColorArray.from_rgb_bytes(bytes(range(256)) * 3)
+    labs = colors.lab
+    reference = Color('#102030').lab
+    assert de.within_many(reference, labs, 10) == [
+        de.ciede2000(reference, lab) <= 10 for lab in labs]
+    assert de.within_pairs(labs, labs[::-1], 20, 'cie1994g') == [
+        de.cie1994g(lab1, lab2) <= 20 for lab1, lab2 in zip(labs, labs[::-1])]
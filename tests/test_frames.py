@@ -0,0 +1,128 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.frames module"
+
+import random
+
+import pytest
+
+from colorzero import conversions as cv
+from colorzero.frames import *
+
+
+FORMATS = [
+    ('i420', rgb_to_i420, i420_to_rgb),
+    ('nv12', rgb_to_nv12, nv12_to_rgb),
+    ('yuyv', rgb_to_yuyv, yuyv_to_rgb),
+]
+
+
+@pytest.fixture()
+def blocks(request):
+    # A 16x6 frame of uniform 2x2 blocks, which survive chroma sub-sampling
+    # intact
+    rand = random.Random(1)
+    return [
+        [tuple(rand.randrange(256) for c in range(3)) for i in range(8)]
+        for j in range(3)
+    ]
+
+
+def block_frame(blocks, convert=lambda rgb: rgb):
+    return bytes(
+        c
+        for row in blocks for n in range(2)
+        for rgb in row for m in range(2)
+        for c in convert(rgb)
+    )
+
+
+def test_frame_size():
+    assert frame_size('rgb', 4, 2) == 24
+    assert frame_size('i420', 4, 2) == 12
+    assert frame_size('nv12', 4, 2) == 12
+    assert frame_size('yuyv', 4, 2) == 16
+    with pytest.raises(ValueError):
+        frame_size('foo', 4, 2)
+
+
+def test_frame_layout(blocks):
+    rgb = block_frame(blocks)
+    yuv = [
+        [tuple(cv.rgb_bytes_to_yuv_bytes(*c)) for c in row]
+        for row in blocks
+    ]
+    ys = bytes(
+        y for row in yuv for n in range(2)
+        for y, u, v in row for m in range(2))
+    us = bytes(u for row in yuv for y, u, v in row)
+    vs = bytes(v for row in yuv for y, u, v in row)
+    assert rgb_to_i420(rgb, 16, 6) == ys + us + vs
+    assert rgb_to_nv12(rgb, 16, 6) == ys + bytes(
+        c for u, v in zip(us, vs) for c in (u, v))
+    assert rgb_to_yuyv(rgb, 16, 6) == bytes(
+        c
+        for row in yuv for n in range(2)
+        for y, u, v in row for c in (y, u, y, v))
+
+
+@pytest.mark.parametrize('fmt,encode,decode', FORMATS)
+def test_frame_round_trip(blocks, fmt, encode, decode):
+    rgb = block_frame(blocks)
+    yuv = encode(rgb, 16, 6)
+    assert len(yuv) == frame_size(fmt, 16, 6)
+    assert decode(yuv, 16, 6) == block_frame(
+        blocks, lambda rgb: cv.yuv_bytes_to_rgb_bytes(
+            *cv.rgb_bytes_to_yuv_bytes(*rgb)))
+
+
+@pytest.mark.parametrize('fmt,encode,decode', FORMATS)
+@pytest.mark.parametrize('standard', ['bt709', 'smpte240m'])
+def test_frame_standards(blocks, fmt, encode, decode, standard):
+    rgb = block_frame(blocks)
+    yuv = encode(rgb, 16, 6, standard=standard)
+    assert yuv != encode(rgb, 16, 6)
+    std = cv.yuv_standard(standard)
+    assert decode(yuv, 16, 6, standard=standard) == block_frame(
+        blocks, lambda rgb: cv.yuv_bytes_to_rgb_bytes(
+            *cv.rgb_bytes_to_yuv_bytes(*rgb, std=std), std=std))
+
+
+@pytest.mark.parametrize('fmt,encode,decode', FORMATS)
+def test_frame_out(fmt, encode, decode):
+    rgb = bytes(random.Random(1).randrange(256) for i in range(16 * 6 * 3))
+    buf = bytearray(frame_size(fmt, 16, 6) + 2)
+    assert encode(rgb, 16, 6, out=memoryview(buf)[1:-1]) is not None
+    assert buf[1:-1] == encode(rgb, 16, 6)
+    assert buf[0] == buf[-1] == 0
+    out = bytearray(len(rgb))
+    assert decode(buf[1:-1], 16, 6, out=out) is out
+    assert out == decode(bytes(buf[1:-1]), 16, 6)
+
+
+@pytest.mark.parametrize('fmt,encode,decode', FORMATS)
+def test_frame_bad_sizes(fmt, encode, decode):
+    rgb = bytes(16 * 6 * 3)
+    with pytest.raises(ValueError):
+        encode(rgb, 15, 6)
+    with pytest.raises(ValueError):
+        encode(rgb, 0, 6)
+    with pytest.raises(ValueError):
+        encode(rgb, 16, 0)
+    with pytest.raises(ValueError):
+        encode(rgb[:-1], 16, 6)
+    with pytest.raises(ValueError):
+        encode(rgb, 16, 6, out=bytearray(1))
+    with pytest.raises(ValueError):
+        decode(bytes(frame_size(fmt, 16, 6) - 1), 16, 6)
+    if fmt == 'yuyv':
+        assert len(encode(rgb[:16 * 5 * 3], 16, 5)) == frame_size(fmt, 16, 5)
+    else:
+        with pytest.raises(ValueError):
+            encode(rgb[:16 * 5 * 3], 16, 5)
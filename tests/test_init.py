@@ -0,0 +1,65 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the lazy loading of the colorzero package"
+
+import sys
+import subprocess
+
+import pytest
+
+import colorzero
+from colorzero import tables
+
+
+def test_lazy_names():
+    assert colorzero.Color is colorzero.color.Color
+    assert colorzero.NAMED_COLORS is tables.NAMED_COLORS
+    assert colorzero.palette is sys.modules['colorzero.palette']
+    assert 'Color' in dir(colorzero)
+    assert 'auto_styles' in colorzero.__all__
+    with pytest.raises(AttributeError):
+        colorzero.foo
+    with pytest.raises(AttributeError):
+        tables.foo
+
+
+def test_star_import():
+    # Everything "from colorzero import *" exported before submodules were
+    # loaded lazily is still exported
+    namespace = {}
+    exec('from colorzero import *', namespace)
+    assert set(namespace) >= {
+        'BaseStyles', 'Blue', 'CMY', 'CMYK', 'Color', 'Default', 'Green',
+        'HLS', 'HSV', 'HTMLStyles', 'Hue', 'Lab', 'Lightness', 'Luma', 'Luv',
+        'NAMED_COLORS', 'RGB', 'Red', 'Saturation', 'StripStyles', 'Style',
+        'TermStyles', 'XYZ', 'YIQ', 'YUV', 'attr', 'cie1976', 'cie1994g',
+        'cie1994t', 'ciede2000', 'color', 'conversions', 'deltae', 'ease_in',
+        'ease_in_out', 'ease_out', 'easings', 'euclid', 'linear', 'style',
+        'tables', 'types',
+    }
+    assert namespace['conversions'] is sys.modules['colorzero.conversions']
+
+
+def test_lazy_tables():
+    assert tables.XTERM_COLORS[(255, 0, 0)] == 9
+    assert tables.DOS_FORE_COLORS[(255, 0, 0)] == (True, 1)
+    assert tables.DOS_BACK_COLORS[(128, 0, 0)] == (False, 1)
+    assert (255, 0, 0) not in tables.DOS_BACK_COLORS
+
+
+def test_lazy_import():
+    # Nothing but the package itself should be loaded by a bare import, and
+    # multiprocessing should not be loaded just to construct colors
+    result = subprocess.run([sys.executable, '-c',
+        'import sys, colorzero; '
+        'print(sorted(m for m in sys.modules if m.startswith("colorzero")));'
+        'from colorzero import Color; Color("red"); '
+        'print("multiprocessing" in sys.modules)'],
+        stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    assert result.stdout.splitlines() == ["['colorzero']", 'False']
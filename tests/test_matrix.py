@@ -0,0 +1,112 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.matrix module"
+
+import random
+from math import isclose
+
+import pytest
+
+from colorzero import matrix, conversions as cv
+
+
+def verify_matrix(m, n, abs_tol=1e-9):
+    for row1, row2 in zip(m, n):
+        for elem1, elem2 in zip(row1, row2):
+            assert isclose(elem1, elem2, abs_tol=abs_tol)
+
+
+def naive_product(m, n):
+    return tuple(
+        tuple(sum(m[i][k] * n[k][j] for k in range(3)) for j in range(3))
+        for i in range(3))
+
+
+@pytest.fixture()
+def matrices(request):
+    rnd = random.Random(1)
+    return [
+        tuple(tuple(rnd.uniform(-2, 2) for j in range(3)) for i in range(3))
+        for k in range(20)
+    ]
+
+
+def test_mult(matrices):
+    assert matrix.mult(matrix.IDENTITY, 1, 2, 3) == (1, 2, 3)
+    assert matrix.mult(matrix.diagonal(2, 3, 4), 1, 2, 3) == (2, 6, 12)
+    assert matrix.mult(((1, 2, 3), (4, 5, 6), (7, 8, 9)), 1, 0, -1) == (
+        -2, -2, -2)
+    for m in matrices:
+        assert matrix.mult(m, 0.1, 0.2, 0.3) == tuple(
+            sum(a * b for a, b in zip(row, (0.1, 0.2, 0.3))) for row in m)
+
+
+def test_mult_columns(matrices):
+    rnd = random.Random(2)
+    columns = [[rnd.random() for i in range(50)] for j in range(3)]
+    for m in matrices:
+        result = matrix.mult_columns(m, *columns)
+        assert list(zip(*result)) == [
+            matrix.mult(m, *v) for v in zip(*columns)]
+    assert matrix.mult_columns(matrix.IDENTITY, [], [], []) == ([], [], [])
+
+
+def test_product(matrices):
+    for m, n, o in zip(matrices, matrices[1:], matrices[2:]):
+        assert matrix.product(m, n) == naive_product(m, n)
+        assert matrix.product(m, matrix.IDENTITY) == m
+        verify_matrix(
+            matrix.product(m, n, o), naive_product(naive_product(m, n), o))
+        verify_matrix(
+            matrix.product(m, n, o), matrix.product(m, matrix.product(n, o)))
+        # The product converts as applying each matrix in turn, last first
+        v = (0.2, 0.4, 0.6)
+        for a, b in zip(
+                matrix.mult(matrix.product(m, n, o), *v),
+                matrix.mult(m, *matrix.mult(n, *matrix.mult(o, *v)))):
+            assert isclose(a, b, abs_tol=1e-9)
+    assert matrix.product(matrices[0]) is matrices[0]
+
+
+def test_inverse(matrices):
+    for m in matrices:
+        verify_matrix(matrix.product(m, matrix.inverse(m)), matrix.IDENTITY)
+        verify_matrix(matrix.product(matrix.inverse(m), m), matrix.IDENTITY)
+    assert matrix.inverse(matrix.diagonal(2, 4, 8)) == matrix.diagonal(
+        0.5, 0.25, 0.125)
+    with pytest.raises(ValueError):
+        matrix.inverse(((1, 2, 3), (2, 4, 6), (0, 0, 1)))
+
+
+def test_conversion_matrices():
+    # The conversions between sRGB and CIE XYZ (at each white point), YIQ,
+    # and the LMS responses of OKLab are each inverses of one another
+    for white in cv.ILLUMINANTS.values():
+        verify_matrix(
+            matrix.product(cv.xyz_rgb_matrix(white), cv.rgb_xyz_matrix(white)),
+            matrix.IDENTITY, abs_tol=1e-6)
+    # rgb_to_yiq forms I and Q from the luma and color differences
+    rgb_to_yiq = matrix.product(
+        (
+            (1.0,  0.00,  0.00),
+            (0.0,  0.74, -0.27),
+            (0.0,  0.48,  0.41)),
+        (
+            ( 0.30,  0.59,  0.11),
+            ( 0.70, -0.59, -0.11),
+            (-0.30, -0.59,  0.89)))
+    verify_matrix(
+        matrix.product(cv._YIQ_TO_RGB, rgb_to_yiq), matrix.IDENTITY,
+        abs_tol=1e-6)
+    verify_matrix(
+        matrix.product(cv._LMS_TO_SRGB, cv._SRGB_TO_LMS), matrix.IDENTITY,
+        abs_tol=1e-6)
+    verify_matrix(
+        matrix.product(cv._OKLAB_TO_LMS, cv._LMS_TO_OKLAB), matrix.IDENTITY,
+        abs_tol=1e-6)
@@ -0,0 +1,239 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.palette module"
+
+import random
+import multiprocessing as mp
+
+import pytest
+
+from colorzero import *
+from colorzero import palette, tables
+from colorzero.palette import Palette
+
+
+@pytest.fixture()
+def colors(request):
+    return [
+        Color.from_rgb_bytes(r, g, b)
+        for r in range(0, 256, 63)
+        for g in range(0, 256, 85)
+        for b in range(0, 256, 51)
+    ]
+
+
+@pytest.fixture()
+def xterm(request):
+    with Palette(
+            {index: rgb for rgb, index in tables.XTERM_COLORS.items()}) as p:
+        yield p
+
+
+def test_palette_init():
+    p = Palette({1: 'red', 2: 'green', 4: Color('blue')})
+    assert len(p) == 3
+    assert list(p) == [1, 2, 4]
+    assert p[1] == (255, 0, 0)
+    assert p[2] == (0, 128, 0)
+    assert p[4] == (0, 0, 255)
+    with pytest.raises(KeyError):
+        p[3]
+    assert repr(p) == '<Palette len=3>'
+    p = Palette(['red', 'green', 'blue'])
+    assert list(p) == [0, 1, 2]
+    assert p[2] == (0, 0, 255)
+    assert len(Palette([])) == 0
+
+
+def test_palette_nearest(xterm, colors):
+    for method in ('euclid', 'cie1976', 'ciede2000', 'oklab'):
+        for color in colors:
+            expected = min(
+                tables.XTERM_COLORS.items(),
+                key=lambda item: (
+                    color.difference(Color.from_rgb_bytes(*item[0]), method),
+                    item[1]))[1]
+            assert xterm.nearest(color, method=method) == expected
+    assert xterm.nearest(Color('red'), method=b'cie1994g') == 9
+    with pytest.raises(ValueError):
+        xterm.nearest(Color('red'), method='foo')
+    with pytest.raises(ValueError):
+        xterm.nearest(Color('red'), method='__class__')
+
+
+def test_palette_nearest_ties():
+    # Equidistant from both entries; the lowest code wins
+    p = Palette({5: (0, 0, 0), 3: (0, 0, 254)})
+    assert p.nearest(Color.from_rgb_bytes(0, 0, 127)) == 3
+    assert p.nearest(Color.from_rgb_bytes(0, 0, 128)) == 3
+
+
+def _child_nearest(name, queue):
+    p = Palette.attach(name)
+    try:
+        queue.put((len(p), p.nearest(Color('#d7a84b'))))
+    finally:
+        p.close()
+
+
+def test_palette_publish(xterm):
+    name = xterm.publish()
+    try:
+        with pytest.raises(ValueError):
+            xterm.publish()
+        p = Palette.attach(name)
+        try:
+            assert list(p) == list(xterm)
+            assert p.nearest(Color('#d7a84b')) == 179
+            ctx = mp.get_context('fork')
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_child_nearest, args=(name, queue))
+            proc.start()
+            proc.join()
+            assert queue.get() == (247, 179)
+        finally:
+            p.close()
+    finally:
+        xterm.close()
+    with pytest.raises(FileNotFoundError):
+        Palette.attach(name)
+
+
+def test_palette_save_load(xterm, colors, tmp_path):
+    xterm.save(tmp_path / 'xterm.palette')
+    assert [p.name for p in tmp_path.iterdir()] == ['xterm.palette']
+    with Palette.load(tmp_path / 'xterm.palette') as p:
+        assert list(p) == list(xterm)
+        assert [p[i] for i in p] == [xterm[i] for i in xterm]
+        for color in colors:
+            assert p.nearest(color, 'cie1976') == xterm.nearest(color, 'cie1976')
+        with pytest.raises(ValueError):
+            p.publish()
+
+
+def test_palette_bad_buffers(xterm, tmp_path):
+    (tmp_path / 'empty').write_bytes(b'')
+    with pytest.raises(ValueError):
+        Palette.load(tmp_path / 'empty')
+    (tmp_path / 'short').write_bytes(b'CZPL')
+    with pytest.raises(ValueError):
+        Palette.load(tmp_path / 'short')
+    xterm.save(tmp_path / 'xterm')
+    data = (tmp_path / 'xterm').read_bytes()
+    (tmp_path / 'truncated').write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        Palette.load(tmp_path / 'truncated')
+    (tmp_path / 'magic').write_bytes(b'ABCD' + data[4:])
+    with pytest.raises(ValueError):
+        Palette.load(tmp_path / 'magic')
+    (tmp_path / 'version').write_bytes(data[:4] + b'\xff\xff' + data[6:])
+    with pytest.raises(ValueError):
+        Palette.load(tmp_path / 'version')
+
+
+def test_palette_save_fails(xterm, tmp_path, monkeypatch):
+    def replace(src, dest):
+        raise OSError('failed')
+    monkeypatch.setattr('os.replace', replace)
+    with pytest.raises(OSError):
+        xterm.save(tmp_path / 'xterm')
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_palette_lut():
+    p = Palette({
+        0: 'black', 1: 'red', 2: '#0000fe', 3: 'red', 4: '#33aa77',
+        5: '#808080', 6: 'white'})
+    assert p.lut is None
+    p.build_lut()
+    assert len(p.lut) == 1 << 24
+    assert 3 not in p.lut.tobytes()
+    rand = random.Random(1)
+    for n in [0, 0xFFFFFF, 0x7F0000, 0x800000] + [
+            rand.getrandbits(24) for i in range(5000)]:
+        color = Color.from_rgb24(n)
+        r, g, b = color.rgb_bytes
+        expected = min(
+            p.items(),
+            key=lambda item: (
+                (r - item[1].red) ** 2 + (g - item[1].green) ** 2 +
+                (b - item[1].blue) ** 2, item[0]))[0]
+        assert p.lut[n] == expected
+        assert p.nearest(color) == expected
+    # Searches with other methods, or out of range colors ignore the table
+    color = Color.from_rgb_bytes(0, 0, 127)
+    assert p.nearest(color, 'cie1976') == Palette(p).nearest(color, 'cie1976')
+    assert p.nearest((-1, -1, -1)) == 0
+    p.close()
+    assert p.lut is None
+
+
+def test_palette_lut_codes():
+    with Palette({256: 'red'}) as p:
+        with pytest.raises(ValueError):
+            p.build_lut()
+        with pytest.raises(ValueError):
+            p.save_lut('foo.lut')
+
+
+def test_palette_lut_save_load(tmp_path):
+    p = palette.standard('dos-back')
+    q = Palette(dict(p))
+    r = Palette({9: 'red'})
+    try:
+        q.build_lut()
+        q.save_lut(tmp_path / 'dos.lut')
+        p.load_lut(tmp_path / 'dos.lut')
+        assert p.lut == q.lut
+        assert p.nearest(Color('#d7a84b')) == 3
+        with pytest.raises(ValueError):
+            r.load_lut(tmp_path / 'dos.lut')
+        assert r.lut is None
+        data = (tmp_path / 'dos.lut').read_bytes()
+        (tmp_path / 'empty').write_bytes(b'')
+        with pytest.raises(ValueError):
+            q.load_lut(tmp_path / 'empty')
+        (tmp_path / 'truncated').write_bytes(data[:-1])
+        with pytest.raises(ValueError):
+            q.load_lut(tmp_path / 'truncated')
+        assert q.lut is not None
+    finally:
+        p._close_lut()
+        q.close()
+        r.close()
+
+
+def test_palette_lut_version(tmp_path, monkeypatch):
+    with Palette({0: 'black', 1: 'white'}) as p:
+        p.build_lut()
+        p.save_lut(tmp_path / 'bw.lut')
+        # Tables from a different version of _build_lut are refused
+        monkeypatch.setattr(Palette, '_lut_version', Palette._lut_version + 1)
+        with pytest.raises(ValueError):
+            p.load_lut(tmp_path / 'bw.lut')
+
+
+def test_standard_palettes(monkeypatch):
+    monkeypatch.setattr(palette, '_standard', {})
+    xterm = palette.standard('xterm')
+    assert palette.standard('xterm') is xterm
+    assert len(xterm) == 247
+    assert xterm.nearest(Color('#d7a84b')) == 179
+    assert list(palette.standard('dos-fore')) == list(range(16))
+    assert list(palette.standard('dos-back')) == list(range(8))
+    with pytest.raises(ValueError):
+        palette.standard('foo')
+    replacement = Palette({9: 'red'})
+    palette.install('xterm', replacement)
+    assert palette.standard('xterm') is replacement
+    assert '{:256}'.format(Color('#d7a84b')) == '\x1b[38;5;9m'
+    with pytest.raises(ValueError):
+        palette.install('foo', replacement)
+    with pytest.raises(TypeError):
+        palette.install('xterm', {})
@@ -0,0 +1,126 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.parallel module"
+
+from math import isclose
+from array import array
+
+import pytest
+
+from colorzero import *
+from colorzero.arrays import ColorArray
+from colorzero.parallel import convert, shared_memory
+
+
+@pytest.fixture(scope='module')
+def colors(request):
+    return [
+        Color.from_rgb_bytes(r, g, b)
+        for r in range(0, 256, 51)
+        for g in range(0, 256, 51)
+        for b in range(0, 256, 17)
+    ]
+
+
+def verify_result(result, expected):
+    assert len(result) == len(expected)
+    for elem1, elem2 in zip(result, expected):
+        assert isclose(elem1, elem2, abs_tol=1e-7)
+
+
+def test_convert_serial(colors):
+    verify_result(
+        convert(colors, to='lab', workers=1),
+        [n for color in colors for n in color.lab])
+    verify_result(
+        convert(colors, to='cmyk', workers=1),
+        [n for color in colors for n in color.cmyk])
+
+
+def test_convert_parallel(colors):
+    verify_result(
+        convert(colors, to='hls', workers=2, chunk_size=50),
+        [n for color in colors for n in color.hls])
+
+
+def test_convert_buffers(colors):
+    data = bytes(n for color in colors for n in color.rgb_bytes)
+    expected = [n for color in colors for n in color.xyz]
+    verify_result(convert(data, to='xyz', workers=1), expected)
+    verify_result(
+        convert(bytearray(data), to='xyz', workers=2, chunk_size=64),
+        expected)
+    floats = array('d', (n for color in colors for n in color))
+    verify_result(convert(floats, to='xyz', workers=1), expected)
+    verify_result(
+        convert(floats, to='xyz', workers=2, chunk_size=64), expected)
+    assert convert(b'', to='lab', workers=1) == array('d')
+
+
+def test_convert_color_array(colors):
+    expected = [n for color in colors for n in color.lab]
+    verify_result(convert(ColorArray(colors), workers=1), expected)
+    verify_result(
+        convert(ColorArray(colors), workers=2, chunk_size=64), expected)
+    assert convert(ColorArray([]), workers=1) == array('d')
+
+
+@pytest.mark.parametrize('to', ['lch', 'oklab', 'oklch'])
+def test_convert_targets(colors, to):
+    verify_result(
+        convert(colors, to=to, workers=1),
+        [n for color in colors for n in getattr(color, to)])
+
+
+def test_convert_out(colors):
+    expected = [n for color in colors for n in color.luv]
+    out = array('d', bytes(len(expected) * 8 + 8))
+    assert convert(colors, to='luv', workers=1, out=out) is out
+    verify_result(out[:-1], expected)
+    assert out[-1] == 0.0
+    out = bytearray(len(expected) * 8)
+    assert convert(colors, to='luv', workers=2, chunk_size=50, out=out) is out
+    verify_result(memoryview(out).cast('d'), expected)
+    with pytest.raises(ValueError):
+        convert(colors, to='luv', out=array('d', [0.0]))
+    with pytest.raises(ValueError):
+        convert(colors, to='luv', out=bytes(len(expected) * 8))
+    with pytest.raises(ValueError):
+        convert(colors, to='luv', out=array('i', [0] * len(expected) * 2))
+
+
+@pytest.mark.skipif(shared_memory is None, reason='requires Python 3.8+')
+def test_convert_out_shared(colors):
+    expected = [n for color in colors for n in color.luv]
+    shm = shared_memory.SharedMemory(create=True, size=len(expected) * 8 + 3)
+    try:
+        for workers in (1, 2):
+            shm.buf[:] = bytes(len(shm.buf))
+            assert convert(
+                colors, to='luv', workers=workers, chunk_size=50, out=shm
+            ) is shm
+            with shm.buf[:len(expected) * 8] as data:
+                with data.cast('d') as result:
+                    verify_result(result, expected)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_convert_bad_args(colors):
+    with pytest.raises(ValueError):
+        convert(colors, to='foo')
+    with pytest.raises(ValueError):
+        convert(colors, workers=0)
+    with pytest.raises(ValueError):
+        convert(colors, chunk_size=0)
+    with pytest.raises(ValueError):
+        convert(b'\x00\x00')
+    with pytest.raises(ValueError):
+        convert(array('i', [0, 0, 0]))
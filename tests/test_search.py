@@ -0,0 +1,181 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.search module"
+
+import random
+
+import pytest
+
+from colorzero import *
+from colorzero import deltae
+from colorzero.arrays import ColorArray
+from colorzero.search import *
+
+
+@pytest.fixture()
+def colors(request):
+    # Clusters of near duplicates around random colors
+    rnd = random.Random(1)
+    return ColorArray.from_rgb_bytes(bytes(
+        max(0, min(255, v + rnd.randint(-4, 4)))
+        for i in range(5)
+        for c in [[rnd.randrange(256) for j in range(3)] for k in range(200)]
+        for v in c
+    ))
+
+
+def convert(colors, method):
+    if method == 'euclid':
+        values = colors
+    elif method == 'oklab':
+        values = colors.oklab
+    else:
+        values = colors.lab
+    return list(values)
+
+
+def test_dedupe_example():
+    colors = [Color(c) for c in ('red', '#fe0101', 'blue', '#f00')]
+    assert dedupe(colors, 2.3) == ([0, 2], [0, 0, 1, 0])
+    assert dedupe(colors, 0.01, 'euclid') == ([0, 2], [0, 0, 1, 0])
+    assert dedupe([], 2.3) == ([], [])
+
+
+@pytest.mark.parametrize('method, threshold', [
+    ('euclid', 0.05), ('cie1976', 3), ('cie1994g', 3), ('cie1994t', 3),
+    ('ciede2000', 2.3), ('oklab', 0.03)])
+def test_dedupe(colors, method, threshold):
+    fn = getattr(deltae, method)
+    values = convert(colors, method)
+    representatives, groups = dedupe(colors, threshold, method)
+    assert len(groups) == len(colors)
+    assert sorted(set(groups)) == list(range(len(representatives)))
+    for index, group in enumerate(groups):
+        assert fn(values[index], values[representatives[group]]) <= threshold
+    for group, index in enumerate(representatives):
+        assert groups.index(group) == index
+    # Every color which founded a group was unlike the existing
+    # representatives
+    for group, index in enumerate(representatives):
+        for earlier in representatives[:group]:
+            assert fn(values[index], values[earlier]) > threshold
+    assert dedupe(list(colors), threshold, method.encode('ascii')) == (
+        representatives, groups)
+
+
+@pytest.mark.parametrize('threshold, blue', [
+    (2.3, False), (5, True), (11, False), (20, False)])
+def test_dedupe_ciede2000(threshold, blue):
+    # Compare with grouping each color against every representative, both
+    # below and above the threshold at which the search becomes unbounded
+    rnd = random.Random(3)
+    colors = ColorArray.from_rgb_bytes(bytes(
+        v for i in range(600) for v in (
+            rnd.randrange(256), rnd.randrange(256),
+            rnd.randrange(128, 256) if blue else rnd.randrange(256))
+    ))
+    values = convert(colors, 'ciede2000')
+    representatives = []
+    groups = []
+    for index, value in enumerate(values):
+        diffs = [
+            (deltae.ciede2000(value, values[rep]), group)
+            for group, rep in enumerate(representatives)]
+        diffs = [(diff, group) for diff, group in diffs if diff <= threshold]
+        if diffs:
+            groups.append(min(diffs)[1])
+        else:
+            groups.append(len(representatives))
+            representatives.append(index)
+    assert dedupe(colors, threshold) == (representatives, groups)
+
+
+def test_dedupe_invalid():
+    with pytest.raises(ValueError):
+        dedupe([Color('red')], 2.3, 'foo')
+    with pytest.raises(ValueError):
+        dedupe([Color('red')], 0)
+
+
+@pytest.mark.parametrize('method', [
+    'cie1976', 'cie1994g', 'cie1994t', 'ciede2000'])
+def test_index(colors, method):
+    fn = getattr(deltae, method)
+    values = [Lab(*value) for value in colors.lab]
+    index = ColorIndex(colors)
+    assert len(index) == len(colors)
+    rnd = random.Random(2)
+    for i in range(20):
+        color = Color.from_rgb_bytes(*(rnd.randrange(256) for j in range(3)))
+        diffs = sorted(
+            (fn(color.lab, value), position)
+            for position, value in enumerate(values))
+        result = index.knn(color, 5, method)
+        assert [key for key, diff in result] == [
+            position for diff, position in diffs[:5]]
+        for (key, diff), (expected, position) in zip(result, diffs):
+            assert diff == pytest.approx(expected)
+        result = index.radius(color, 10, method)
+        assert [key for key, diff in result] == [
+            position for diff, position in diffs if diff <= 10]
+    assert index.knn(Color('red').lab, 1, method.encode('ascii')) == (
+        index.knn(Color('red'), 1, method))
+
+
+def test_index_named():
+    index = ColorIndex(NAMED_COLORS)
+    assert repr(index) == '<ColorIndex len={}>'.format(len(NAMED_COLORS))
+    assert index.knn(Color('#c04040'), 3) == [
+        ('crimson', pytest.approx(5.573291480598204)),
+        ('firebrick', pytest.approx(7.275924886558258)),
+        ('brown', pytest.approx(7.736948198682245)),
+    ]
+    assert index.radius(Color('red'), 0) == [('red', 0)]
+    assert len(index.knn(Color('red'), 1000)) == len(NAMED_COLORS)
+    assert ColorIndex([]).knn(Color('red')) == []
+    diff = Color('navy').difference(Color('blue'), 'ciede2000')
+    assert ColorIndex(['red', 'blue']).knn(Color('navy')) == [
+        (1, pytest.approx(diff))]
+
+
+def test_index_invalid():
+    index = ColorIndex(['red', 'blue'])
+    with pytest.raises(ValueError):
+        index.knn(Color('red'), 1, 'euclid')
+    with pytest.raises(ValueError):
+        index.knn(Color('red'), 0)
+    with pytest.raises(ValueError):
+        index.radius(Color('red'), -1)
+
+
+def test_index_save_load(colors, tmp_path):
+    index = ColorIndex(colors)
+    index.save(tmp_path / 'colors.index')
+    loaded = ColorIndex.load(tmp_path / 'colors.index')
+    assert len(loaded) == len(index)
+    color = Color('#c04040')
+    assert loaded.knn(color, 10) == index.knn(color, 10)
+    assert loaded.radius(color, 20) == index.radius(color, 20)
+    index = ColorIndex(NAMED_COLORS)
+    index.save(tmp_path / 'named.index')
+    loaded = ColorIndex.load(tmp_path / 'named.index')
+    assert loaded.knn(color, 10) == index.knn(color, 10)
+
+
+def test_index_bad_files(tmp_path):
+    with pytest.raises(ValueError):
+        ColorIndex({1: 'red', 'blue': 'blue'}).save(tmp_path / 'bad.index')
+    assert list(tmp_path.iterdir()) == []
+    ColorIndex(NAMED_COLORS).save(tmp_path / 'named.index')
+    data = (tmp_path / 'named.index').read_bytes()
+    for bad in (b'', b'XXXX' + data[4:], data[:4] + b'\xff' + data[5:],
+                data[:100], data[:-1]):
+        (tmp_path / 'bad.index').write_bytes(bad)
+        with pytest.raises(ValueError):
+            ColorIndex.load(tmp_path / 'bad.index')
@@ -0,0 +1,131 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.spaces module"
+
+import random
+from math import isclose
+
+import pytest
+
+from colorzero import *
+from colorzero import spaces, conversions as cv
+from colorzero.arrays import ColorArray
+
+
+def verify_floats(values1, values2, abs_tol=1e-7):
+    for elem1, elem2 in zip(values1, values2):
+        assert isclose(elem1, elem2, abs_tol=abs_tol)
+
+
+@pytest.fixture()
+def colors(request):
+    rand = random.Random(1)
+    return [
+        tuple(rand.random() for i in range(3))
+        for n in range(200)
+    ] + [(0.0, 0.0, 0.0), (1.0, 1.0, 1.0), (1.0, 0.0, 0.0)]
+
+
+def test_space_matrices():
+    # The derived sRGB matrices agree with the published ones used by Color
+    for row1, row2 in zip(spaces.SRGB.to_xyz_matrix, cv.rgb_xyz_matrix()):
+        verify_floats(row1, row2)
+    for row1, row2 in zip(spaces.SRGB.from_xyz_matrix, cv.xyz_rgb_matrix()):
+        verify_floats(row1, row2)
+    for row1, row2 in zip(spaces.REC2020.to_xyz_matrix, (
+            (0.636958, 0.144617, 0.168881),
+            (0.262700, 0.677998, 0.059302),
+            (0.000000, 0.028073, 1.060985))):
+        verify_floats(row1, row2, abs_tol=1e-3)
+    # White maps to the white point in every space
+    for space in (spaces.SRGB, spaces.DISPLAY_P3, spaces.ADOBE_RGB,
+                  spaces.REC2020):
+        verify_floats(space.rgb_to_xyz(1, 1, 1), space.white)
+        verify_floats(space.xyz_to_rgb(*space.white), (1, 1, 1))
+    assert repr(spaces.REC2020) == "<ColorSpace name='rec2020'>"
+
+
+def test_space_xyz(colors):
+    for rgb in colors:
+        verify_floats(spaces.SRGB.rgb_to_xyz(*rgb), Color(*rgb).xyz, 1e-6)
+        for space in ('display-p3', 'adobe-rgb', 'rec2020'):
+            space = spaces.get(space)
+            verify_floats(space.xyz_to_rgb(*space.rgb_to_xyz(*rgb)), rgb)
+
+
+def test_transfer_functions():
+    for space in (spaces.ADOBE_RGB, spaces.REC2020):
+        for c in (-0.5, -0.01, 0.0, 0.01, 0.5, 1.0):
+            assert isclose(space.encode(space.decode(c)), c, abs_tol=1e-12)
+
+
+def test_get_register():
+    assert spaces.get('srgb') is spaces.SRGB
+    assert spaces.get(spaces.REC2020) is spaces.REC2020
+    with pytest.raises(ValueError):
+        spaces.get('foo')
+    with pytest.raises(ValueError):
+        spaces.get(None)
+    with pytest.raises(TypeError):
+        spaces.register('foo')
+    # ProPhoto RGB has a D50 white point so conversions need adaptation
+    prophoto = spaces.ColorSpace(
+        'prophoto', ((0.7347, 0.2653), (0.1596, 0.8404), (0.0366, 0.0001)),
+        'd50', *spaces._gamma(1.8))
+    m = spaces.conversion_matrix('srgb', 'rec2020')
+    try:
+        spaces.register(prophoto)
+        assert spaces.get('prophoto') is prophoto
+        assert spaces.conversion_matrix('srgb', 'rec2020') is not m
+        verify_floats(spaces.convert(1, 1, 1, 'srgb', 'prophoto'), (1, 1, 1))
+        verify_floats(spaces.convert(
+            *spaces.convert(0.2, 0.4, 0.6, 'srgb', 'prophoto'), 'prophoto'),
+            (0.2, 0.4, 0.6))
+    finally:
+        del spaces._spaces['prophoto']
+
+
+def test_conversion_cache():
+    # Conversions with many ad-hoc spaces do not grow the cache without limit
+    for n in range(200):
+        space = spaces.ColorSpace(
+            'gamma', spaces.SRGB.primaries, 'd65',
+            *spaces._gamma(1.8 + n / 1000))
+        verify_floats(spaces.convert(1, 1, 1, space), (1, 1, 1))
+    info = spaces._conversion_matrix.cache_info()
+    assert 0 < info.currsize <= info.maxsize
+
+
+def test_convert(colors):
+    assert spaces.conversion_matrix('srgb', 'rec2020') is (
+        spaces.conversion_matrix(spaces.SRGB, spaces.REC2020))
+    for rgb in colors:
+        verify_floats(spaces.convert(*rgb, 'srgb', 'srgb'), rgb)
+        for space in ('display-p3', 'adobe-rgb', 'rec2020'):
+            converted = spaces.convert(*rgb, 'srgb', space)
+            # sRGB is within the gamut of all the other spaces
+            assert all(-1e-9 <= c <= 1 + 1e-9 for c in converted)
+            verify_floats(
+                converted, spaces.get(space).xyz_to_rgb(
+                    *spaces.SRGB.rgb_to_xyz(*rgb)))
+            verify_floats(spaces.convert(*converted, space), rgb)
+    # Pure P3 red is outside the sRGB gamut
+    r, g, b = spaces.convert(1, 0, 0, 'display-p3')
+    assert r > 1 and g < 0 and b < 0
+
+
+def test_convert_columns(colors):
+    columns = ColorArray(colors).columns
+    for source, target in (
+            ('srgb', 'display-p3'), ('srgb', 'rec2020'),
+            ('adobe-rgb', 'srgb'), ('rec2020', 'display-p3')):
+        result = spaces.convert_columns(*columns, source, target)
+        assert len(result) == len(colors)
+        for rgb1, rgb2 in zip(result, colors):
+            assert rgb1 == spaces.convert(*rgb2, source, target)
@@ -8,9 +8,12 @@
 
 "Tests for the colorzero.style module"
 
+import io
+
 import pytest
 
 from colorzero import *
+from colorzero import style as style_mod
 
 
 @pytest.fixture
@@ -137,3 +140,19 @@ def test_term_format(styles):
     styles = TermStyles(styles)
     assert '{styles:info}Status{styles:reset}: OK'.format(styles=styles) == (
         '[22;32m[49mStatus[0m: OK')
+
+
+def test_auto_styles(styles, monkeypatch):
+    stream = io.StringIO()
+    monkeypatch.setattr(style_mod, 'term_colors', lambda stream: None)
+    result = auto_styles(styles, stream=stream)
+    assert isinstance(result, StripStyles)
+    assert '{s:info}Status{s:reset}: OK'.format(s=result) == 'Status: OK'
+    monkeypatch.setattr(style_mod, 'term_colors', lambda stream: '16m')
+    result = auto_styles(styles, stream=stream)
+    assert isinstance(result, TermStyles)
+    assert result.term_colors == '16m'
+    assert '{s:info}Status{s:reset}: OK'.format(s=result) == (
+        '\x1b[38;2;0;128;0m\x1b[49mStatus\x1b[0m: OK')
+    result = auto_styles(info='red', stream=stream)
+    assert set(result) == {'info'}
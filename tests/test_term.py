@@ -0,0 +1,72 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.term module"
+
+import io
+from unittest import mock
+
+import pytest
+
+from colorzero import term
+
+
+class FakeTTY(io.StringIO):
+    def __init__(self, fd=100, tty=True):
+        super().__init__()
+        self._fd = fd
+        self._tty = tty
+
+    def fileno(self):
+        return self._fd
+
+    def isatty(self):
+        return self._tty
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = {}
+    monkeypatch.setattr(term, '_cache', cache)
+    return cache
+
+
+def test_detect():
+    tty = FakeTTY()
+    assert term._detect(tty, {}) is None
+    assert term._detect(tty, {'TERM': 'dumb'}) is None
+    assert term._detect(tty, {'TERM': 'xterm'}) == '8'
+    assert term._detect(tty, {'TERM': 'xterm-256color'}) == '256'
+    assert term._detect(tty, {'TERM': 'xterm-direct'}) == '16m'
+    assert term._detect(tty, {
+        'TERM': 'xterm-256color', 'COLORTERM': 'truecolor'}) == '16m'
+    assert term._detect(tty, {'TERM': 'xterm', 'COLORTERM': '24bit'}) == '16m'
+    assert term._detect(tty, {
+        'TERM': 'xterm-256color', 'NO_COLOR': '1'}) is None
+    assert term._detect(tty, {
+        'TERM': 'xterm-256color', 'NO_COLOR': ''}) == '256'
+    assert term._detect(FakeTTY(tty=False), {
+        'TERM': 'xterm-256color'}) is None
+
+
+def test_term_colors(cache):
+    with mock.patch.dict('os.environ', {'TERM': 'xterm-256color'}, clear=True):
+        assert term.term_colors(FakeTTY(fd=100)) == '256'
+        assert term.term_colors(io.StringIO()) is None
+        assert cache == {100: '256'}
+        with mock.patch.dict('os.environ', {'NO_COLOR': '1'}):
+            # Cached result is used for the same descriptor
+            assert term.term_colors(FakeTTY(fd=100)) == '256'
+            assert term.term_colors(FakeTTY(fd=101)) is None
+        assert cache == {100: '256', 101: None}
+
+
+def test_term_colors_default(cache):
+    with mock.patch('sys.stdout', FakeTTY(fd=102, tty=False)):
+        assert term.term_colors() is None
+    assert cache == {102: None}
@@ -0,0 +1,106 @@
+# vim: set et sw=4 sts=4 fileencoding=utf-8:
+#
+# The colorzero color library
+#
+# Copyright (c) 2016-2021 Dave Jones <dave@waveform.org.uk>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"Tests for the colorzero.transform module"
+
+import operator
+from math import isclose
+
+import pytest
+
+from colorzero import *
+from colorzero.arrays import ColorArray
+
+
+@pytest.fixture()
+def colors(request):
+    return [
+        Color.from_rgb_bytes(r, g, b)
+        for r in range(0, 256, 51)
+        for g in range(0, 256, 85)
+        for b in range(0, 256, 63)
+    ]
+
+
+OPERATIONS = [
+    ('+', Hue(deg=30)), ('*', Saturation(0.5)), ('-', Lightness(0.1)),
+    ('*', Luma(0.9)), ('+', Red(0.1)), ('-', Green(0.2)), ('*', Blue(0.5)),
+    ('-', Hue(deg=60)), ('*', RGB(0.5, 0.9, 1.0)), ('+', Color('#102030')),
+]
+
+
+def chain(color, operations):
+    for op, value in operations:
+        color = {
+            '+': operator.add,
+            '-': operator.sub,
+            '*': operator.mul,
+        }[op](color, value)
+    return color
+
+
+def test_transform_init():
+    t = Transform()
+    assert len(t) == 0
+    assert t.operations == ()
+    assert t(Color('red')) == Color('red')
+    t = (t + Hue(deg=30)) * Saturation(0.5) - Luma(0.1)
+    assert len(t) == 3
+    assert t.operations == (
+        ('+', Hue(deg=30)), ('*', Saturation(0.5)), ('-', Luma(0.1)))
+    assert t == Transform(*t.operations)
+    assert t != Transform()
+    assert t != 1
+    assert hash(t) == hash(Transform(*t.operations))
+    assert repr(t) == (
+        "Transform(('+', Hue(deg=30)), ('*', Saturation(0.5)), "
+        "('-', Luma(0.1)))")
+    assert Hue(0.5) + Transform() == Transform() + Hue(0.5)
+    assert Luma(0.5) * Transform() == Transform() * Luma(0.5)
+    with pytest.raises(ValueError):
+        Transform(('/', Hue(0.5)))
+    with pytest.raises(ValueError):
+        Transform(('+', 0.5))
+    with pytest.raises(TypeError):
+        Transform() + 0.5
+    with pytest.raises(TypeError):
+        Red(0.5) - Transform()
+
+
+def test_transform_plan():
+    # Consecutive operations in the same system share a conversion
+    t = Transform(*OPERATIONS)
+    assert [system for system, ops in t._runs] == [
+        'hls', 'yuv', 'rgb', 'hls', 'rgb']
+
+
+@pytest.mark.parametrize('operation', OPERATIONS)
+def test_transform_single(colors, operation):
+    t = Transform(operation)
+    for color in colors:
+        assert t(color) == chain(color, [operation])
+
+
+def test_transform_color(colors):
+    t = Transform(*OPERATIONS)
+    for color in colors:
+        result = t(color)
+        assert isinstance(result, Color)
+        for elem1, elem2 in zip(result, chain(color, OPERATIONS)):
+            assert isclose(elem1, elem2, abs_tol=1e-12)
+
+
+def test_transform_array(colors):
+    t = Transform(*OPERATIONS)
+    result = t(colors)
+    assert isinstance(result, ColorArray)
+    assert len(result) == len(colors)
+    for color1, color2 in zip(result, colors):
+        for elem1, elem2 in zip(color1, t(color2)):
+            assert isclose(elem1, elem2, abs_tol=1e-12)
+    assert list(t(ColorArray(colors))) == list(result)